@@ -0,0 +1,119 @@
+"""Running aggregates over search results.
+
+Articles are folded in as they arrive instead of re-scanning the whole
+result list after every search: counts per source, relevance distribution,
+date range and per-day histogram, and the most common title terms.
+Rendering a snapshot only reads the aggregates, so it can be done after
+every source.
+"""
+import re
+import threading
+from collections import Counter
+
+# Width of a relevance histogram bucket
+RELEVANCE_BUCKET = 5
+
+STOP_WORDS = {
+    'the', 'a', 'an', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'with', 'at', 'by', 'from',
+    'is', 'are', 'was', 'were', 'be', 'as', 'it', 'its', 'this', 'that', 'after', 'over',
+    'new', 'says', 'say', 'said', 'will', 'has', 'have', 'not', 'but', 'he', 'she', 'they',
+    'we', 'you', 'his', 'her', 'their', 'into', 'up', 'out', 'about', 'more', 'than', 'who'
+}
+
+WORD_RE = re.compile(r"[a-z][a-z'\-]+")
+
+
+class SearchAnalytics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.total = 0
+            self.source_counts = Counter()
+            self.relevance_sum = 0
+            self.relevance_min = None
+            self.relevance_max = None
+            self.relevance_histogram = Counter()
+            self.date_min = None
+            self.date_max = None
+            self.dates_by_day = Counter()
+            self.term_counts = Counter()
+
+    def add(self, articles):
+        """Fold a batch of articles into the aggregates"""
+        with self.lock:
+            for article in articles:
+                self.total += 1
+                self.source_counts[article['source']] += 1
+
+                relevance = article.get('relevance') or 0
+                self.relevance_sum += relevance
+                if self.relevance_min is None or relevance < self.relevance_min:
+                    self.relevance_min = relevance
+                if self.relevance_max is None or relevance > self.relevance_max:
+                    self.relevance_max = relevance
+                self.relevance_histogram[relevance // RELEVANCE_BUCKET * RELEVANCE_BUCKET] += 1
+
+                date_obj = article.get('date_obj')
+                if date_obj:
+                    if self.date_min is None or date_obj < self.date_min:
+                        self.date_min = date_obj
+                    if self.date_max is None or date_obj > self.date_max:
+                        self.date_max = date_obj
+                    self.dates_by_day[date_obj.date()] += 1
+
+                for word in set(WORD_RE.findall(article['title'].lower())):
+                    if word not in STOP_WORDS:
+                        self.term_counts[word] += 1
+
+    def snapshot(self, top_terms=10):
+        """A point-in-time copy of the aggregates"""
+        with self.lock:
+            return {
+                'total': self.total,
+                'source_counts': dict(self.source_counts),
+                'average_relevance': self.relevance_sum / self.total if self.total else 0,
+                'relevance_min': self.relevance_min,
+                'relevance_max': self.relevance_max,
+                'relevance_histogram': dict(sorted(self.relevance_histogram.items())),
+                'date_min': self.date_min,
+                'date_max': self.date_max,
+                'dates_by_day': dict(sorted(self.dates_by_day.items())),
+                'top_terms': self.term_counts.most_common(top_terms)
+            }
+
+    def render(self):
+        """Text report for the Analytics tab"""
+        snap = self.snapshot()
+        if not snap['total']:
+            return "No results to analyze"
+
+        if snap['date_min']:
+            date_range = f"{snap['date_min'].strftime('%Y-%m-%d')} to {snap['date_max'].strftime('%Y-%m-%d')}"
+        else:
+            date_range = "Unknown"
+
+        analytics = f"Search Analytics\n\n"
+        analytics += f"Total Articles: {snap['total']}\n"
+        analytics += f"Average Relevance Score: {snap['average_relevance']:.2f}\n"
+        analytics += f"Relevance Range: {snap['relevance_min']} to {snap['relevance_max']}\n"
+        analytics += f"Date Range: {date_range}\n\n"
+
+        analytics += "Articles by Source:\n"
+        for source, count in snap['source_counts'].items():
+            analytics += f"  {source}: {count}\n"
+
+        analytics += "\nRelevance Distribution:\n"
+        for bucket, count in snap['relevance_histogram'].items():
+            analytics += f"  {bucket:>3}-{bucket + RELEVANCE_BUCKET - 1:<3} {'#' * count} {count}\n"
+
+        analytics += "\nArticles by Day:\n"
+        for day, count in list(snap['dates_by_day'].items())[-14:]:
+            analytics += f"  {day.strftime('%Y-%m-%d')}: {count}\n"
+
+        analytics += "\nTop Terms:\n"
+        for term, count in snap['top_terms']:
+            analytics += f"  {term}: {count}\n"
+        return analytics
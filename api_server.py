@@ -0,0 +1,334 @@
+"""Local JSON API over the scraper, for tools that can't drive the Tk GUI.
+
+A small asyncio HTTP/1.1 server; the blocking scrape and parse work runs
+on a thread pool, one task per source. Identical requests that arrive
+while one is already in flight are coalesced (single flight): they all
+wait on the same upstream fetch instead of starting their own, so a burst
+of clients asking for the same query or URL costs one scrape. Search
+results are cached like in the GUI: within the TTL they are served
+without scraping, after it the stale list is returned at once and
+refreshed in the background.
+
+    GET /search?q=climate+summit&sources=BBC,CNN   articles, best first
+        &sort=date|source&limit=N                  other orders, top N only
+    GET /article?url=...&source=BBC                extracted body text
+    GET /history                                   past queries
+    GET /history?q=climate+summit                  last results of a query
+    GET /metrics                                   counters and sources on hold
+
+    python api_server.py --port 8080
+"""
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+
+from scraper_core import ScraperCore, SOURCE_BASE_ENV
+from article_store import ArticleStore
+from urls import canonical_url
+from search_history import SearchHistory
+from exporter import FIELDS, row_values
+from feeds import FeedIndex, local_feeds, search_with_feeds
+from metrics import METRICS
+from result_cache import ResultCache, STALE, cache_key
+from ranking import Ranking, ORDERINGS
+
+# Request line plus headers; anything longer is rejected
+MAX_HEADER_BYTES = 16 * 1024
+# No endpoint takes a body; a small one is read and dropped, anything bigger is refused
+MAX_BODY_BYTES = 16 * 1024
+KEEPALIVE_TIMEOUT = 30
+
+
+def article_json(article):
+    """An article in the same shape as the JSONL export"""
+    data = dict(zip(FIELDS, row_values(article)))
+    if data['body'] is None:
+        del data['body']
+    if article.get('via'):
+        data['via'] = article['via']
+    return data
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        Exception.__init__(self, message)
+        self.status = status
+
+
+def non_negative_int(value, name):
+    """Parse a count from a request, or fail the request with 400"""
+    try:
+        number = int(value or 0)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be a non-negative integer")
+    return number
+
+
+class SingleFlight:
+    """Share one running call between every caller asking for the same key"""
+
+    def __init__(self):
+        self.calls = {}
+
+    async def do(self, key, func):
+        future = self.calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self.calls[key] = future
+            future.add_done_callback(lambda f: self.calls.pop(key, None) if self.calls.get(key) is f else None)
+        else:
+            METRICS.inc('api_coalesced', endpoint=key[0])
+        # A caller that disconnects must not cancel the fetch the others are waiting on
+        return await asyncio.shield(future)
+
+
+class SearchService(ScraperCore):
+    """search_news / fetch_article_content of the GUI, without the widgets"""
+
+    def __init__(self, store_path="articles.db", workers=16):
+        ScraperCore.__init__(self)
+        local_base = os.environ.get(SOURCE_BASE_ENV)
+        self.feed_index = FeedIndex(self, feeds=local_feeds(local_base) if local_base else None)
+        self.history = SearchHistory("search_history.jsonl", "search_snapshots")
+        self.article_store = ArticleStore(store_path)
+        self.history.load()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.flights = SingleFlight()
+        self.result_cache = ResultCache()
+        self.revalidations = set()
+        self.warmup = self.fetcher.warm_up(self.sources.values())
+
+    def run(self, func, *args):
+        return asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def search_one(self, source, base_url, query):
+        try:
+            articles = search_with_feeds(self, self.feed_index, source, base_url, query)
+        except Exception as e:
+            print(f"Error searching {source}: {e}")
+            return []
+        self.article_store.add_articles(articles)
+        return articles
+
+    async def search(self, query, sources):
+        """(Ranking, cache state): 'fresh' or 'stale' when served from the cache, None when scraped"""
+        cached, state, _ = self.result_cache.lookup(query, sources)
+        if state == STALE and self.result_cache.begin_refresh(query, sources):
+            task = asyncio.ensure_future(self.revalidate(query, sources))
+            self.revalidations.add(task)
+            task.add_done_callback(self.revalidations.discard)
+        if cached is not None:
+            return cached, state
+        return await self.scrape(query, sources), None
+
+    async def scrape(self, query, sources):
+        key = ('search',) + cache_key(query, sources)
+        return await self.flights.do(key, lambda: self._search(query, sources))
+
+    async def revalidate(self, query, sources):
+        try:
+            await self.scrape(query, sources)
+        except Exception as e:
+            print(f"Error refreshing cached results for {query!r}: {e}")
+        finally:
+            self.result_cache.end_refresh(query, sources)
+
+    async def _search(self, query, sources):
+        stored = await self.run(lambda: self.article_store.search(query, sources=list(sources)))
+        for article in stored:
+            article['relevance'] = self.calculate_relevance(article['title'], query)
+        # Every source at once, each on its own pool thread
+        batches = await asyncio.gather(*(self.run(self.search_one, source, self.sources[source], query)
+                                         for source in sources))
+        ranking = Ranking()
+        for batch in batches:
+            ranking.add(batch)
+        ranking.add(stored)
+        # Cached whole, so every sort order is served from its own heap
+        self.result_cache.store(query, sources, ranking)
+        await self.run(self.history.record, query, ranking.view("Relevance"))
+        return ranking
+
+    async def article(self, url, source=None):
+        key = ('article', canonical_url(url))
+        return await self.flights.do(key, lambda: self.run(self._article, url, source))
+
+    def _article(self, url, source):
+        content = self.fetch_article(url, source)
+        if content:
+            self.article_store.set_body(url, content)
+        return content
+
+    def close(self):
+        self.warmup.cancel()
+        self.executor.shutdown(wait=True)
+        self.article_store.close()
+        self.feed_index.save()
+        self.selector_stats.save()
+
+
+class APIServer:
+    def __init__(self, service):
+        self.service = service
+
+    async def handle_search(self, params):
+        query = params.get('q', '').strip()
+        if not query:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "missing q")
+        sources = [s for s in params.get('sources', '').split(',') if s] or list(self.service.sources)
+        unknown = [s for s in sources if s not in self.service.sources]
+        if unknown:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"unknown sources: {', '.join(unknown)}")
+        ordering = params.get('sort', 'relevance').capitalize()
+        if ordering not in ORDERINGS:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"sort must be one of: {', '.join(ORDERINGS).lower()}")
+        limit = non_negative_int(params.get('limit'), "limit")
+        ranking, cache_state = await self.service.search(query, sources)
+        results = ranking.view(ordering)
+        if limit:
+            results = results[:limit]
+        return {'query': query, 'cached': cache_state, 'count': len(results),
+                'articles': [article_json(a) for a in results]}
+
+    async def handle_article(self, params):
+        url = params.get('url', '').strip()
+        if not url:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "missing url")
+        try:
+            content = await self.service.article(url, params.get('source'))
+        except Exception as e:
+            raise HTTPError(HTTPStatus.BAD_GATEWAY, f"could not fetch article: {e}")
+        return {'url': url, 'body': content}
+
+    async def handle_history(self, params):
+        query = params.get('q', '').strip()
+        if not query:
+            return {'queries': self.service.history.queries()}
+        snapshot = await self.service.run(self.service.history.snapshot, query)
+        if snapshot is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "no results recorded for this query")
+        return {'query': query, 'count': len(snapshot), 'articles': [article_json(a) for a in snapshot]}
+
+    async def handle_metrics(self, params):
+        held = self.service.source_health.status()
+        return {'counters': METRICS.snapshot(), 'warmup': self.service.warmup.report(),
+                'sources_on_hold': {source: {'reason': reason, 'retry_in': round(wait)}
+                                    for source, (reason, wait) in held.items()}}
+
+    async def dispatch(self, method, target):
+        parts = urlsplit(target)
+        handler = {
+            '/search': self.handle_search,
+            '/article': self.handle_article,
+            '/history': self.handle_history,
+            '/metrics': self.handle_metrics,
+        }.get(parts.path.rstrip('/') or '/')
+        if handler is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"no such endpoint: {parts.path}")
+        if method != 'GET':
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "only GET is supported")
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        METRICS.inc('api_requests', endpoint=parts.path)
+        return await handler(params)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.respond(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                       {'error': "headers too large"}, False)
+                    break
+
+                lines = head.decode('latin-1').split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self.respond(writer, HTTPStatus.BAD_REQUEST, {'error': "malformed request line"}, False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = non_negative_int(headers.get('content-length'), "Content-Length")
+                except HTTPError as e:
+                    await self.respond(writer, e.status, {'error': str(e)}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': "body too large"}, False)
+                    break
+                if length:
+                    try:
+                        await asyncio.wait_for(reader.readexactly(length), KEEPALIVE_TIMEOUT)
+                    except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                        break
+                keep_alive = (headers.get('connection', '').lower() != 'close' and version == "HTTP/1.1")
+
+                try:
+                    status, payload = HTTPStatus.OK, await self.dispatch(method, target)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except Exception as e:
+                    print(f"Error handling {target}: {e}")
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def serve(self, host, port, started=None):
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+        if started is not None:
+            started(server)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON search API over the news scraper")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--store", default="articles.db")
+    parser.add_argument("--workers", type=int, default=16, help="threads for fetching and parsing")
+    args = parser.parse_args()
+
+    service = SearchService(args.store, args.workers)
+    api = APIServer(service)
+
+    def started(server):
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"Serving on http://{host}:{port}")
+
+    try:
+        asyncio.run(api.serve(args.host, args.port, started))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
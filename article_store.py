@@ -0,0 +1,290 @@
+"""Persistent SQLite store of every extracted article, with FTS5 search.
+
+Articles are upserted by canonical URL, so the same story seen by many
+searches is kept once. Writes are queued and applied in batches by a
+background writer thread, with the database in WAL mode, so the search
+path never waits on disk. Reads use their own per-thread connection.
+
+    python article_store.py "climate summit"      # search stored articles offline
+"""
+import argparse
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from records import ArticleRecord
+from urls import canonical_url
+
+DEFAULT_DB = "articles.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    date_text TEXT,
+    date_obj TEXT,
+    relevance INTEGER,
+    body TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_source ON articles(source);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, body, content='articles', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title, body ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    INSERT INTO articles_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+"""
+
+UPSERT_ARTICLE = """
+INSERT INTO articles (url, source, title, date_text, date_obj, relevance, body, first_seen, last_seen)
+VALUES (:url, :source, :title, :date_text, :date_obj, :relevance, NULL, :seen, :seen)
+ON CONFLICT(url) DO UPDATE SET
+    source = excluded.source,
+    title = excluded.title,
+    date_text = excluded.date_text,
+    date_obj = COALESCE(excluded.date_obj, articles.date_obj),
+    relevance = excluded.relevance,
+    last_seen = excluded.last_seen
+"""
+
+UPDATE_BODY = "UPDATE articles SET body = :body, last_seen = :seen WHERE url = :url"
+
+# For articles fetched by URL alone; the title stays a placeholder until a search finds the article
+UPSERT_BODY = """
+INSERT INTO articles (url, source, title, body, first_seen, last_seen)
+VALUES (:url, :source, :title, :body, :seen, :seen)
+ON CONFLICT(url) DO UPDATE SET
+    body = excluded.body,
+    last_seen = excluded.last_seen
+"""
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 expression matching any of its words"""
+    words = [w for w in text.replace('"', ' ').split() if w]
+    return " OR ".join(f'"{w}"' for w in words)
+
+
+class ArticleStore:
+    def __init__(self, path=DEFAULT_DB, batch_size=200, flush_interval=0.5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self._closed = False
+
+        # Create the schema up front so readers never race the writer
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self):
+        """One connection per reading thread; sqlite3 connections aren't shareable"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def add_articles(self, articles):
+        """Queue extracted articles for upsert; returns immediately"""
+        seen = datetime.now().isoformat(timespec='seconds')
+        for article in articles:
+            date_obj = article.get('date_obj')
+            self._queue.put((UPSERT_ARTICLE, {
+                'url': canonical_url(article['url']),
+                'source': article['source'],
+                'title': article['title'],
+                'date_text': article.get('date'),
+                'date_obj': date_obj.isoformat() if date_obj else None,
+                'relevance': article.get('relevance'),
+                'seen': seen
+            }))
+
+    def set_body(self, url, body):
+        """Queue the fetched body text of an already stored article"""
+        self._queue.put((UPDATE_BODY, {
+            'url': canonical_url(url),
+            'body': body,
+            'seen': datetime.now().isoformat(timespec='seconds')
+        }))
+
+    def store_body(self, url, body, source=None, title=None):
+        """Queue the fetched body text of an article, adding a row for it if it isn't stored yet"""
+        url = canonical_url(url)
+        self._queue.put((UPSERT_BODY, {
+            'url': url,
+            'source': source or urlsplit(url).netloc,
+            'title': title or url,
+            'body': body,
+            'seen': datetime.now().isoformat(timespec='seconds')
+        }))
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+
+            # Gather a batch: whatever arrives within flush_interval, up to batch_size
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+
+            try:
+                with conn:
+                    for statement, params in batch:
+                        conn.execute(statement, params)
+            except Exception as e:
+                print(f"Error writing {len(batch)} articles to store: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                self._queue.task_done()
+                break
+        conn.close()
+
+    def flush(self):
+        """Block until every queued write has been committed"""
+        self._queue.join()
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._writer.join()
+
+    def search(self, query, sources=None, limit=50):
+        """Full-text search of stored titles and bodies, best matches first"""
+        expression = fts_query(query)
+        if not expression:
+            return []
+
+        sql = ("SELECT a.* FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+               "WHERE articles_fts MATCH ?")
+        params = [expression]
+        if sources:
+            sql += f" AND a.source IN ({','.join('?' * len(sources))})"
+            params.extend(sources)
+        sql += " ORDER BY bm25(articles_fts) LIMIT ?"
+        params.append(limit)
+
+        try:
+            rows = self._reader().execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error searching article store: {e}")
+            return []
+        return [self._row_to_article(row) for row in rows]
+
+    def iter_articles(self, query=None, sources=None, batch_size=5000):
+        """Stream stored articles (optionally FTS-filtered) without loading them all.
+
+        Uses its own connection so it can be consumed on any thread.
+        """
+        if query:
+            sql = ("SELECT a.* FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+                   "WHERE articles_fts MATCH ?")
+            params = [fts_query(query)]
+        else:
+            sql = "SELECT * FROM articles a WHERE 1"
+            params = []
+        if sources:
+            sql += f" AND a.source IN ({','.join('?' * len(sources))})"
+            params.extend(sources)
+
+        conn = self._connect()
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._row_to_article(row)
+        finally:
+            conn.close()
+
+    def get_body(self, url):
+        """Stored body text for a URL, or None"""
+        row = self._reader().execute("SELECT body FROM articles WHERE url = ?",
+                                     (canonical_url(url),)).fetchone()
+        return row['body'] if row else None
+
+    def count(self):
+        return self._reader().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def _row_to_article(self, row):
+        return ArticleRecord(row['source'], row['title'], row['url'], row['date_text'] or "",
+                             datetime.fromisoformat(row['date_obj']) if row['date_obj'] else None,
+                             row['relevance'] or 0, body=row['body'], stored=True)
+
+
+def merge_results(live, stored):
+    """Live results plus any stored articles they didn't already include"""
+    seen = {canonical_url(article['url']) for article in live}
+    merged = list(live)
+    for article in stored:
+        if canonical_url(article['url']) not in seen:
+            seen.add(canonical_url(article['url']))
+            merged.append(article)
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the local article store")
+    parser.add_argument("query")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    store = ArticleStore(args.db)
+    try:
+        print(f"{store.count()} articles stored")
+        for article in store.search(args.query, limit=args.limit):
+            print(f"[{article['source']}] {article['title']} ({article['date']})\n    {article['url']}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
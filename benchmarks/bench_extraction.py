@@ -0,0 +1,256 @@
+"""Offline extraction benchmark over recorded HTML fixtures.
+
+Times each stage of the search pipeline separately (HTML parse,
+extract_articles, article body extraction, parse_date and
+calculate_relevance) for every source, reports throughput and peak memory
+and writes a JSON file that can be compared across commits.
+
+    python benchmarks/bench_extraction.py                 # run the suite
+    python benchmarks/bench_extraction.py --compare old.json
+    python benchmarks/bench_extraction.py --record "climate"   # refresh fixtures from the live sites
+    python benchmarks/bench_extraction.py --regenerate    # rebuild synthetic fixtures
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from scraper_core import ScraperCore, DEFAULT_SOURCES, ARTICLE_HEADERS, SEARCH_HEADERS
+import fixture_pages
+
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+FIXTURE_QUERY = "climate summit"
+
+# Large pages: many result cards plus ~1.5 MB of unrelated markup
+LARGE_CARDS = 200
+LARGE_PADDING_KB = 1500
+
+
+def fixture_path(source, kind):
+    return os.path.join(FIXTURE_DIR, f"{fixture_pages.slugify(source)}_{kind}.html")
+
+
+def regenerate_fixtures():
+    """Write synthetic search and article fixtures for every source"""
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for source in DEFAULT_SOURCES:
+        with open(fixture_path(source, "search"), 'w', encoding='utf-8') as f:
+            f.write(fixture_pages.search_page(source, FIXTURE_QUERY, count=20))
+        with open(fixture_path(source, "article"), 'w', encoding='utf-8') as f:
+            f.write(fixture_pages.article_page(source, f"{source} fixture article"))
+    print(f"Wrote fixtures for {len(DEFAULT_SOURCES)} sources to {FIXTURE_DIR}")
+
+
+def record_fixtures(query):
+    """Download live search pages (and the first article of each) as fixtures"""
+    import requests
+
+    core = ScraperCore()
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for source, base_url in core.sources.items():
+        search_url = core.build_search_url(base_url, query)
+        try:
+            response = requests.get(search_url, headers=SEARCH_HEADERS, timeout=15)
+            response.raise_for_status()
+            with open(fixture_path(source, "search"), 'w', encoding='utf-8') as f:
+                f.write(response.text)
+
+            articles = core.extract_articles(core.parse_html(response.text), source, search_url, query)
+            if articles:
+                article = requests.get(articles[0]['url'], headers=ARTICLE_HEADERS, timeout=15)
+                article.raise_for_status()
+                with open(fixture_path(source, "article"), 'w', encoding='utf-8') as f:
+                    f.write(article.text)
+            print(f"Recorded {source}: {len(response.content)} bytes, {len(articles)} articles")
+        except Exception as e:
+            print(f"Error recording {source}: {e}")
+
+
+def load_pages():
+    """Return {(source, variant): (search_html, article_html)} for the suite"""
+    if not os.path.isdir(FIXTURE_DIR):
+        regenerate_fixtures()
+
+    pages = {}
+    for source in DEFAULT_SOURCES:
+        try:
+            with open(fixture_path(source, "search"), encoding='utf-8') as f:
+                search_html = f.read()
+            with open(fixture_path(source, "article"), encoding='utf-8') as f:
+                article_html = f.read()
+        except OSError as e:
+            print(f"Missing fixture for {source}: {e}")
+            continue
+        pages[(source, "fixture")] = (search_html, article_html)
+        pages[(source, "large")] = (
+            fixture_pages.search_page(source, FIXTURE_QUERY, count=LARGE_CARDS, padding=LARGE_PADDING_KB),
+            fixture_pages.article_page(source, f"{source} large article", paragraphs=400)
+        )
+    return pages
+
+
+def time_stage(func, iterations):
+    """Run func repeatedly, returning per-call timings in seconds"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def peak_memory(func):
+    """Peak traced allocation of one call, in KiB"""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def measure(stage, source, variant, func, iterations, ops_per_call=1, bytes_per_call=0):
+    """Time and memory-profile one stage, returning a result row"""
+    func()  # warm up caches and lazy imports
+    timings = time_stage(func, iterations)
+    mean = statistics.mean(timings)
+    row = {
+        'stage': stage,
+        'source': source,
+        'variant': variant,
+        'iterations': iterations,
+        'mean_s': mean,
+        'median_s': statistics.median(timings),
+        'min_s': min(timings),
+        'ops_per_s': ops_per_call / mean if mean else 0,
+        'peak_kib': round(peak_memory(func), 1)
+    }
+    if bytes_per_call:
+        row['mb_per_s'] = bytes_per_call / mean / 1e6 if mean else 0
+    return row
+
+
+def run_suite(iterations, sources=None):
+    core = ScraperCore()
+    pages = load_pages()
+    rows = []
+    titles = []
+    dates = list(fixture_pages.DATE_SAMPLES)
+
+    for (source, variant), (search_html, article_html) in pages.items():
+        if sources and source not in sources:
+            continue
+        search_url = core.build_search_url(core.sources[source], FIXTURE_QUERY)
+        reps = max(1, iterations // 10) if variant == "large" else iterations
+
+        rows.append(measure("parse_search", source, variant,
+                            lambda: core.parse_html(search_html), reps,
+                            bytes_per_call=len(search_html.encode('utf-8'))))
+
+        soup = core.parse_html(search_html)
+        articles = core.extract_articles(soup, source, search_url, FIXTURE_QUERY)
+        rows.append(measure("extract_articles", source, variant,
+                            lambda: core.extract_articles(soup, source, search_url, FIXTURE_QUERY),
+                            reps, ops_per_call=max(1, len(articles))))
+        titles.extend(a['title'] for a in articles)
+        dates.extend(a['date'] for a in articles)
+
+        rows.append(measure("parse_article", source, variant,
+                            lambda: core.parse_html(article_html), reps,
+                            bytes_per_call=len(article_html.encode('utf-8'))))
+
+        article_soup = core.parse_html(article_html)
+        rows.append(measure("extract_article_content", source, variant,
+                            lambda: core.extract_article_content(article_soup), reps))
+
+    if dates:
+        rows.append(measure("parse_date", "all", "fixture",
+                            lambda: [core.parse_date(d) for d in dates], iterations,
+                            ops_per_call=len(dates)))
+    if titles:
+        rows.append(measure("calculate_relevance", "all", "fixture",
+                            lambda: [core.calculate_relevance(t, FIXTURE_QUERY) for t in titles],
+                            iterations, ops_per_call=len(titles)))
+    return rows
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def print_rows(rows, baseline=None):
+    previous = {}
+    if baseline:
+        previous = {(r['stage'], r['source'], r['variant']): r for r in baseline['results']}
+
+    print(f"{'stage':<24}{'source':<20}{'variant':<9}{'mean ms':>10}{'ops/s':>12}{'MB/s':>8}{'peak KiB':>10}{'vs base':>9}")
+    for row in rows:
+        mb = f"{row['mb_per_s']:.1f}" if 'mb_per_s' in row else ""
+        delta = ""
+        old = previous.get((row['stage'], row['source'], row['variant']))
+        if old and old['mean_s']:
+            delta = f"{(row['mean_s'] / old['mean_s'] - 1) * 100:+.0f}%"
+        print(f"{row['stage']:<24}{row['source'][:19]:<20}{row['variant']:<9}"
+              f"{row['mean_s'] * 1000:>10.3f}{row['ops_per_s']:>12.0f}{mb:>8}{row['peak_kib']:>10.0f}{delta:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline extraction benchmark")
+    parser.add_argument("--iterations", type=int, default=20, help="repetitions per stage (large pages use a tenth)")
+    parser.add_argument("--source", action="append", help="only benchmark this source (repeatable)")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<timestamp>_<commit>.json)")
+    parser.add_argument("--compare", help="previous results file to diff against")
+    parser.add_argument("--record", metavar="QUERY", help="record fixtures from the live sites and exit")
+    parser.add_argument("--regenerate", action="store_true", help="rebuild synthetic fixtures and exit")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.record)
+        return
+    if args.regenerate:
+        regenerate_fixtures()
+        return
+
+    rows = run_suite(args.iterations, args.source)
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': rows
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_rows(rows, baseline)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
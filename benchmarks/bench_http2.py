@@ -0,0 +1,102 @@
+"""Batch article fetch: pooled HTTP/1.1 vs multiplexed HTTP/2.
+
+Fetches the same set of article URLs in concurrent batches through the
+fetch layer, once per transport, and reports wall time, throughput and the
+protocol each response actually came over. The in-process stub server
+only speaks HTTP/1.1, so there the HTTP/2 run shows the fallback path;
+point --urls at a file of real article URLs (one per line, same host for
+the multiplexing case) to measure HTTP/2 itself.
+
+    python benchmarks/bench_http2.py --articles 64 --workers 16 --latency-ms 80
+    python benchmarks/bench_http2.py --urls article_urls.txt --rounds 3
+"""
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import fetcher
+from fetcher import Fetcher
+from metrics import METRICS
+from scraper_core import ScraperCore, ARTICLE_HEADERS, local_sources
+import stub_news_server
+
+
+def stub_article_urls(base_url, count):
+    """Article URLs from one stand-in source's search pages"""
+    core = ScraperCore(local_sources(base_url))
+    source = "The Guardian"
+    urls = []
+    query_words = ["election", "climate", "market", "health", "science", "sport"]
+    for word in query_words:
+        for article in core.search_source(source, core.sources[source], word):
+            if article['url'] not in urls:
+                urls.append(article['url'])
+        if len(urls) >= count:
+            break
+    return urls[:count]
+
+
+def run(transport, urls, workers, rounds):
+    """Fetch every URL `rounds` times; returns (seconds per round, errors, protocols seen)"""
+    client = Fetcher(http2=(transport == "http2"))
+    METRICS.reset()
+    timings = []
+    errors = 0
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _, response in client.get_many(urls, stage="article", headers=ARTICLE_HEADERS, workers=workers):
+                if isinstance(response, Exception) or response.status_code != 200:
+                    errors += 1
+            timings.append(time.perf_counter() - start)
+    finally:
+        client.close()
+    return timings, errors, METRICS.by_label('responses_by_protocol', 'protocol')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare pooled HTTP/1.1 with multiplexed HTTP/2 article fetches")
+    parser.add_argument("--urls", help="file with article URLs, one per line (default: in-process stub server)")
+    parser.add_argument("--articles", type=int, default=48, help="stub articles to fetch per round")
+    parser.add_argument("--workers", type=int, default=16, help="concurrent requests")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=60, help="in-process server latency")
+    args = parser.parse_args()
+
+    server = None
+    if args.urls:
+        with open(args.urls, 'r', encoding='utf-8') as f:
+            urls = [line.strip() for line in f if line.strip()]
+    else:
+        config = stub_news_server.StubConfig(latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 4)
+        server, base_url = stub_news_server.start_in_background(config=config)
+        urls = stub_article_urls(base_url, args.articles)
+    print(f"{len(urls)} URLs, {args.workers} concurrent, {args.rounds} rounds")
+
+    transports = ["http1", "http2"]
+    if fetcher.httpx is None:
+        print("httpx[http2] not installed; skipping the HTTP/2 run")
+        transports = ["http1"]
+
+    results = {}
+    for transport in transports:
+        timings, errors, protocols = run(transport, urls, args.workers, args.rounds)
+        best = min(timings)
+        results[transport] = best
+        seen = ", ".join(f"{protocol}: {count}" for protocol, count in sorted(protocols.items()))
+        print(f"{transport}: best {best * 1000:.0f} ms/round, {len(urls) / best:.1f} req/s, "
+              f"{errors} errors ({seen})")
+
+    if len(results) == 2:
+        print(f"HTTP/2 speedup: {results['http1'] / results['http2']:.2f}x")
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
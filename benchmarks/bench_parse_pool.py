@@ -0,0 +1,76 @@
+"""Parse throughput with and without the process-pool parse stage.
+
+Parses a batch of search and article pages (the committed fixtures, or
+the large variants with --large) in-process and then through ParsePool
+at each worker count, reporting pages per second. Fetching is left out so
+the numbers show how parsing alone scales with cores.
+
+    python benchmarks/bench_parse_pool.py --workers 1,2,4,8 --pages 64
+    python benchmarks/bench_parse_pool.py --large --chunksize 1
+"""
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_extraction import load_pages, FIXTURE_QUERY
+from parse_pool import ParsePool, parse_search_page, parse_article_page
+
+
+def build_jobs(pages, count, large):
+    """count search jobs and count article pages, cycling over the sources"""
+    variant = "large" if large else "fixture"
+    selected = [(source, html) for (source, v), html in pages.items() if v == variant]
+    search_jobs = []
+    article_pages = []
+    for i in range(count):
+        source, (search_html, article_html) = selected[i % len(selected)]
+        search_jobs.append((source, "https://example.com/search", FIXTURE_QUERY, search_html.encode('utf-8'), 'utf-8', None, True))
+        article_pages.append((article_html.encode('utf-8'), 'utf-8'))
+    return search_jobs, article_pages
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process-pool parse benchmark")
+    parser.add_argument("--workers", default="1,2,4", help="comma separated worker counts")
+    parser.add_argument("--pages", type=int, default=48, help="search pages and article pages per run")
+    parser.add_argument("--chunksize", type=int, default=4, help="pages per worker task")
+    parser.add_argument("--large", action="store_true", help="use the large page variants")
+    args = parser.parse_args()
+
+    search_jobs, article_pages = build_jobs(load_pages(), args.pages, args.large)
+    total = len(search_jobs) + len(article_pages)
+    print(f"{total} pages ({'large' if args.large else 'fixture'}), chunksize {args.chunksize}, {os.cpu_count()} CPUs")
+
+    def inline():
+        for job in search_jobs:
+            parse_search_page(job)
+        for page in article_pages:
+            parse_article_page(page)
+
+    baseline = timed(inline)
+    print(f"  in-process: {baseline:.2f}s, {total / baseline:.1f} pages/s")
+
+    for workers in [int(w) for w in args.workers.split(',') if w]:
+        pool = ParsePool(workers, args.chunksize)
+        try:
+            # Warm the workers so process start-up isn't counted
+            pool.parse_search_many(search_jobs[:workers])
+            elapsed = timed(lambda: (pool.parse_search_many(search_jobs), pool.parse_articles(article_pages)))
+        finally:
+            pool.close()
+        print(f"  {workers} workers: {elapsed:.2f}s, {total / elapsed:.1f} pages/s ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
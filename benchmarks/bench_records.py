@@ -0,0 +1,81 @@
+"""Memory per article: plain dicts vs ArticleRecord.
+
+Builds the same synthetic articles both ways and measures the traced
+allocation per article. "fresh" source names model rows loaded from the
+store or a snapshot, where every row gets its own copy of the source
+string; "shared" models extraction, where every article of a source
+references the same string.
+
+    python benchmarks/bench_records.py --count 200000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import fixture_pages
+from records import ArticleRecord
+from scraper_core import DEFAULT_SOURCES
+
+
+def raw_rows(count):
+    rng = random.Random(0)
+    sources = list(DEFAULT_SOURCES)
+    now = datetime(2025, 3, 4, 12, 0)
+    rows = []
+    for i in range(count):
+        source = sources[i % len(sources)]
+        title = fixture_pages.make_title(rng, "climate")
+        url = f"https://{fixture_pages.slugify(source)}.example{fixture_pages.article_path(source, i, rng)}"
+        rows.append((source, title, url, "2 hours ago", now - timedelta(minutes=i), rng.randint(0, 20)))
+    return rows
+
+
+def fresh_source(row):
+    # A distinct copy of the source name, as json / sqlite hand back per row
+    return ("".join(list(row[0])),) + row[1:]
+
+
+def measure(rows, build, fresh):
+    """Traced bytes held by the containers built from rows, per article"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = [build(fresh_source(row) if fresh else row) for row in rows]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    return (after - before) / len(rows)
+
+
+def as_dict(row):
+    source, title, url, date, date_obj, relevance = row
+    return {'source': source, 'title': title, 'url': url, 'date': date, 'date_obj': date_obj, 'relevance': relevance}
+
+
+def as_record(row):
+    return ArticleRecord(*row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Article memory footprint: dict vs ArticleRecord")
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    rows = raw_rows(args.count)
+    for label, fresh in (("shared source strings", False), ("fresh source strings", True)):
+        dict_bytes = measure(rows, as_dict, fresh)
+        record_bytes = measure(rows, as_record, fresh)
+        print(f"{label}: dict {dict_bytes:.0f} B/article, ArticleRecord {record_bytes:.0f} B/article "
+              f"({(1 - record_bytes / dict_bytes) * 100:.0f}% less, excluding shared title/url/date strings)")
+
+
+if __name__ == "__main__":
+    main()
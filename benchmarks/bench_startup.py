@@ -0,0 +1,101 @@
+"""Cold-start time of the GUI: process spawn to first paint.
+
+Each run starts a fresh interpreter that imports the app, builds the
+window and waits until it is mapped and drawn, then reports when that
+happened and when the background loader finished (stores open, requests
+and bs4 imported). Without a display only the import phase can be
+measured, and that is reported instead. Target: first paint under 200 ms.
+
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+APP_PATH = os.path.join(ROOT_DIR, "improved_news_scraper (1).py")
+
+TARGET_MS = 200
+
+# Runs in the child; times are relative to the child's first line
+CHILD = r'''
+import time
+start = time.perf_counter()
+import importlib.util, json, sys
+sys.path.insert(0, {root!r})
+spec = importlib.util.spec_from_file_location("news_app", {app!r})
+app_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(app_module)
+imported = time.perf_counter()
+heavy = sorted(m for m in ("requests", "bs4", "sqlite3", "cProfile", "pyarrow") if m in sys.modules)
+result = {{"import_ms": (imported - start) * 1000, "heavy_at_import": heavy}}
+try:
+    import tkinter as tk
+    root = tk.Tk()
+except Exception as e:
+    result["error"] = str(e)
+    print(json.dumps(result))
+    sys.exit(0)
+app = app_module.NewsScraperApp(root)
+root.wait_visibility(root)
+root.update_idletasks()
+result["paint_ms"] = (time.perf_counter() - start) * 1000
+def finish():
+    if not app.ready.is_set():
+        root.after(5, finish)
+        return
+    result["ready_ms"] = (time.perf_counter() - start) * 1000
+    print(json.dumps(result))
+    sys.stdout.flush()
+    app.on_close()
+root.after(0, finish)
+root.mainloop()
+'''
+
+
+def run_once(workdir):
+    code = CHILD.format(root=ROOT_DIR, app=APP_PATH)
+    spawned = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", code], cwd=workdir, capture_output=True, text=True, timeout=60)
+    wall = (time.perf_counter() - spawned) * 1000
+    lines = [line for line in output.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        raise RuntimeError(output.stderr.strip() or "no output from child")
+    result = json.loads(lines[-1])
+    result["wall_ms"] = wall
+    return result
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    # A scratch working directory, so the app opens empty stores like a first run
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [run_once(workdir) for _ in range(args.runs)]
+
+    print(f"Modules imported: {median([r['import_ms'] for r in results]):.0f} ms median "
+          f"(heavy modules loaded at import: {', '.join(results[0]['heavy_at_import']) or 'none'})")
+    if "error" in results[0]:
+        print(f"No display ({results[0]['error']}); only the import phase was measured")
+        return
+    paint = median([r['paint_ms'] for r in results])
+    print(f"First paint: {paint:.0f} ms median after interpreter start "
+          f"({'within' if paint < TARGET_MS else 'over'} the {TARGET_MS} ms target)")
+    print(f"Background load done: {median([r['ready_ms'] for r in results]):.0f} ms median")
+    print(f"Whole run, spawn to exit: {median([r['wall_ms'] for r in results]):.0f} ms median wall")
+
+
+if __name__ == "__main__":
+    main()
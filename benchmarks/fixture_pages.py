@@ -0,0 +1,225 @@
+"""Synthetic search-result and article pages for every configured source.
+
+Each builder mirrors the markup shape the extractors in scraper_core look
+for (.PagePromo, li.search-result, .fc-item, ...), so the pages can stand in
+for the live sites in benchmarks and offline load tests.
+"""
+import random
+
+from scraper_core import DEFAULT_SOURCES, source_slug
+
+slugify = source_slug
+
+# Words used to build headlines and body text
+WORDS = [
+    "election", "climate", "summit", "market", "talks", "court", "ruling", "storm",
+    "minister", "report", "vote", "border", "trade", "health", "energy", "war",
+    "ceasefire", "budget", "strike", "police", "protest", "science", "space",
+    "football", "inflation", "pope", "agreement", "crisis", "investigation", "deal"
+]
+
+DATE_SAMPLES = [
+    "3 hours ago", "15 minutes ago", "2 days ago", "March 4, 2025", "Mar 4, 2025",
+    "2025-03-04", "04/03/2025", "4 Mar 2025", "4 March 2025", "2025.03.04",
+    "2025-03-04T10:15:00+0000", "Recent", "1 week ago", "yesterday"
+]
+
+# Where each source puts its article links, used for relative hrefs
+SOURCE_HOSTS = {
+    "AP News": "https://apnews.com",
+    "Reuters": "https://www.reuters.com",
+    "BBC": "https://www.bbc.co.uk",
+    "NPR": "https://www.npr.org",
+    "The Guardian": "https://www.theguardian.com",
+    "Al Jazeera": "https://www.aljazeera.com",
+    "CNN": "https://www.cnn.com",
+    "The New York Times": "https://www.nytimes.com"
+}
+
+PAGE_HEAD = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{title}</title>
+<link rel="stylesheet" href="/static/site.css"><script src="/static/app.js"></script></head>
+<body>
+<header><nav><a href="/">Home</a> <a href="/world">World</a> <a href="/politics">Politics</a>
+<a href="/account/login">Sign in</a> <a href="/newsletter">Subscribe</a></nav></header>
+<main>
+"""
+
+PAGE_FOOT = """
+</main>
+<footer><a href="/about">About</a> <a href="/terms">Terms</a> <a href="/privacy">Privacy</a>
+<a href="https://twitter.com/news">Twitter</a></footer>
+</body></html>
+"""
+
+
+def source_from_slug(slug):
+    """Inverse of slugify for the configured sources"""
+    for source in DEFAULT_SOURCES:
+        if source_slug(source) == slug:
+            return source
+    return None
+
+
+def make_title(rng, query):
+    """Build a headline that mentions the query some of the time"""
+    words = rng.sample(WORDS, 6)
+    if query and rng.random() < 0.7:
+        words.insert(rng.randrange(len(words)), query)
+    return " ".join(words).capitalize()
+
+
+def article_path(source, index, rng):
+    """A plausible article path for the source"""
+    slug = "-".join(rng.sample(WORDS, 4))
+    if source in ("CNN", "The New York Times", "The Guardian"):
+        return f"/2025/03/{(index % 28) + 1:02d}/world/{slug}-{index}"
+    if source == "NPR":
+        return f"/2025/03/04/{100000 + index}/{slug}"
+    if source == "BBC":
+        return f"/news/world-{60000000 + index}"
+    if source == "Al Jazeera":
+        return f"/news/2025/3/4/{slug}"
+    return f"/article/{slug}-{index:08x}"
+
+
+def render_card(source, title, href, date_text):
+    """Render one search result in the source's markup"""
+    if source == "AP News":
+        return (f'<div class="PagePromo" data-key="card"><div class="PagePromo-content">'
+                f'<div class="PagePromo-title"><a class="Link" href="{href}">'
+                f'<span class="PagePromoContentIcons-text">{title}</span></a></div>'
+                f'<div class="PagePromo-description">Summary text for the story.</div>'
+                f'<span class="PagePromo-timestamp">{date_text}</span></div></div>')
+    if source == "Reuters":
+        return (f'<li class="search-result"><div class="search-result-content">'
+                f'<h3 class="search-result-title"><a href="{href}">{title}</a></h3>'
+                f'<time class="search-result-timestamp">{date_text}</time></div></li>')
+    if source == "BBC":
+        return (f'<div class="ssrcss-1020bd1-Stack e1y4nx260"><a href="{href}" class="ssrcss-its5xf-PromoLink">'
+                f'<h3 class="ssrcss-6arcww-PromoHeadline">{title}</h3></a>'
+                f'<time data-testid="timestamp">{date_text}</time></div>')
+    if source == "NPR":
+        return (f'<div class="item-info"><div class="slug-wrap"><h3 class="slug">World</h3></div>'
+                f'<h2 class="title"><a href="{href}">{title}</a></h2>'
+                f'<p class="teaser"><time>{date_text}</time> Summary text.</p></div>')
+    if source == "The Guardian":
+        return (f'<div class="fc-item"><div class="fc-item__container">'
+                f'<h3 class="fc-item__title"><a class="fc-item__link" href="{href}">{title}</a></h3>'
+                f'<time class="fc-item__timestamp">{date_text}</time></div></div>')
+    if source == "Al Jazeera":
+        return (f'<article class="gc u-clickable-card"><div class="gc__content">'
+                f'<h3 class="gc__title"><a class="u-clickable-card__link" href="{href}">{title}</a></h3>'
+                f'<div class="gc__excerpt">Summary text.</div>'
+                f'<div class="date-simple">{date_text}</div></div></article>')
+    if source == "CNN":
+        return (f'<div class="cnn-search__result"><div class="cnn-search__result-contents">'
+                f'<h3 class="cnn-search__result-headline"><a href="{href}">{title}</a></h3>'
+                f'<div class="cnn-search__result-publish-date">{date_text}</div></div></div>')
+    if source == "The New York Times":
+        return (f'<li class="css-1l4w6pd" data-testid="search-bodega-result"><div class="css-1i8vfl5">'
+                f'<a href="{href}"><h4 class="css-2fgx4k">{title}</h4></a>'
+                f'<span data-testid="publication-date">{date_text}</span></div></li>')
+    return f'<div class="result"><a href="{href}"><h3>{title}</h3></a><time>{date_text}</time></div>'
+
+
+def wrap_cards(source, cards):
+    """Wrap the rendered cards in the source's list container"""
+    body = "\n".join(cards)
+    if source == "AP News":
+        return f'<div class="CardList"><div class="CardList-items">{body}</div></div>'
+    if source in ("Reuters", "The New York Times"):
+        return f'<ul class="search-results">{body}</ul>'
+    if source == "NPR":
+        return f'<div id="main-section"><article class="stories-list">{body}</article></div>'
+    return f'<div class="search-results">{body}</div>'
+
+
+def search_page(source, query, count=20, base_url=None, seed=0, padding=0, next_href=None):
+    """Build a search results page.
+
+    base_url makes the article links absolute (used by the local stand-in
+    server); padding adds that many kilobytes of unrelated markup to model
+    the heavy script and navigation payloads of the real pages; next_href
+    adds a rel="next" pagination link after the results.
+    """
+    rng = random.Random(f"{source}:{query}:{seed}")
+    host = SOURCE_HOSTS.get(source, "")
+    cards = []
+    for index in range(count):
+        path = article_path(source, seed * 1000 + index, rng)
+        if base_url:
+            href = base_url.rstrip('/') + path
+        elif source == "The Guardian":
+            href = host + path
+        else:
+            href = path
+        cards.append(render_card(source, make_title(rng, query), href, rng.choice(DATE_SAMPLES)))
+
+    head_filler = tail_filler = ""
+    if padding:
+        # Like the real pages: some script and nav markup ahead of the results,
+        # most of it (inline app state, footers) after them
+        chunk = '<div class="ad-slot" data-config="' + "x" * 1000 + '"></div>\n'
+        head_filler = chunk * (padding // 4)
+        tail_filler = chunk * (padding - padding // 4)
+
+    pager = f'<nav class="pagination"><a rel="next" href="{next_href}">Next</a></nav>\n' if next_href else ""
+    return (PAGE_HEAD.format(title=f"Search: {query} | {source}") + head_filler +
+            wrap_cards(source, cards) + pager + tail_filler + PAGE_FOOT)
+
+
+def article_page(source, title, paragraphs=12, seed=0):
+    """Build an article page with a body, byline and surrounding chrome"""
+    rng = random.Random(f"{source}:{title}:{seed}")
+    body = []
+    for _ in range(paragraphs):
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(18, 40)))
+        body.append(f"<p>{sentence.capitalize()}.</p>")
+    return (PAGE_HEAD.format(title=title) +
+            f'<article><h1>{title}</h1>'
+            f'<div class="byline">By Staff Reporter</div>'
+            f'<time class="published-date">March 4, 2025</time>'
+            f'<div class="article-body">{"".join(body)}</div></article>'
+            '<aside><p>Related: short link</p></aside>' + PAGE_FOOT)
+
+
+def feed_xml(source, count=50, base_url=None, seed=0):
+    """Build an RSS 2.0 feed of recent items for the source"""
+    rng = random.Random(f"{source}:feed:{seed}")
+    host = base_url.rstrip('/') if base_url else SOURCE_HOSTS.get(source, "")
+    items = []
+    for index in range(count):
+        title = make_title(rng, rng.choice(WORDS))
+        link = host + article_path(source, seed * 1000 + index, rng)
+        pub_date = f"Tue, {(index % 28) + 1:02d} Mar 2025 {index % 24:02d}:15:00 GMT"
+        items.append(f"<item><title>{title}</title><link>{link}</link>"
+                     f"<guid>{link}</guid><pubDate>{pub_date}</pubDate>"
+                     f"<description>Summary text for the story.</description></item>")
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>'
+            f"<title>{source}</title><link>{host}</link>" + "".join(items) + "</channel></rss>")
+
+
+def sitemap_index_xml(source, base_url, children=2):
+    """A sitemap index pointing at news sitemaps on the same host"""
+    entries = "".join(f"<sitemap><loc>{base_url}/sitemap-news-{n}.xml</loc>"
+                      f"<lastmod>2025-03-{n + 1:02d}T00:00:00Z</lastmod></sitemap>"
+                      for n in range(1, children + 1))
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">' + entries + '</sitemapindex>')
+
+
+def news_sitemap_xml(source, base_url, count=500, seed=0):
+    """A Google News sitemap with news:title and publication dates"""
+    rng = random.Random(f"{source}:sitemap:{seed}")
+    entries = []
+    for index in range(count):
+        link = base_url + article_path(source, seed * 10000 + index, rng)
+        stamp = f"2025-03-{(index % 28) + 1:02d}T{index % 24:02d}:00:00Z"
+        entries.append(f"<url><loc>{link}</loc><lastmod>{stamp}</lastmod><news:news>"
+                       f"<news:publication><news:name>{source}</news:name><news:language>en</news:language></news:publication>"
+                       f"<news:publication_date>{stamp}</news:publication_date>"
+                       f"<news:title>{make_title(rng, rng.choice(WORDS))}</news:title></news:news></url>")
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+            'xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">' + "".join(entries) + '</urlset>')
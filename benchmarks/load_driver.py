@@ -0,0 +1,130 @@
+"""Load driver for end-to-end searches against the stand-in news server.
+
+Runs full searches (every source, like the GUI's search_news) from a pool
+of concurrent clients and reports searches per second and latency
+percentiles. Without --target it starts a stub server in-process.
+
+    python benchmarks/load_driver.py --clients 8 --duration 30 --latency-ms 80
+    python benchmarks/load_driver.py --target http://127.0.0.1:8765 --fetch-articles 1
+    python benchmarks/load_driver.py --clients 8 --padding-kb 500 --parse-workers 4
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from parse_pool import ParsePool
+from scraper_core import ScraperCore, local_sources
+from source_health import SOURCE_HOLD_ENV
+import fixture_pages
+import stub_news_server
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_search(core, query, fetch_articles, result_limit=None):
+    """One GUI-equivalent search: every source, then optional article fetches"""
+    results = []
+    errors = 0
+    for source, base_url in core.sources.items():
+        try:
+            results.extend(core.search_source(source, base_url, query, limit=result_limit))
+        except Exception:
+            errors += 1
+    results.sort(key=core.sort_key, reverse=True)
+    for article in results[:fetch_articles]:
+        try:
+            core.fetch_article(article['url'])
+        except Exception:
+            errors += 1
+    return len(results), errors
+
+
+def client_loop(core, deadline, fetch_articles, result_limit, latencies, totals, lock, client_id):
+    iteration = 0
+    while time.perf_counter() < deadline:
+        query = " ".join(fixture_pages.WORDS[(client_id + iteration + k) % len(fixture_pages.WORDS)] for k in range(2))
+        start = time.perf_counter()
+        found, errors = run_search(core, query, fetch_articles, result_limit)
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            totals['articles'] += found
+            totals['errors'] += errors
+        iteration += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end search load driver")
+    parser.add_argument("--target", help="base URL of a running stub server (default: start one in-process)")
+    parser.add_argument("--clients", type=int, default=4, help="concurrent searching clients")
+    parser.add_argument("--duration", type=float, default=10, help="seconds to run")
+    parser.add_argument("--fetch-articles", type=int, default=0, help="articles fetched after each search")
+    parser.add_argument("--latency-ms", type=float, default=50, help="in-process server latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="in-process server error rate")
+    parser.add_argument("--padding-kb", type=int, default=0, help="in-process server page padding")
+    parser.add_argument("--result-limit", type=int, help="stream search pages and stop once this many results are parsed")
+    parser.add_argument("--parse-workers", type=int, default=0, help="parse in this many worker processes (0: in the client threads)")
+    parser.add_argument("--parse-chunksize", type=int, default=4, help="pages per worker task in batch parses")
+    parser.add_argument("--source-hold", type=float, default=0,
+                        help="hold failing sources this many seconds (default 0: never skip, so injected errors don't hide load)")
+    args = parser.parse_args()
+    os.environ[SOURCE_HOLD_ENV] = str(args.source_hold)
+
+    parse_pool = False
+    if args.parse_workers:
+        parse_pool = ParsePool(args.parse_workers, args.parse_chunksize)
+
+    server = None
+    target = args.target
+    if not target:
+        config = stub_news_server.StubConfig(latency_ms=args.latency_ms, error_rate=args.error_rate,
+                                             padding_kb=args.padding_kb)
+        server, target = stub_news_server.start_in_background(config=config)
+        print(f"Started stand-in server at {target}")
+
+    latencies = []
+    totals = {'articles': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+    started = time.perf_counter()
+
+    threads = []
+    for client_id in range(args.clients):
+        core = ScraperCore(local_sources(target), parse_pool=parse_pool)
+        thread = threading.Thread(target=client_loop, args=(core, deadline, args.fetch_articles, args.result_limit,
+                                                            latencies, totals, lock, client_id), daemon=True)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    if server:
+        server.shutdown()
+    if parse_pool:
+        parse_pool.close()
+
+    latencies.sort()
+    print(f"Searches: {len(latencies)} in {wall:.1f}s with {args.clients} clients")
+    print(f"Throughput: {len(latencies) / wall:.2f} searches/s")
+    print(f"Articles found: {totals['articles']}, errors: {totals['errors']}")
+    for pct in (50, 90, 95, 99):
+        print(f"  p{pct}: {percentile(latencies, pct) * 1000:.0f} ms")
+    if latencies:
+        print(f"  max: {latencies[-1] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Local stand-in for the eight news sites, for offline end-to-end testing.
+
+Serves synthetic search-result and article pages in each source's real
+markup shape under /<source-slug>/search?q=... and /<source-slug>/<path>,
+plus an RSS feed and a news sitemap index per source at
+/<source-slug>/feed.xml and /<source-slug>/sitemap.xml.
+Latency, error rate and page size are configurable, so concurrency,
+caching and rate limiting can be exercised without touching the network.
+
+    python benchmarks/stub_news_server.py --port 8765 --latency-ms 120 --error-rate 0.05
+
+Point the scraper at it with:
+
+    NEWS_SCRAPER_SOURCE_BASE=http://127.0.0.1:8765 python "improved_news_scraper (1).py"
+"""
+import argparse
+import gzip
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, quote_plus
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import fixture_pages
+from scraper_core import SEARCH_PAGINATION
+
+
+class StubConfig:
+    """Knobs shared by all request handlers of one server"""
+
+    def __init__(self, latency_ms=50, jitter_ms=25, error_rate=0.0, cards=20,
+                 padding_kb=0, paragraphs=12, seed=None, compress=True, pages=10):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.cards = cards
+        self.padding_kb = padding_kb
+        self.paragraphs = paragraphs
+        self.compress = compress  # gzip bodies for clients that accept it, like the real sites
+        self.pages = pages  # result pages per search; later pages come back empty
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests_served = 0
+        self.errors_served = 0
+
+    def delay(self):
+        """Simulated server think time in seconds"""
+        with self.lock:
+            jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def should_fail(self):
+        with self.lock:
+            return self.rng.random() < self.error_rate
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real sites
+    config = None  # set per server by make_server
+
+    def do_GET(self):
+        config = self.config
+        time.sleep(config.delay())
+
+        with config.lock:
+            config.requests_served += 1
+
+        parts = urlsplit(self.path)
+        segments = [s for s in parts.path.split('/') if s]
+        source = fixture_pages.source_from_slug(segments[0]) if segments else None
+
+        if source is None:
+            self.send_text(404, "text/plain", "Unknown source")
+            return
+
+        if config.should_fail():
+            with config.lock:
+                config.errors_served += 1
+            self.send_text(config.rng.choice([500, 502, 503]), "text/plain", "Simulated upstream error")
+            return
+
+        base_url = f"http://{self.headers.get('Host', 'localhost')}/{segments[0]}"
+        if len(segments) > 1 and segments[1] == "search":
+            params = parse_qs(parts.query)
+            query = params.get('q', [''])[0]
+            # Each source's own paging parameter (page number or result offset), else ?page=
+            pagination = SEARCH_PAGINATION.get(source, {'param': "page", 'first': 1, 'step': 1})
+            value = params.get(pagination['param'], [''])[0]
+            page = (int(value) - pagination['first']) // pagination['step'] + 1 if value else 1
+            more = page < config.pages
+            next_href = f"/{segments[0]}/search?q={quote_plus(query)}&page={page + 1}" if more else None
+            html = fixture_pages.search_page(source, query, count=config.cards if page <= config.pages else 0,
+                                             base_url=base_url, seed=page - 1, padding=config.padding_kb,
+                                             next_href=next_href)
+        elif len(segments) > 1 and segments[1] == "sitemap.xml":
+            self.send_text(200, "application/xml", fixture_pages.sitemap_index_xml(source, base_url))
+            return
+        elif len(segments) > 1 and segments[1].startswith("sitemap-news-"):
+            seed = int(segments[1][len("sitemap-news-"):].split('.')[0] or 0)
+            self.send_text(200, "application/xml", fixture_pages.news_sitemap_xml(source, base_url, seed=seed))
+            return
+        elif len(segments) > 1 and segments[1] == "feed.xml":
+            xml = fixture_pages.feed_xml(source, base_url=base_url)
+            self.send_text(200, "application/rss+xml; charset=utf-8", xml)
+            return
+        else:
+            title = segments[-1].replace('-', ' ').capitalize()
+            html = fixture_pages.article_page(source, title, paragraphs=config.paragraphs)
+        self.send_text(200, "text/html; charset=utf-8", html)
+
+    def send_text(self, status, content_type, text):
+        body = text.encode('utf-8')
+        etag = None
+        if status == 200:
+            # Pages are deterministic, so a content hash makes a valid ETag
+            etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        encoding = None
+        if status == 200 and self.config.compress and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body, compresslevel=5)
+            encoding = "gzip"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+            self.send_header("Vary", "Accept-Encoding")
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Request logging would dominate the output under load
+        pass
+
+
+def make_server(host="127.0.0.1", port=0, config=None):
+    """Create a threaded stub server; port 0 picks a free port"""
+    handler = type("BoundStubHandler", (StubHandler,), {'config': config or StubConfig()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_background(host="127.0.0.1", port=0, config=None):
+    """Start a stub server on a daemon thread and return (server, base_url)"""
+    server = make_server(host, port, config)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{server.server_address[0]}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stand-in for the news sites")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50, help="mean response delay")
+    parser.add_argument("--jitter-ms", type=float, default=25, help="uniform +/- jitter on the delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 5xx")
+    parser.add_argument("--cards", type=int, default=20, help="results per search page")
+    parser.add_argument("--padding-kb", type=int, default=0, help="extra markup per search page, in KB")
+    parser.add_argument("--paragraphs", type=int, default=12, help="paragraphs per article page")
+    parser.add_argument("--pages", type=int, default=10, help="result pages per search")
+    parser.add_argument("--seed", type=int, help="seed for latency and error sampling")
+    parser.add_argument("--no-compress", action="store_true", help="never gzip response bodies")
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.cards,
+                        args.padding_kb, args.paragraphs, args.seed, not args.no_compress, args.pages)
+    server = make_server(args.host, args.port, config)
+    print(f"Serving stand-in news sites on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served {config.requests_served} requests ({config.errors_served} simulated errors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Cancellation of superseded searches and article fetches.
+
+A search or article fetch runs with a cancel event, a plain
+threading.Event like the exporter's. The fetcher checks it before each
+request and between body chunks, the scraper between result pages and
+before every parse; once it is set they raise Cancelled, so abandoned
+work stops using the network and the CPU as soon as it reaches a check.
+LatestOnly hands out those events such that starting a new job cancels
+the one before it, and the GUI drops whatever a cancelled job produced.
+"""
+import threading
+
+from metrics import METRICS
+
+
+class Cancelled(Exception):
+    """The job was cancelled, usually because a newer one replaced it"""
+
+
+def check(cancel):
+    """Raise Cancelled if the cancel event is set; None never cancels"""
+    if cancel is not None and cancel.is_set():
+        raise Cancelled()
+
+
+class LatestOnly:
+    """Cancel events for a kind of job of which only the latest one matters"""
+
+    def __init__(self, name):
+        self.name = name
+        self.current = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        """A cancel event for a new job; the job still running, if any, is cancelled"""
+        cancel = threading.Event()
+        with self.lock:
+            previous, self.current = self.current, cancel
+        self._cancel(previous)
+        return cancel
+
+    def finish(self, cancel):
+        """Mark a job as done, so starting the next one doesn't count it as cancelled"""
+        with self.lock:
+            if self.current is cancel:
+                self.current = None
+
+    def cancel(self):
+        """Cancel the running job, if any"""
+        with self.lock:
+            previous, self.current = self.current, None
+        self._cancel(previous)
+
+    def _cancel(self, cancel):
+        if cancel is not None and not cancel.is_set():
+            cancel.set()
+            METRICS.inc('cancelled', job=self.name)
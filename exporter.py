@@ -0,0 +1,201 @@
+"""Streaming export of search results or the article store.
+
+Rows are pulled from any iterable (the current results, or a cursor over
+the article store) and written in chunks through a large buffer, so memory
+stays flat no matter how many rows are exported. Exports run on a
+background thread and report progress through callbacks.
+
+Formats: txt (the original human-readable report), csv, jsonl and parquet
+(parquet needs the optional pyarrow package).
+
+    python exporter.py all_articles.csv                # whole store
+    python exporter.py climate.jsonl --query climate   # store matches only
+"""
+import argparse
+import csv
+import json
+import os
+import threading
+from datetime import datetime
+
+FORMATS = ('txt', 'csv', 'jsonl', 'parquet')
+FIELDS = ('source', 'title', 'url', 'date', 'date_obj', 'relevance', 'body')
+
+CHUNK_SIZE = 5000
+BUFFER_SIZE = 1024 * 1024
+
+
+def format_for_path(path):
+    """Pick the export format from a file extension"""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in FORMATS:
+        return extension
+    raise ValueError(f"Unsupported export format: .{extension} (use one of {', '.join(FORMATS)})")
+
+
+def row_values(article):
+    """Flatten an article into export values, in FIELDS order"""
+    date_obj = article.get('date_obj')
+    return [
+        article.get('source'), article.get('title'), article.get('url'), article.get('date'),
+        date_obj.isoformat() if date_obj else None, article.get('relevance'), article.get('body')
+    ]
+
+
+def chunked(articles, size):
+    chunk = []
+    for article in articles:
+        chunk.append(article)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_txt(f, chunk):
+    parts = []
+    for article in chunk:
+        parts.append(f"Source: {article['source']}\nTitle: {article['title']}\nDate: {article['date']}\n"
+                     f"URL: {article['url']}\nRelevance: {article['relevance']}\n" + "-" * 50 + "\n\n")
+    f.write("".join(parts))
+
+
+def write_jsonl(f, chunk):
+    f.write("".join(json.dumps(dict(zip(FIELDS, row_values(a))), ensure_ascii=False) + "\n" for a in chunk))
+
+
+def export_articles(articles, path, fmt=None, title=None, chunk_size=CHUNK_SIZE, progress=None, cancel=None):
+    """Write articles to path in chunks; returns the number of rows written.
+
+    progress(rows_so_far) is called after each chunk; a set cancel event
+    stops the export between chunks.
+    """
+    fmt = fmt or format_for_path(path)
+    if fmt == 'parquet':
+        return _export_parquet(articles, path, chunk_size, progress, cancel)
+
+    tmp_path = path + ".partial"
+    written = 0
+    newline = '' if fmt == 'csv' else None
+    with open(tmp_path, 'w', encoding='utf-8', buffering=BUFFER_SIZE, newline=newline) as f:
+        writer = None
+        if fmt == 'txt':
+            f.write(f"News Search Results - {title or ''}\n")
+            f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        elif fmt == 'csv':
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+
+        for chunk in chunked(articles, chunk_size):
+            if cancel is not None and cancel.is_set():
+                break
+            if fmt == 'txt':
+                write_txt(f, chunk)
+            elif fmt == 'csv':
+                writer.writerows(row_values(a) for a in chunk)
+            else:
+                write_jsonl(f, chunk)
+            written += len(chunk)
+            if progress:
+                progress(written)
+
+    if cancel is not None and cancel.is_set():
+        os.remove(tmp_path)
+        return written
+    os.replace(tmp_path, path)
+    return written
+
+
+def _export_parquet(articles, path, chunk_size, progress, cancel):
+    # Imported here: pyarrow is slow to load and the GUI imports this module at startup
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet export needs the pyarrow package (pip install pyarrow)")
+
+    schema = pyarrow.schema([
+        ('source', pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+        ('title', pyarrow.string()),
+        ('url', pyarrow.string()),
+        ('date', pyarrow.string()),
+        ('date_obj', pyarrow.timestamp('s')),
+        ('relevance', pyarrow.int32()),
+        ('body', pyarrow.string())
+    ])
+    tmp_path = path + ".partial"
+    written = 0
+    with pyarrow.parquet.ParquetWriter(tmp_path, schema, compression='zstd') as writer:
+        for chunk in chunked(articles, chunk_size):
+            if cancel is not None and cancel.is_set():
+                break
+            columns = {name: [] for name in FIELDS}
+            for article in chunk:
+                for name in FIELDS:
+                    columns[name].append(article.get(name))
+            columns['source'] = pyarrow.array(columns['source']).dictionary_encode()
+            writer.write_table(pyarrow.table(columns, schema=schema))
+            written += len(chunk)
+            if progress:
+                progress(written)
+
+    if cancel is not None and cancel.is_set():
+        os.remove(tmp_path)
+        return written
+    os.replace(tmp_path, path)
+    return written
+
+
+class ExportJob:
+    """Runs export_articles on a background thread"""
+
+    def __init__(self, articles, path, fmt=None, title=None, on_progress=None, on_done=None):
+        self.articles = articles
+        self.path = path
+        self.fmt = fmt or format_for_path(path)
+        self.title = title
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _run(self):
+        error = None
+        written = 0
+        try:
+            written = export_articles(self.articles, self.path, self.fmt, self.title,
+                                      progress=self.on_progress, cancel=self.cancel_event)
+        except Exception as e:
+            error = e
+        if self.on_done:
+            self.on_done(written, error)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the article store")
+    parser.add_argument("path", help="output file; the extension picks the format")
+    parser.add_argument("--db", default="articles.db")
+    parser.add_argument("--query", help="only export articles matching this full-text query")
+    parser.add_argument("--source", action="append", help="only export this source (repeatable)")
+    args = parser.parse_args()
+
+    from article_store import ArticleStore
+    store = ArticleStore(args.db)
+    try:
+        written = export_articles(store.iter_articles(args.query, args.source), args.path,
+                                  progress=lambda n: print(f"\r{n} rows", end="", flush=True))
+        print(f"\nExported {written} articles to {args.path}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
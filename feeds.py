@@ -0,0 +1,264 @@
+"""RSS/Atom feed ingestion as a fast path ahead of HTML search scraping.
+
+Feeds are far smaller than the JS-heavy search pages and carry exact
+publication dates. Each source's feeds are fetched with conditional GET
+(ETag / Last-Modified) and parsed incrementally with iterparse straight
+off the response stream, clearing each item once read. Items go into a
+rolling in-memory index (newest N per source, with a persisted copy), and
+queries are matched against it first; a source falls back to its HTML
+search page only when the feed index doesn't yield enough matches.
+"""
+import json
+import os
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+from urls import canonical_url
+from cancellation import Cancelled, check
+from records import ArticleRecord
+from scraper_core import source_slug, DEFAULT_SOURCES
+
+# Feeds per source; the first few sections cover most general news queries
+SOURCE_FEEDS = {
+    "AP News": ["https://apnews.com/index.rss"],
+    "Reuters": [],
+    "BBC": ["https://feeds.bbci.co.uk/news/rss.xml", "https://feeds.bbci.co.uk/news/world/rss.xml"],
+    "NPR": ["https://feeds.npr.org/1001/rss.xml", "https://feeds.npr.org/1004/rss.xml"],
+    "The Guardian": ["https://www.theguardian.com/world/rss", "https://www.theguardian.com/uk/rss"],
+    "Al Jazeera": ["https://www.aljazeera.com/xml/rss/all.xml"],
+    "CNN": ["http://rss.cnn.com/rss/edition.rss", "http://rss.cnn.com/rss/edition_world.rss"],
+    "The New York Times": ["https://rss.nytimes.com/services/xml/rss/nyt/HomePage.xml",
+                           "https://rss.nytimes.com/services/xml/rss/nyt/World.xml"]
+}
+
+FEED_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36",
+    "Accept": "application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8"
+}
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+DC = "{http://purl.org/dc/elements/1.1/}"
+
+# Don't re-poll a feed more often than this, in seconds
+MIN_REFRESH = 300
+# Items kept per source in the rolling index
+MAX_ITEMS_PER_SOURCE = 2000
+# Query and title words matched against each other
+WORD = re.compile(r"\w+")
+
+
+def local_feeds(base_url, sources=None):
+    """Feed URLs on the local stand-in server, matching local_sources()"""
+    base_url = base_url.rstrip('/')
+    return {source: [f"{base_url}/{source_slug(source)}/feed.xml"] for source in (sources or DEFAULT_SOURCES)}
+
+
+def parse_feed_date(text):
+    """RFC 822 (RSS) or ISO 8601 (Atom) date as naive local time"""
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        parsed = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def iter_feed_items(stream):
+    """Yield (title, link, date_text) from an RSS or Atom byte stream"""
+    for _, elem in ET.iterparse(stream, events=("end",)):
+        if elem.tag == "item":
+            title = elem.findtext("title") or ""
+            link = elem.findtext("link") or elem.findtext("guid") or ""
+            date_text = elem.findtext("pubDate") or elem.findtext(DC + "date") or ""
+            yield title.strip(), link.strip(), date_text.strip()
+            elem.clear()
+        elif elem.tag == ATOM + "entry":
+            title = elem.findtext(ATOM + "title") or ""
+            link = ""
+            for link_elem in elem.findall(ATOM + "link"):
+                if link_elem.get("rel", "alternate") == "alternate":
+                    link = link_elem.get("href", "")
+                    break
+            date_text = elem.findtext(ATOM + "published") or elem.findtext(ATOM + "updated") or ""
+            yield title.strip(), link.strip(), date_text.strip()
+            elem.clear()
+
+
+class FeedIndex:
+    """Rolling index of recent feed items per source"""
+
+    def __init__(self, core, feeds=None, cache_path="feed_index.json", fetcher=None):
+        self.core = core
+        self.feeds = feeds if feeds is not None else SOURCE_FEEDS
+        self.cache_path = cache_path
+        self._fetcher = fetcher
+        self.items = {}       # source -> {canonical url: item}
+        self.validators = {}  # feed url -> (etag, last_modified)
+        self.fetched_at = {}  # feed url -> monotonic time of last poll
+        self.lock = threading.Lock()
+        self.loaded = False
+
+    @property
+    def fetcher(self):
+        # Resolved on first use so building the index doesn't import requests
+        if self._fetcher is None:
+            if getattr(self.core, 'fetcher', None) is not None:
+                self._fetcher = self.core.fetcher
+            else:
+                from fetcher import Fetcher
+                self._fetcher = Fetcher()
+        return self._fetcher
+
+    def load(self):
+        """Read the persisted index; done on first use, off the GUI thread"""
+        with self.lock:
+            if self.loaded:
+                return
+            self.loaded = True
+            if not self.cache_path or not os.path.exists(self.cache_path):
+                return
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                for source, items in data.get('items', {}).items():
+                    self.items[source] = {
+                        key: dict(item, date_obj=datetime.fromisoformat(item['date_obj']) if item['date_obj'] else None)
+                        for key, item in items.items()
+                    }
+                self.validators = {url: tuple(v) for url, v in data.get('validators', {}).items()}
+            except Exception as e:
+                print(f"Error loading feed index: {e}")
+
+    def save(self):
+        if not self.cache_path or not self.loaded:
+            return
+        with self.lock:
+            data = {
+                'items': {source: {key: dict(item, date_obj=item['date_obj'].isoformat() if item['date_obj'] else None)
+                                   for key, item in items.items()}
+                          for source, items in self.items.items()},
+                'validators': self.validators
+            }
+        tmp_path = self.cache_path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            print(f"Error saving feed index: {e}")
+
+    def has_feeds(self, source):
+        return bool(self.feeds.get(source))
+
+    def refresh_feed(self, source, feed_url, force=False, cancel=None):
+        """Conditionally fetch one feed and merge its items; returns items added"""
+        check(cancel)
+        self.load()
+        last = self.fetched_at.get(feed_url)
+        if not force and last is not None and time.monotonic() - last < MIN_REFRESH:
+            return 0
+        self.fetched_at[feed_url] = time.monotonic()
+
+        headers = dict(FEED_HEADERS)
+        etag, last_modified = self.validators.get(feed_url, (None, None))
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        try:
+            with self.fetcher.stream(feed_url, source=source, stage="feed", headers=headers,
+                                     cancel=cancel) as (response, body):
+                if response.status_code == 304:
+                    return 0
+                response.raise_for_status()
+                parsed = []
+                try:
+                    for title, link, date_text in iter_feed_items(body):
+                        if title and link:
+                            parsed.append((title, link, date_text))
+                except ET.ParseError:
+                    # A feed cut off at the size cap still yields the items read so far
+                    if not body.truncated:
+                        raise
+                self.validators[feed_url] = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        except Cancelled:
+            # Not fetched after all; the next search may poll it right away
+            if last is None:
+                self.fetched_at.pop(feed_url, None)
+            else:
+                self.fetched_at[feed_url] = last
+            raise
+
+        added = 0
+        with self.lock:
+            items = self.items.setdefault(source, {})
+            for title, link, date_text in parsed:
+                key = canonical_url(link)
+                if key not in items:
+                    added += 1
+                items[key] = {'title': title, 'url': link, 'date': date_text,
+                              'date_obj': parse_feed_date(date_text)}
+            if len(items) > MAX_ITEMS_PER_SOURCE:
+                newest = sorted(items.items(), key=lambda kv: kv[1]['date_obj'] or datetime.min, reverse=True)
+                self.items[source] = dict(newest[:MAX_ITEMS_PER_SOURCE])
+        return added
+
+    def refresh(self, source, force=False, cancel=None):
+        """Refresh every feed of a source, ignoring individual feed errors; raises Cancelled once cancel is set"""
+        added = 0
+        for feed_url in self.feeds.get(source, []):
+            try:
+                added += self.refresh_feed(source, feed_url, force, cancel)
+            except Cancelled:
+                raise
+            except Exception as e:
+                print(f"Error fetching feed {feed_url}: {e}")
+        return added
+
+    def search(self, source, query, limit=5):
+        """Feed items of a source whose titles hold every word of the query, as article dicts"""
+        terms = set(WORD.findall(query.lower()))
+        if not terms:
+            return []
+        self.load()
+        with self.lock:
+            items = list(self.items.get(source, {}).values())
+
+        matches = []
+        for item in items:
+            # Whole words only: "a" must not match every title, and a short index stands in for the search page
+            if terms <= set(WORD.findall(item['title'].lower())):
+                matches.append(ArticleRecord(source, item['title'], item['url'], item['date'], item['date_obj'],
+                                             self.core.calculate_relevance(item['title'], query), via='feed'))
+        matches.sort(key=self.core.sort_key, reverse=True)
+        return matches[:limit]
+
+
+def search_with_feeds(core, feed_index, source, base_url, query, min_results=None, cancel=None):
+    """Match the source's feed index first; scrape the search page only if it falls short"""
+    min_results = min_results or core.depth_for(source)
+    check(cancel)
+    if feed_index is not None and feed_index.has_feeds(source):
+        feed_index.refresh(source, cancel=cancel)
+        articles = feed_index.search(source, query, limit=min_results)
+        if len(articles) >= min_results:
+            return articles
+        # Top up from the HTML search page, keeping the feed's exact dates
+        seen = {canonical_url(a['url']) for a in articles}
+        for article in core.search_source(source, base_url, query, limit=min_results, cancel=cancel):
+            if canonical_url(article['url']) not in seen:
+                articles.append(article)
+        return articles[:min_results]
+    return core.search_source(source, base_url, query, cancel=cancel)
@@ -0,0 +1,324 @@
+"""HTTP fetch layer with compression negotiation and bytes-on-wire accounting.
+
+Every request goes through one pooled requests.Session that explicitly
+negotiates gzip and deflate, plus brotli and zstd when the brotli /
+zstandard packages are installed. Bodies are read as a stream and
+decompressed chunk by chunk; for each request the compressed (wire) and
+decompressed byte counts are recorded in metrics per source and stage
+(search, article, feed, sitemap), so expensive sources stand out.
+
+With http2=True (or NEWS_SCRAPER_HTTP2=1) requests go through an httpx
+client instead, which multiplexes concurrent requests to one host over a
+single HTTP/2 connection. Hosts that don't offer HTTP/2 are spoken to
+over HTTP/1.1 by the same client, and if httpx / h2 aren't installed or a
+host's HTTP/2 connection fails, the fetcher falls back to the pooled
+requests session.
+
+Every fetch takes an optional cancel event (see cancellation): it is
+checked before a request starts and between body chunks, and a cancelled
+transfer closes its connection instead of reading the rest.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING as URLLIB3_ENCODINGS
+
+from metrics import METRICS
+from cancellation import check
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+except ImportError:
+    httpx = None
+
+HTTP2_ENV = "NEWS_SCRAPER_HTTP2"
+
+# What urllib3 can decode here, e.g. "gzip,deflate,br,zstd"
+ACCEPT_ENCODING = ", ".join(URLLIB3_ENCODINGS.split(","))
+
+CHUNK_SIZE = 64 * 1024
+
+# Hard cap on decoded body size per stage; bodies are cut off (not rejected) past it
+MAX_BODY_BYTES = {
+    'search': 4 * 1024 * 1024,
+    'article': 8 * 1024 * 1024,
+    'feed': 8 * 1024 * 1024,
+    'sitemap': 64 * 1024 * 1024
+}
+DEFAULT_MAX_BODY = 16 * 1024 * 1024
+# Keep-alive connections per host for the HTTP/1.1 path; batch fetches use up to this many workers
+POOL_SIZE = 16
+
+
+def record_transfer(source, stage, response, wire_bytes, body_bytes, protocol):
+    # Callers that don't know the source (e.g. a pasted article URL) are grouped by host
+    labels = {'source': source or urlsplit(str(response.url)).netloc, 'stage': stage}
+    METRICS.inc('requests', **labels)
+    METRICS.inc('wire_bytes', wire_bytes, **labels)
+    METRICS.inc('body_bytes', body_bytes, **labels)
+    encoding = response.headers.get('Content-Encoding', 'identity') or 'identity'
+    METRICS.inc('responses_by_encoding', encoding=encoding.lower(), stage=stage)
+    METRICS.inc('responses_by_protocol', protocol=protocol, stage=stage)
+
+
+def read_limited(chunks, limit, cancel=None):
+    """Join decoded chunks up to limit bytes; returns (body, truncated)"""
+    parts = []
+    size = 0
+    for chunk in chunks:
+        check(cancel)
+        if size + len(chunk) > limit:
+            parts.append(chunk[:limit - size])
+            return b"".join(parts), True
+        parts.append(chunk)
+        size += len(chunk)
+    return b"".join(parts), False
+
+
+def note_truncated(source, stage, response, limit):
+    response.truncated = True
+    METRICS.inc('truncated_responses', source=source or urlsplit(str(response.url)).netloc, stage=stage)
+    print(f"Response from {response.url} cut off at {limit // 1024} KiB")
+
+
+def http1_version(response):
+    return "HTTP/1.0" if getattr(response.raw, 'version', 11) == 10 else "HTTP/1.1"
+
+
+class CountingStream:
+    """File-like view of a response body that counts decoded bytes and ends at limit"""
+
+    def __init__(self, raw, limit=None, cancel=None):
+        self.raw = raw
+        self.raw.decode_content = True
+        self.body_bytes = 0
+        self.limit = limit
+        self.truncated = False
+        self.cancel = cancel
+
+    def read(self, size=-1):
+        check(self.cancel)
+        if self.limit is not None:
+            remaining = self.limit - self.body_bytes
+            if remaining <= 0:
+                self.truncated = True
+                return b""
+            size = remaining if size is None or size < 0 else min(size, remaining)
+        data = self.raw.read(None if size is None or size < 0 else size)
+        self.body_bytes += len(data)
+        return data
+
+
+class IteratorStream:
+    """File-like view over an iterator of decoded chunks (httpx bodies)"""
+
+    def __init__(self, chunks, limit=None, cancel=None):
+        self.chunks = chunks
+        self.buffer = b""
+        self.body_bytes = 0
+        self.limit = limit
+        self.truncated = False
+        self.cancel = cancel
+
+    def read(self, size=-1):
+        check(self.cancel)
+        if self.limit is not None:
+            remaining = self.limit - self.body_bytes
+            if remaining <= 0:
+                self.truncated = True
+                return b""
+            size = remaining if size is None or size < 0 else min(size, remaining)
+        while size is None or size < 0 or len(self.buffer) < size:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                break
+            self.buffer += chunk
+        if size is None or size < 0:
+            data, self.buffer = self.buffer, b""
+        else:
+            data, self.buffer = self.buffer[:size], self.buffer[size:]
+        self.body_bytes += len(data)
+        return data
+
+
+class Fetcher:
+    def __init__(self, session=None, http2=None):
+        self.session = session or requests.Session()
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        if session is None:
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+
+        if http2 is None:
+            http2 = os.environ.get(HTTP2_ENV, "") not in ("", "0")
+        self.max_body = dict(MAX_BODY_BYTES)  # stage or (source, stage) -> bytes
+        self.client = None
+        self.http1_hosts = set()  # hosts whose HTTP/2 connection failed; served by the session
+        self.lock = threading.Lock()
+        if http2:
+            if httpx is None:
+                print("HTTP/2 needs httpx with h2 (pip install 'httpx[http2]'); using HTTP/1.1")
+            else:
+                self.client = httpx.Client(http2=True, follow_redirects=True,
+                                           headers={'Accept-Encoding': ACCEPT_ENCODING},
+                                           limits=httpx.Limits(max_connections=POOL_SIZE * 4))
+
+    @property
+    def http2(self):
+        return self.client is not None
+
+    def use_http2(self, url):
+        if self.client is None:
+            return False
+        with self.lock:
+            return urlsplit(url).netloc not in self.http1_hosts
+
+    def fall_back(self, url, error):
+        host = urlsplit(url).netloc
+        with self.lock:
+            self.http1_hosts.add(host)
+        METRICS.inc('http2_fallbacks', host=host)
+        print(f"HTTP/2 failed for {host}, using HTTP/1.1: {error}")
+
+    def set_max_body(self, stage, max_bytes, source=None):
+        """Cap decoded body size for a stage, optionally only for one source"""
+        self.max_body[(source, stage) if source else stage] = max_bytes
+
+    def max_body_for(self, source, stage):
+        return self.max_body.get((source, stage)) or self.max_body.get(stage) or DEFAULT_MAX_BODY
+
+    def get(self, url, source=None, stage="search", headers=None, timeout=15, cancel=None):
+        """GET a URL, decompressing as a stream; returns a fully read response.
+
+        Bodies past the stage's size cap are cut off and response.truncated is set.
+        Raises Cancelled once cancel is set.
+        """
+        check(cancel)
+        limit = self.max_body_for(source, stage)
+        if self.use_http2(url):
+            try:
+                return self._get_http2(url, source, stage, headers, timeout, limit, cancel)
+            except (httpx.RemoteProtocolError, httpx.LocalProtocolError) as e:
+                self.fall_back(url, e)
+
+        response = self.session.get(url, headers=headers, timeout=timeout, stream=True)
+        try:
+            body, truncated = read_limited(response.raw.stream(CHUNK_SIZE, decode_content=True), limit, cancel)
+            # Hand back an ordinary response so .text / .content keep working
+            response._content = body
+            response._content_consumed = True
+            response.truncated = False
+            if truncated:
+                note_truncated(source, stage, response, limit)
+            record_transfer(source, stage, response, response.raw.tell(), len(body), http1_version(response))
+        finally:
+            response.close()
+        return response
+
+    def _get_http2(self, url, source, stage, headers, timeout, limit, cancel):
+        with self.client.stream("GET", url, headers=headers, timeout=timeout) as response:
+            body, truncated = read_limited(response.iter_bytes(CHUNK_SIZE), limit, cancel)
+            response._content = body
+            response.truncated = False
+            if truncated:
+                note_truncated(source, stage, response, limit)
+            record_transfer(source, stage, response, response.num_bytes_downloaded,
+                            len(body), response.http_version)
+        return response
+
+    def get_many(self, urls, sources=None, stage="article", headers=None, timeout=15, workers=8, cancel=None):
+        """GET several URLs concurrently; returns [(url, response or exception)] in input order.
+
+        sources optionally maps url -> source label. Over HTTP/2 the
+        concurrent requests to one host share a connection. Once cancel is
+        set, transfers stop and URLs not started yet come back as Cancelled.
+        """
+        sources = sources or {}
+
+        def fetch(url):
+            try:
+                return url, self.get(url, sources.get(url), stage, headers, timeout, cancel)
+            except Exception as e:
+                return url, e
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, POOL_SIZE))) as pool:
+            return list(pool.map(fetch, urls))
+
+    @contextmanager
+    def stream(self, url, source=None, stage="feed", headers=None, timeout=15, cancel=None):
+        """Open a URL for incremental parsing; yields (response, file-like body).
+
+        The body reads as ended at the stage's size cap (body.truncated is
+        then set), and leaving the block early stops reading the socket.
+        Reads raise Cancelled once cancel is set.
+        """
+        check(cancel)
+        limit = self.max_body_for(source, stage)
+        if self.use_http2(url):
+            yielded = False
+            try:
+                with self.client.stream("GET", url, headers=headers, timeout=timeout) as response:
+                    body = IteratorStream(response.iter_bytes(CHUNK_SIZE), limit, cancel)
+                    yielded = True
+                    try:
+                        yield response, body
+                    finally:
+                        if body.truncated:
+                            note_truncated(source, stage, response, limit)
+                        record_transfer(source, stage, response, response.num_bytes_downloaded,
+                                        body.body_bytes, response.http_version)
+                return
+            except (httpx.RemoteProtocolError, httpx.LocalProtocolError) as e:
+                if yielded:
+                    raise
+                self.fall_back(url, e)
+
+        response = self.session.get(url, headers=headers, timeout=timeout, stream=True)
+        body = CountingStream(response.raw, limit, cancel)
+        try:
+            yield response, body
+        finally:
+            if body.truncated:
+                note_truncated(source, stage, response, limit)
+            record_transfer(source, stage, response, response.raw.tell(), body.body_bytes, http1_version(response))
+            response.close()
+
+    def warm_up(self, urls, connections=None):
+        """Resolve the hosts of urls and pre-open pooled connections in the background; returns the WarmUp
+
+        Only the HTTP/1.1 session pools are warmed.
+        """
+        from warmup import WarmUp, WARM_CONNECTIONS
+        return WarmUp(self, urls, connections or WARM_CONNECTIONS).start()
+
+    def close(self):
+        self.session.close()
+        if self.client is not None:
+            self.client.close()
+
+
+def bandwidth_report(metrics=METRICS):
+    """Text table of wire vs decoded bytes per source"""
+    wire = metrics.by_label('wire_bytes', 'source')
+    body = metrics.by_label('body_bytes', 'source')
+    requests_made = metrics.by_label('requests', 'source')
+    if not wire:
+        return "No network traffic yet\n"
+
+    lines = ["Bandwidth by Source (wire / decoded):"]
+    for source in sorted(wire, key=lambda s: -wire[s]):
+        ratio = body[source] / wire[source] if wire[source] else 0
+        lines.append(f"  {source}: {wire[source] / 1024:.0f} KiB / {body[source] / 1024:.0f} KiB "
+                     f"({ratio:.1f}x, {requests_made.get(source, 0)} requests)")
+    stages_wire = metrics.by_label('wire_bytes', 'stage')
+    lines.append("Bandwidth by Stage (wire):")
+    for stage, value in sorted(stages_wire.items(), key=lambda kv: -kv[1]):
+        lines.append(f"  {stage}: {value / 1024:.0f} KiB")
+    return "\n".join(lines) + "\n"
@@ -1,49 +1,71 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
-import requests
-from bs4 import BeautifulSoup
+from tkinter import ttk, scrolledtext, messagebox, filedialog
 import threading
 import time
-from datetime import datetime, timedelta
-import re
+from datetime import datetime
 import webbrowser
 import textwrap
 import random
-import json
 import os
+import argparse
 
-class NewsScraperApp:
+# Only light modules at import time: requests, bs4 and the stores load after the window paints
+from scraper_core import ScraperCore, SOURCE_BASE_ENV, RESULT_DEPTH_ENV
+from profiling import profiled, PROFILE_ENV
+from search_history import SearchHistory
+from exporter import ExportJob
+from analytics import SearchAnalytics
+from feeds import FeedIndex, local_feeds, search_with_feeds
+from result_cache import ResultCache, CACHE_TTL_ENV, FRESH, STALE, describe_age
+from ranking import Ranking
+from cancellation import LatestOnly, Cancelled, check
+
+class NewsScraperApp(ScraperCore):
     def __init__(self, root):
+        ScraperCore.__init__(self)
         self.root = root
         self.root.title("News Scraper")
         self.root.geometry("900x600")
         self.root.configure(bg="#f0f0f0")
         
-        # Define credible news sources
-        self.sources = {
-            "AP News": "https://apnews.com/search?q=",
-            "Reuters": "https://www.reuters.com/search/news?blob=",
-            "BBC": "https://www.bbc.co.uk/search?q=",
-            "NPR": "https://www.npr.org/search?query=",
-            "The Guardian": "https://www.theguardian.com/search?q=",
-            "Al Jazeera": "https://www.aljazeera.com/search/",
-            "CNN": "https://www.cnn.com/search?q=",
-            "The New York Times": "https://www.nytimes.com/search?query="
-        }
-        
         # Dictionary to track enabled sources
         self.source_enabled = {source: tk.IntVar(value=1) for source in self.sources}
         
-        # Store results
+        # Store results: the top articles of self.ranking in the order picked in the sort menu
         self.results = []
+        self.ranking = Ranking()
+        self.shown_ranking = None
+        self.sort_order = "Relevance"
         self.search_history = []
+        self.analytics = SearchAnalytics()
+        
+        # Persistent store of every article we have extracted; opened by load_in_background
+        self.article_store = None
+        
+        # RSS/Atom items are matched before falling back to search pages
+        local_base = os.environ.get(SOURCE_BASE_ENV)
+        self.feed_index = FeedIndex(self, feeds=local_feeds(local_base) if local_base else None)
+        self.history = SearchHistory("search_history.jsonl", "search_snapshots")
         
-        # Load search history if exists
-        self.history_file = "search_history.json"
-        self.load_search_history()
+        # Whole result lists per normalized query and source selection
+        self.result_cache = ResultCache()
+        
+        # Starting a search or opening an article cancels the one still running
+        self.searches = LatestOnly("search")
+        self.article_fetches = LatestOnly("article")
+        
+        # Set once the stores are open and the networking/parsing modules are imported
+        self.ready = threading.Event()
+        # DNS and connection warm-up of the source hosts, started by load_in_background
+        self.warmup = None
         
         # Create GUI
         self.create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Everything slow happens after the first paint, off the Tk thread
+        self.status_var.set("Loading...")
+        self.root.after_idle(lambda: self.root.after(0, self.load_in_background))
     
     def create_widgets(self):
         # Search frame
@@ -132,10 +154,18 @@ class NewsScraperApp:
         sort_menu.config(bg="#e0e0e0")
         sort_menu.pack(side=tk.LEFT, padx=(0, 10))
         
+        # Whether the list shown came from the result cache or a fresh scrape
+        self.cache_var = tk.StringVar()
+        cache_label = tk.Label(articles_toolbar, textvariable=self.cache_var, bg="#e0e0e0", fg="#8a6d00")
+        cache_label.pack(side=tk.LEFT, padx=(0, 10))
+        
         # Export button
         export_button = tk.Button(articles_toolbar, text="Export Results", command=self.export_results, bg="#e0e0e0")
         export_button.pack(side=tk.RIGHT, padx=(0, 5))
         
+        export_store_button = tk.Button(articles_toolbar, text="Export All Stored", command=self.export_store, bg="#e0e0e0")
+        export_store_button.pack(side=tk.RIGHT, padx=(0, 5))
+        
         # Create treeview for results
         columns = ("source", "title", "date", "relevance")
         self.tree = ttk.Treeview(self.results_frame, columns=columns, show="headings")
@@ -208,13 +238,10 @@ class NewsScraperApp:
             self.status_var.set("Please enter a search query")
             return
         
-        # Add to search history if not already there
+        # Add to the history dropdown if not already there
         if query not in self.search_history:
             self.search_history.append(query)
-            if len(self.search_history) > 10:
-                self.search_history.pop(0)  # Keep history to 10 items
             self.search_entry['values'] = self.search_history
-            self.save_search_history()
         
         # Get selected sources
         selected_sources = {source: base_url for source, base_url in self.sources.items() 
@@ -228,554 +255,151 @@ class NewsScraperApp:
         for item in self.tree.get_children():
             self.tree.delete(item)
         self.results = []
+        self.ranking = Ranking()
         self.article_text.delete(1.0, tk.END)
         self.current_url = None
         self.analytics_text.delete(1.0, tk.END)
+        self.analytics = SearchAnalytics()
+        self.cache_var.set("")
         
         # Update status
         self.status_var.set(f"Searching for: {query}")
-        self.search_button.config(state=tk.DISABLED)
         
         # Start progress bar
         self.progress.start()
         
-        # Create and start the search thread
-        search_thread = threading.Thread(target=self.search_news, args=(query, selected_sources))
+        # Create and start the search thread; a search still running is cancelled and its results dropped
+        cancel = self.searches.start()
+        search_thread = threading.Thread(target=self.search_news, args=(query, selected_sources, cancel))
         search_thread.daemon = True
         search_thread.start()
     
-    def search_news(self, query, selected_sources):
-        """Search for news across selected sources"""
+    @profiled("search")
+    def search_news(self, query, selected_sources, cancel=None):
+        """Search for news across selected sources
+        
+        Once cancel is set the search stops at its next request, chunk or
+        parse, and nothing it found reaches the window, cache or history.
+        """
+        cancel = cancel or threading.Event()
+        # Aggregates of this search only; shown through post(), so a cancelled search never reaches the tab
+        analytics = SearchAnalytics()
         try:
-            # Search each selected source
+            # A search started during startup waits for the stores
+            self.ready.wait()
+            check(cancel)
+            
+            # A recent enough result list is served without scraping; an older one is shown while refreshing
+            cached, state, age = self.result_cache.lookup(query, selected_sources)
+            if state == FRESH:
+                analytics.add(cached)
+                self.post(cancel, lambda: self.show_ranked(cached))
+                self.post(cancel, lambda: self.show_analytics(analytics))
+                self.post(cancel, lambda: self.cache_var.set(f"Cached ({describe_age(age)})"))
+                return
+            
+            # Otherwise show the stale list, last time's results for this query or stored matches straight away
+            stored = self.article_store.search(query, sources=list(selected_sources)) if self.article_store else []
+            for article in stored:
+                article['relevance'] = self.calculate_relevance(article['title'], query)
+            if state == STALE:
+                self.post(cancel, lambda: self.show_ranked(cached))
+                self.post(cancel, lambda: self.cache_var.set(f"Cached ({describe_age(age)}), refreshing..."))
+            else:
+                cached = self.history.snapshot(query)
+                if cached:
+                    self.post(cancel, lambda: self.show_ranked(cached))
+                    self.post(cancel, lambda: self.cache_var.set("Cached (last search), refreshing..."))
+                    self.post(cancel, lambda: self.status_var.set(f"Showing {len(cached)} cached results, refreshing..."))
+                elif stored:
+                    self.post(cancel, lambda: self.show_ranked(stored))
+            
+            # Search each selected source, ranking articles as they arrive
+            ranking = Ranking()
             for source, base_url in selected_sources.items():
-                self.status_var.set(f"Searching {source}...")
+                check(cancel)
+                self.post(cancel, lambda status=f"Searching {source}...": self.status_var.set(status))
                 try:
-                    # Construct search URL
-                    search_url = base_url + query.replace(" ", "+")
-                    
-                    # Send request
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36",
-                        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                        "Accept-Language": "en-US,en;q=0.5",
-                        "Connection": "keep-alive",
-                        "Upgrade-Insecure-Requests": "1",
-                        "Cache-Control": "max-age=0"
-                    }
-                    response = requests.get(search_url, headers=headers, timeout=15)
+                    # Fetch, parse and extract articles for this source
+                    articles = search_with_feeds(self, self.feed_index, source, base_url, query, cancel=cancel)
                     
-                    if response.status_code == 200:
-                        # Parse the response
-                        soup = BeautifulSoup(response.text, 'html.parser')
-                        
-                        # Extract articles based on source-specific selectors
-                        articles = self.extract_articles(soup, source, search_url, query)
-                        
-                        # Add to results
-                        self.results.extend(articles)
+                    # Add to the ranking, running analytics and the store queue
+                    # Only articles the ranking kept, so cross-source duplicates aren't counted twice
+                    analytics.add(ranking.add(articles))
+                    if self.article_store:
+                        self.article_store.add_articles(articles)
+                    self.post(cancel, lambda: self.show_analytics(analytics))
                     
+                except Cancelled:
+                    raise
                 except Exception as e:
                     print(f"Error searching {source}: {e}")
             
-            # Sort results by relevance and date
-            self.results.sort(key=lambda x: (x['relevance'], x['date_obj'] if x['date_obj'] else datetime.min), reverse=True)
+            # Stored matches the live results didn't include rank alongside them
+            analytics.add(ranking.add(stored))
+            check(cancel)
+            results = ranking.view("Relevance")
+            self.result_cache.store(query, selected_sources, results)
+            self.save_search_history(query, results)
             
             # Update the UI with results
-            self.root.after(0, self.update_results)
+            self.post(cancel, lambda: self.show_ranking(ranking))
+            if cached:
+                self.post(cancel, lambda: self.cache_var.set("Refreshed"))
             
             # Generate analytics
-            self.root.after(0, self.generate_analytics)
+            self.post(cancel, lambda: self.show_analytics(analytics))
             
+        except Cancelled:
+            pass
         except Exception as e:
-            self.root.after(0, lambda: self.status_var.set(f"Error during search: {e}"))
+            message = f"Error during search: {e}"
+            self.post(cancel, lambda: self.status_var.set(message))
         finally:
-            self.root.after(0, self.search_complete)
+            self.searches.finish(cancel)
+            self.post(cancel, self.search_complete)
     
-    def extract_articles(self, soup, source, search_url, query):
-        """Extract article information from search results"""
-        articles = []
-        
-        # Source-specific extraction logic for modern webpage structures (2025)
-        if source == "AP News":
-            # AP News - Updated selectors for 2025
-            try:
-                # Try multiple possible selectors
-                article_elements = soup.select(".CardList-items > div") or soup.select(".PagePromo") or soup.select("[data-key='card']")
-                
-                for article in article_elements[:5]:
-                    try:
-                        # Multiple potential selectors for title elements
-                        title_elem = (article.select_one(".CardHeadline h3") or 
-                                    article.select_one(".PagePromo-title") or 
-                                    article.select_one("h3.Component-headline") or
-                                    article.select_one("h2") or
-                                    article.select_one("h3"))
-                        
-                        # Multiple potential selectors for links
-                        link_elem = article.select_one("a")
-                        
-                        # Multiple potential selectors for dates
-                        date_elem = (article.select_one("time") or 
-                                    article.select_one(".PagePromo-timestamp") or
-                                    article.select_one(".CardTime-time") or
-                                    article.select_one("[data-key='timestamp']"))
-                        
-                        if title_elem and link_elem:
-                            title = title_elem.text.strip()
-                            link = link_elem['href']
-                            if not link.startswith('http'):
-                                link = "https://apnews.com" + link
-                            
-                            date_text = date_elem.text.strip() if date_elem else "Recent"
-                            date_obj = self.parse_date(date_text)
-                            
-                            articles.append({
-                                'source': source,
-                                'title': title,
-                                'url': link,
-                                'date': date_text,
-                                'date_obj': date_obj,
-                                'relevance': self.calculate_relevance(title, query)
-                            })
-                    except Exception as e:
-                        print(f"Error extracting AP News article: {e}")
-            except Exception as e:
-                print(f"Error in AP News extraction: {e}")
-        
-        elif source == "Reuters":
-            # Reuters - Updated selectors for 2025
-            try:
-                article_elements = (soup.select("li.search-result") or 
-                                  soup.select(".search-result__list-item") or
-                                  soup.select("[data-testid='search-result']") or
-                                  soup.select(".media-story-card"))
-                
-                for article in article_elements[:5]:
-                    try:
-                        title_elem = (article.select_one("h3.search-result-title") or
-                                    article.select_one("[data-testid='heading']") or
-                                    article.select_one("h3") or
-                                    article.select_one(".media-story-card__heading"))
-                        
-                        date_elem = article.select_one("time") or article.select_one(".media-story-card__datetime")
-                        link_elem = article.select_one("a")
-                        
-                        if title_elem and link_elem:
-                            title = title_elem.text.strip()
-                            link = link_elem['href']
-                            if not link.startswith('http'):
-                                link = "https://www.reuters.com" + link
-                            
-                            date_text = date_elem.text.strip() if date_elem else "Recent"
-                            date_obj = self.parse_date(date_text)
-                            
-                            articles.append({
-                                'source': source,
-                                'title': title,
-                                'url': link,
-                                'date': date_text,
-                                'date_obj': date_obj,
-                                'relevance': self.calculate_relevance(title, query)
-                            })
-                    except Exception as e:
-                        print(f"Error extracting Reuters article: {e}")
-            except Exception as e:
-                print(f"Error in Reuters extraction: {e}")
-        
-        elif source == "BBC":
-            # BBC - Updated selectors for 2025
-            try:
-                article_elements = (soup.select(".ssrcss-1020bd1-Stack") or
-                                  soup.select(".ssrcss-1krxqkx-Stack") or
-                                  soup.select("[data-testid='search-result']") or
-                                  soup.select(".gs-c-promo"))
-                
-                for article in article_elements[:5]:
-                    try:
-                        # Try different possible title selectors
-                        title_elem = (article.select_one("h3") or 
-                                    article.select_one(".gs-c-promo-heading__title") or
-                                    article.select_one("[data-testid='title']"))
-                        
-                        link_elem = article.select_one("a")
-                        
-                        if title_elem and link_elem:
-                            title = title_elem.text.strip()
-                            link = link_elem['href']
-                            if not link.startswith('http'):
-                                if link.startswith('/'):
-                                    link = "https://www.bbc.co.uk" + link
-                                else:
-                                    link = "https://www.bbc.co.uk/" + link
-                            
-                            # BBC doesn't always have clear date elements in search results
-                            date_elem = article.select_one("time") or article.select_one("[data-testid='timestamp']")
-                            date_text = date_elem.text.strip() if date_elem else "Recent"
-                            date_obj = self.parse_date(date_text) if date_elem else (datetime.now() - timedelta(days=1))
-                            
-                            articles.append({
-                                'source': source,
-                                'title': title,
-                                'url': link,
-                                'date': date_text,
-                                'date_obj': date_obj,
-                                'relevance': self.calculate_relevance(title, query)
-                            })
-                    except Exception as e:
-                        print(f"Error extracting BBC article: {e}")
-            except Exception as e:
-                print(f"Error in BBC extraction: {e}")
-        
-        elif source == "NPR":
-            try:
-                article_elements = (soup.select(".item-info") or 
-                                  soup.select(".result-item") or 
-                                  soup.select(".stories-list article"))
-                
-                for article in article_elements[:5]:
-                    try:
-                        title_elem = (article.select_one("h2") or 
-                                     article.select_one("h3") or 
-                                     article.select_one(".title"))
-                        
-                        link_elem = article.select_one("a")
-                        
-                        if title_elem and link_elem:
-                            title = title_elem.text.strip()
-                            link = link_elem['href']
-                            if not link.startswith('http'):
-                                link = "https://www.npr.org" + link
-                            
-                            date_elem = article.select_one("time") or article.select_one(".date")
-                            date_text = date_elem.text.strip() if date_elem else "Recent"
-                            date_obj = self.parse_date(date_text)
-                            
-                            articles.append({
-                                'source': source,
-                                'title': title,
-                                'url': link,
-                                'date': date_text,
-                                'date_obj': date_obj,
-                                'relevance': self.calculate_relevance(title, query)
-                            })
-                    except Exception as e:
-                        print(f"Error extracting NPR article: {e}")
-            except Exception as e:
-                print(f"Error in NPR extraction: {e}")
-                
-        elif source == "The Guardian":
-            try:
-                article_elements = (soup.select(".fc-item") or 
-                                  soup.select(".search-results__item") or 
-                                  soup.select(".u-faux-block-link"))
-                
-                for article in article_elements[:5]:
-                    try:
-                        title_elem = (article.select_one("h2") or 
-                                     article.select_one("h3") or 
-                                     article.select_one(".fc-item__title"))
-                        
-                        link_elem = article.select_one("a")
-                        
-                        if title_elem and link_elem:
-                            title = title_elem.text.strip()
-                            link = link_elem['href']
-                            
-                            date_elem = article.select_one("time") or article.select_one(".fc-item__timestamp")
-                            date_text = date_elem.text.strip() if date_elem else "Recent"
-                            date_obj = self.parse_date(date_text)
-                            
-                            articles.append({
-                                'source': source,
-                                'title': title,
-                                'url': link,
-                                'date': date_text,
-                                'date_obj': date_obj,
-                                'relevance': self.calculate_relevance(title, query)
-                            })
-                    except Exception as e:
-                        print(f"Error extracting Guardian article: {e}")
-            except Exception as e:
-                print(f"Error in Guardian extraction: {e}")
-        
-        elif source == "Al Jazeera":
-            try:
-                article_elements = soup.select(".gc__content") or soup.select(".article-card")
-                
-                for article in article_elements[:5]:
-                    try:
-                        title_elem = article.select_one("h3") or article.select_one(".gc__title")
-                        link_elem = article.select_one("a")
-                        
-                        if title_elem and link_elem:
-                            title = title_elem.text.strip()
-                            link = link_elem['href']
-                            if not link.startswith('http'):
-                                link = "https://www.aljazeera.com" + link
-                            
-                            date_elem = article.select_one("time") or article.select_one(".date-simple")
-                            date_text = date_elem.text.strip() if date_elem else "Recent"
-                            date_obj = self.parse_date(date_text)
-                            
-                            articles.append({
-                                'source': source,
-                                'title': title,
-                                'url': link,
-                                'date': date_text,
-                                'date_obj': date_obj,
-                                'relevance': self.calculate_relevance(title, query)
-                            })
-                    except Exception as e:
-                        print(f"Error extracting Al Jazeera article: {e}")
-            except Exception as e:
-                print(f"Error in Al Jazeera extraction: {e}")
-        
-        elif source == "CNN":
-            try:
-                article_elements = soup.select(".cnn-search__result") or soup.select(".cnn-search__result-contents")
-                
-                for article in article_elements[:5]:
-                    try:
-                        title_elem = article.select_one("h3") or article.select_one(".cnn-search__result-headline")
-                        link_elem = article.select_one("a")
-                        
-                        if title_elem and link_elem:
-                            title = title_elem.text.strip()
-                            link = link_elem['href']
-                            if not link.startswith('http'):
-                                link = "https://www.cnn.com" + link
-                            
-                            date_elem = article.select_one("time") or article.select_one(".cnn-search__result-publish-date")
-                            date_text = date_elem.text.strip() if date_elem else "Recent"
-                            date_obj = self.parse_date(date_text)
-                            
-                            articles.append({
-                                'source': source,
-                                'title': title,
-                                'url': link,
-                                'date': date_text,
-                                'date_obj': date_obj,
-                                'relevance': self.calculate_relevance(title, query)
-                            })
-                    except Exception as e:
-                        print(f"Error extracting CNN article: {e}")
-            except Exception as e:
-                print(f"Error in CNN extraction: {e}")
-        
-        elif source == "The New York Times":
-            try:
-                article_elements = soup.select(".css-1i8vfl5") or soup.select(".css-1l4w6pd") or soup.select("[data-testid='search-bodega-result']")
-                
-                for article in article_elements[:5]:
-                    try:
-                        title_elem = article.select_one("h4") or article.select_one("[data-testid='headline']")
-                        link_elem = article.select_one("a")
-                        
-                        if title_elem and link_elem:
-                            title = title_elem.text.strip()
-                            link = link_elem['href']
-                            if not link.startswith('http'):
-                                link = "https://www.nytimes.com" + link
-                            
-                            date_elem = article.select_one("time") or article.select_one("[data-testid='publication-date']")
-                            date_text = date_elem.text.strip() if date_elem else "Recent"
-                            date_obj = self.parse_date(date_text)
-                            
-                            articles.append({
-                                'source': source,
-                                'title': title,
-                                'url': link,
-                                'date': date_text,
-                                'date_obj': date_obj,
-                                'relevance': self.calculate_relevance(title, query)
-                            })
-                    except Exception as e:
-                        print(f"Error extracting NYT article: {e}")
-            except Exception as e:
-                print(f"Error in NYT extraction: {e}")
-                
-        # Generic extraction for other sources or fallback
-        if not articles:
-            # Look for common article patterns
-            # 1. Find all links that might be articles
-            link_elements = soup.find_all('a', href=True)
-            
-            for link in link_elements[:30]:  # Check first 30 links
-                try:
-                    url = link['href']
-                    
-                    # Skip navigation, social media, etc.
-                    if self.is_likely_article_link(url, source):
-                        # Make URL absolute if it's relative
-                        if not url.startswith('http'):
-                            if url.startswith('/'):
-                                base_domain = '/'.join(search_url.split('/')[:3])
-                                url = base_domain + url
-                            else:
-                                url = '/'.join(search_url.split('/')[:-1]) + '/' + url
-                        
-                        # Get title from link text or contained heading
-                        title = ""
-                        heading = link.find(['h1', 'h2', 'h3', 'h4'])
-                        if heading:
-                            title = heading.get_text().strip()
-                        else:
-                            title = link.get_text().strip()
-                        
-                        # Skip if title is too short or contains unwanted elements
-                        if len(title) > 10 and not any(x in title.lower() for x in ['sign in', 'log in', 'subscribe']):
-                            date_text = "Recent"
-                            date_obj = datetime.now() - timedelta(days=3)  # Assume recent
-                            
-                            # Look for date near the link
-                            date_elem = link.find_next(['time', 'span', 'div'], class_=re.compile('(date|time|published)', re.I))
-                            if date_elem:
-                                date_text = date_elem.get_text().strip()
-                                date_obj = self.parse_date(date_text)
-                            
-                            # Add if not duplicate
-                            if not any(a['url'] == url for a in articles):
-                                articles.append({
-                                    'source': source,
-                                    'title': title,
-                                'url': url,
-                                'date': date_text,
-                                'date_obj': date_obj,
-                                'relevance': self.calculate_relevance(title, query)
-                            })
-                except Exception as e:
-                    print(f"Error in generic extraction for {source}: {e}")
-        
-        return articles
-
-    def parse_date(self, date_text):
-        """Parse various date formats into a datetime object"""
-        try:
-            # Clean the date text
-            date_text = date_text.strip().replace('\n', '').replace('\t', '')
-            
-            # Handle relative dates
-            if 'ago' in date_text.lower():
-                now = datetime.now()
-                if 'hour' in date_text.lower():
-                    hours = int(re.search(r'(\d+)', date_text).group(1))
-                    return now - timedelta(hours=hours)
-                elif 'day' in date_text.lower():
-                    days = int(re.search(r'(\d+)', date_text).group(1))
-                    return now - timedelta(days=days)
-                elif 'minute' in date_text.lower():
-                    minutes = int(re.search(r'(\d+)', date_text).group(1))
-                    return now - timedelta(minutes=minutes)
-                return now  # Fallback for vague relative dates
-            
-            # Try common date formats
-            formats = [
-                '%Y-%m-%d', '%d %b %Y', '%B %d, %Y', '%m/%d/%Y', '%d/%m/%Y',
-                '%Y.%m.%d', '%b %d, %Y', '%d %B %Y', '%Y-%m-%dT%H:%M:%S%z'
-            ]
-            for fmt in formats:
-                try:
-                    return datetime.strptime(date_text, fmt)
-                except ValueError:
-                    continue
-            
-            # Fallback: assume recent if parsing fails
-            return datetime.now() - timedelta(days=1)
-        except Exception as e:
-            print(f"Error parsing date '{date_text}': {e}")
-            return datetime.now() - timedelta(days=1)
-
-    def calculate_relevance(self, title, query):
-        """Calculate relevance score based on query match in title"""
-        try:
-            title_lower = title.lower()
-            query_lower = query.lower()
-            score = 0
-            
-            # Exact matches
-            if query_lower in title_lower:
-                score += 10
-            
-            # Individual word matches
-            query_words = query_lower.split()
-            for word in query_words:
-                if word in title_lower:
-                    score += 2
-            
-            # Proximity bonus (if multiple query words are present)
-            if len(query_words) > 1 and all(word in title_lower for word in query_words):
-                score += 5
-            
-            return score
-        except Exception as e:
-            print(f"Error calculating relevance: {e}")
-            return 0
-
-    def is_likely_article_link(self, url, source):
-        """Determine if a URL is likely an article link"""
-        try:
-            # Skip common non-article patterns
-            exclude_patterns = [
-                '/login', '/signin', '/subscribe', '/account', '/profile',
-                '/video', '/gallery', '/podcast', '/newsletter', '/comment',
-                '/tag/', '/category/', '/search', '/archive', '/about',
-                '/contact', '/privacy', '/terms', '#', 'javascript:', '/home'
-            ]
-            if any(pattern in url.lower() for pattern in exclude_patterns):
-                return False
-            
-            # Include likely article patterns
-            include_patterns = [
-                '/article', '/news', '/story', '/feature', '/report',
-                '/opinion', '/analysis', '/world', '/politics', '/business',
-                '/technology', '/health', '/science', '/sport', '/culture',
-                r'/\d{4}/\d{2}/\d{2}/',  # Date-based URLs
-                r'/\d{4}-\d{2}-\d{2}-'   # Alternate date format
-            ]
-            if any(re.search(pattern, url.lower()) for pattern in include_patterns):
-                return True
-            
-            # Source-specific checks
-            if source == "BBC" and url.startswith('/news/'):
-                return True
-            if source == "Reuters" and url.startswith('/world/'):
-                return True
-            if source == "The Guardian" and '/article/' in url:
-                return True
-            
-            # Fallback: check if URL is long enough and not a top-level page
-            return len(url.split('/')) > 3 and not url.endswith('/')
-        except Exception as e:
-            print(f"Error checking article link: {e}")
-            return False
+    def post(self, cancel, func):
+        """Run func on the Tk thread, unless the job it comes from is cancelled by then"""
+        self.root.after(0, lambda: cancel.is_set() or func())
+    
+    def show_ranked(self, articles):
+        """Make articles the current results, ranked for every sort order"""
+        ranking = Ranking()
+        ranking.add(articles)
+        self.show_ranking(ranking)
+    
+    def show_ranking(self, ranking):
+        """Show a ranking in the order picked in the sort menu"""
+        self.ranking = ranking
+        self.results = ranking.view(self.sort_order)
+        self.update_results()
 
     def update_results(self):
         """Update the treeview with search results"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        for article in self.results:
-            self.tree.insert("", tk.END, values=(
-                article['source'],
-                article['title'],
-                article['date'],
-                article['relevance']
-            ))
+        # A new sort order of the ranking already shown only moves its rows; past TOP_K results
+        # the orderings keep different articles, so the rows are rebuilt when the sets differ
+        iids = [str(id(article)) for article in self.results]
+        if self.shown_ranking is self.ranking and set(iids) == set(self.tree.get_children()):
+            for index, iid in enumerate(iids):
+                self.tree.move(iid, "", index)
+        else:
+            self.shown_ranking = self.ranking
+            self.tree.delete(*self.tree.get_children())
+            for iid, article in zip(iids, self.results):
+                self.tree.insert("", tk.END, iid=iid, values=(
+                    article['source'],
+                    article['title'],
+                    article['date'],
+                    article['relevance']
+                ))
         
         self.status_var.set(f"Found {len(self.results)} articles")
 
     def sort_results(self, *args):
-        """Sort results based on selected criteria"""
-        sort_by = self.sort_var.get()
-        
-        if sort_by == "Relevance":
-            self.results.sort(key=lambda x: x['relevance'], reverse=True)
-        elif sort_by == "Date":
-            self.results.sort(key=lambda x: x['date_obj'] if x['date_obj'] else datetime.min, reverse=True)
-        elif sort_by == "Source":
-            self.results.sort(key=lambda x: x['source'])
-        
+        """Show the results in the order picked in the sort menu; each order is ranked already"""
+        self.sort_order = self.sort_var.get()
+        self.results = self.ranking.view(self.sort_order)
         self.update_results()
 
     def show_article_content(self, event):
@@ -789,8 +413,7 @@ class NewsScraperApp:
             # Find the article
             for article in self.results:
                 if article['title'] == title:
-                    self.fetch_article_content(article['url'], article['title'])
-                    self.current_url = article['url']
+                    self.load_article(article['url'], article['title'], article['source'])
                     break
 
     def show_selected_article_content(self):
@@ -803,54 +426,51 @@ class NewsScraperApp:
             
             for article in self.results:
                 if article['title'] == title:
-                    self.fetch_article_content(article['url'], article['title'])
-                    self.current_url = article['url']
+                    self.load_article(article['url'], article['title'], article['source'])
                     break
 
-    def fetch_article_content(self, url, title):
-        """Fetch and display article content"""
+    def load_article(self, url, title, source=None):
+        """Fetch an article on a background thread; opening another one first cancels it"""
+        cancel = self.article_fetches.start()
+        self.current_url = url
+        self.article_text.delete(1.0, tk.END)
+        self.article_text.insert(tk.END, f"{title}\n\nLoading...")
+        
+        # Switch to summary tab
+        self.notebook.select(self.summary_frame)
+        
+        threading.Thread(target=self.fetch_article_content, args=(url, title, source, cancel), daemon=True).start()
+
+    @profiled("article")
+    def fetch_article_content(self, url, title, source=None, cancel=None):
+        """Fetch article content and display it unless a newer article was opened meanwhile"""
+        cancel = cancel or threading.Event()
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36"
-            }
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Clear previous content
-            self.article_text.delete(1.0, tk.END)
-            
-            # Extract main content
-            content = ""
-            # Try common article content selectors
-            article_elements = (
-                soup.select("article p") or
-                soup.select(".article-body p") or
-                soup.select(".story-body p") or
-                soup.select(".content p") or
-                soup.select("main p")
-            )
-            
-            for elem in article_elements:
-                text = elem.get_text().strip()
-                if text and len(text) > 20:  # Skip short fragments
-                    content += text + "\n\n"
+            # Download and extract main content
+            content = self.fetch_article(url, source, cancel)
+            if content and self.article_store:
+                self.article_store.set_body(url, content)
             
             if not content:
                 content = "Could not extract article content. The website may use dynamic loading or have restricted access."
             
             # Format the content
             wrapped_content = textwrap.fill(content, width=80)
-            self.article_text.insert(tk.END, f"{title}\n\n{wrapped_content}")
-            
-            # Switch to summary tab
-            self.notebook.select(self.summary_frame)
+            self.post(cancel, lambda: self.show_article_text(f"{title}\n\n{wrapped_content}", url))
             
+        except Cancelled:
+            pass
         except Exception as e:
-            self.article_text.delete(1.0, tk.END)
-            self.article_text.insert(tk.END, f"Error loading article: {e}")
-            self.current_url = None
+            message = f"Error loading article: {e}"
+            self.post(cancel, lambda: self.show_article_text(message, None))
+        finally:
+            self.article_fetches.finish(cancel)
+
+    def show_article_text(self, text, url):
+        """Replace the article pane's text; url is None when the article couldn't be loaded"""
+        self.article_text.delete(1.0, tk.END)
+        self.article_text.insert(tk.END, text)
+        self.current_url = url
 
     def open_in_browser(self):
         """Open the current article in the default web browser"""
@@ -901,89 +521,153 @@ class NewsScraperApp:
             self.tree_menu.post(event.x_root, event.y_root)
 
     def export_results(self):
-        """Export search results to a text file"""
+        """Export search results to a text, CSV, JSONL or Parquet file"""
         if not self.results:
             messagebox.showinfo("Info", "No results to export")
             return
         
+        # Snapshot the list so a new search can't change it mid-export
+        self.start_export(list(self.results), "news_search_results")
+
+    def export_store(self):
+        """Export every article in the persistent store"""
+        if self.article_store is None:
+            messagebox.showinfo("Info", "The article store is still loading")
+            return
+        self.start_export(self.article_store.iter_articles(), "news_article_store")
+
+    def ask_export_path(self, prefix):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"news_search_results_{timestamp}.txt"
+        return filedialog.asksaveasfilename(
+            initialfile=f"{prefix}_{timestamp}.txt",
+            defaultextension=".txt",
+            filetypes=[("Text report", "*.txt"), ("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Parquet", "*.parquet")]
+        )
+
+    def start_export(self, articles, prefix):
+        """Write articles out on a background thread, reporting progress in the status bar"""
+        filename = self.ask_export_path(prefix)
+        if not filename:
+            return
+        
+        def on_progress(rows):
+            self.root.after(0, lambda: self.status_var.set(f"Exporting... {rows} rows written"))
+        
+        def on_done(rows, error):
+            if error:
+                self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to export results: {error}"))
+            else:
+                self.root.after(0, lambda: messagebox.showinfo("Success", f"{rows} results exported to {filename}"))
+            self.root.after(0, lambda: self.status_var.set("Ready"))
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(f"News Search Results - {self.search_var.get()}\n")
-                f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                for article in self.results:
-                    f.write(f"Source: {article['source']}\n")
-                    f.write(f"Title: {article['title']}\n")
-                    f.write(f"Date: {article['date']}\n")
-                    f.write(f"URL: {article['url']}\n")
-                    f.write(f"Relevance: {article['relevance']}\n")
-                    f.write("-" * 50 + "\n\n")
-            messagebox.showinfo("Success", f"Results exported to {filename}")
+            ExportJob(articles, filename, title=self.search_var.get(),
+                      on_progress=on_progress, on_done=on_done).start()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export results: {e}")
 
+    def show_analytics(self, analytics):
+        """Make a search's aggregates the current ones and render them"""
+        self.analytics = analytics
+        self.generate_analytics()
+
     def generate_analytics(self):
-        """Generate basic analytics about search results"""
+        """Render the running analytics for the current search"""
         self.analytics_text.delete(1.0, tk.END)
-        
-        if not self.results:
-            self.analytics_text.insert(tk.END, "No results to analyze")
-            return
-        
-        # Count articles by source
-        source_counts = {}
-        for article in self.results:
-            source = article['source']
-            source_counts[source] = source_counts.get(source, 0) + 1
-        
-        # Average relevance
-        avg_relevance = sum(article['relevance'] for article in self.results) / len(self.results)
-        
-        # Date range
-        dates = [article['date_obj'] for article in self.results if article['date_obj']]
-        date_range = f"{min(dates).strftime('%Y-%m-%d')} to {max(dates).strftime('%Y-%m-%d')}" if dates else "Unknown"
-        
-        # Generate analytics text
-        analytics = f"Search Analytics\n\n"
-        analytics += f"Total Articles: {len(self.results)}\n"
-        analytics += f"Average Relevance Score: {avg_relevance:.2f}\n"
-        analytics += f"Date Range: {date_range}\n\n"
-        analytics += "Articles by Source:\n"
-        for source, count in source_counts.items():
-            analytics += f"  {source}: {count}\n"
-        
-        self.analytics_text.insert(tk.END, analytics)
+        self.analytics_text.insert(tk.END, self.analytics.render())
+        from fetcher import bandwidth_report
+        self.analytics_text.insert(tk.END, "\n" + bandwidth_report())
+        self.analytics_text.insert(tk.END, "\n" + self.selector_stats.report())
+        if self.warmup is not None:
+            self.analytics_text.insert(tk.END, "\n" + self.warmup.report())
 
     def search_complete(self):
         """Handle search completion"""
         self.progress.stop()
-        self.search_button.config(state=tk.NORMAL)
         if not self.results:
             self.status_var.set("No results found")
         else:
             self.status_var.set(f"Search complete: {len(self.results)} articles found")
+        failing = self.selector_stats.failing_sources()
+        if failing:
+            self.status_var.set(self.status_var.get() + f" | Selectors failing for: {', '.join(failing)}")
+        held = self.source_health.summary()
+        if held:
+            self.status_var.set(self.status_var.get() + f" | {held}")
 
-    def load_search_history(self):
-        """Load search history from file"""
-        if os.path.exists(self.history_file):
+    def load_in_background(self):
+        """Open the stores, read history and caches and import the heavy modules on a background thread"""
+        def load():
             try:
-                with open(self.history_file, 'r') as f:
-                    self.search_history = json.load(f)
+                from article_store import ArticleStore  # sqlite3 loads here, not at startup
+                self.article_store = ArticleStore("articles.db")
+            except Exception as e:
+                print(f"Error opening article store: {e}")
+            queries = []
+            try:
+                queries = self.history.load()
             except Exception as e:
                 print(f"Error loading search history: {e}")
-                self.search_history = []
+            self.feed_index.load()
+            self.selector_stats.load()
+            try:
+                # Pay for importing requests and bs4 now rather than on the first search
+                self.fetcher
+                self.parse_html("")
+                # Keeps resolving and connecting after ready is set; searches don't wait for it
+                self.warmup = self.fetcher.warm_up(self.sources.values())
+            except Exception as e:
+                print(f"Error loading network modules: {e}")
+            self.ready.set()
+            self.root.after(0, lambda: self.history_loaded(queries))
+        
+        threading.Thread(target=load, daemon=True).start()
+
+    def history_loaded(self, queries):
+        """Fill the history dropdown once the log has been read"""
+        # Keep anything searched while the history was still loading
+        self.search_history = queries + [q for q in self.search_history if q not in queries]
+        self.search_entry['values'] = self.search_history
+        if self.status_var.get() == "Loading...":
+            self.status_var.set("Ready")
 
-    def save_search_history(self):
-        """Save search history to file"""
+    def save_search_history(self, query, results):
+        """Append the query and a snapshot of its results to the history log"""
         try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.search_history, f)
+            self.history.record(query, results)
         except Exception as e:
             print(f"Error saving search history: {e}")
 
+    def on_close(self):
+        """Flush pending article writes before the window goes away"""
+        self.searches.cancel()
+        self.article_fetches.cancel()
+        self.ready.wait(timeout=5)
+        if self.warmup is not None:
+            self.warmup.cancel()
+        if self.article_store is not None:
+            self.article_store.close()
+        self.feed_index.save()
+        self.selector_stats.save()
+        self.root.destroy()
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="News Scraper")
+    parser.add_argument("--profile", help="profile searches and article fetches: cpu, sample, memory (comma separated)")
+    parser.add_argument("--cache-ttl", type=float, help="seconds a query's results are served from cache without re-scraping (0 disables)")
+    parser.add_argument("--depth", help="results per source, walking further result pages as needed: 40, or 20,Reuters=60")
+    parser.add_argument("--http2", action="store_true", help="multiplex requests over HTTP/2 where hosts support it (needs httpx[http2])")
+    args = parser.parse_args()
+    if args.profile:
+        os.environ[PROFILE_ENV] = args.profile
+    if args.cache_ttl is not None:
+        os.environ[CACHE_TTL_ENV] = str(args.cache_ttl)
+    if args.depth:
+        os.environ[RESULT_DEPTH_ENV] = args.depth
+    if args.http2:
+        from fetcher import HTTP2_ENV
+        os.environ[HTTP2_ENV] = "1"
+    
     root = tk.Tk()
     app = NewsScraperApp(root)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""Process-wide counters for the fetch and extraction layers.
+
+Counters are keyed by name plus a small set of labels (source, stage, ...)
+so the GUI, the API server and the command-line tools can all report the
+same numbers.
+"""
+import threading
+
+
+class Metrics:
+    def __init__(self):
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def get(self, name, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            return self.counters.get(key, 0)
+
+    def snapshot(self):
+        """[{'name': ..., 'labels': {...}, 'value': ...}] for every counter"""
+        with self.lock:
+            items = list(self.counters.items())
+        return [{'name': name, 'labels': dict(labels), 'value': value} for (name, labels), value in items]
+
+    def by_label(self, name, label):
+        """Sum a counter grouped by one label"""
+        totals = {}
+        for row in self.snapshot():
+            if row['name'] == name:
+                key = row['labels'].get(label)
+                totals[key] = totals.get(key, 0) + row['value']
+        return totals
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+
+
+METRICS = Metrics()
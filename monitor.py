@@ -0,0 +1,302 @@
+"""Continuous monitoring of saved queries, emitting only new articles.
+
+Each (query, source) pair is polled on its own interval with random
+jitter, so hundreds of watched queries spread out instead of firing in
+bursts. Polls send If-None-Match / If-Modified-Since from the previous
+response and skip parsing when the server answers 304 or the body is
+byte-for-byte unchanged. Extracted articles are diffed against the
+canonical URLs already seen for that query; only new ones are emitted, to
+a callback, a JSONL file and/or a desktop notification.
+
+Watch list format (JSON):
+
+    [
+        {"query": "climate summit", "interval": 900},
+        {"query": "pope", "interval": 600, "sources": ["BBC", "AP News"],
+         "source_intervals": {"Reuters": 3600}}
+    ]
+
+    python monitor.py watchlist.json --jsonl new_articles.jsonl --notify
+"""
+import argparse
+import hashlib
+import heapq
+import json
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from scraper_core import ScraperCore
+from urls import canonical_url
+from search_history import normalize_query
+
+DEFAULT_INTERVAL = 900
+# Each poll is rescheduled interval * (1 +/- JITTER)
+JITTER = 0.1
+
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    query TEXT NOT NULL,
+    url TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    PRIMARY KEY (query, url)
+);
+CREATE TABLE IF NOT EXISTS baselines (
+    query TEXT NOT NULL,
+    source TEXT NOT NULL,
+    PRIMARY KEY (query, source)
+);
+CREATE TABLE IF NOT EXISTS validators (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body_hash TEXT
+);
+"""
+
+
+class MonitorState:
+    """Seen URLs per query and HTTP validators per search URL, in SQLite"""
+
+    def __init__(self, path="monitor_state.db"):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(STATE_SCHEMA)
+        self.lock = threading.Lock()
+
+    def validators(self, url):
+        with self.lock:
+            row = self.conn.execute("SELECT etag, last_modified, body_hash FROM validators WHERE url = ?",
+                                    (url,)).fetchone()
+        return row or (None, None, None)
+
+    def save_validators(self, url, etag, last_modified, body_hash):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO validators VALUES (?, ?, ?, ?)",
+                              (url, etag, last_modified, body_hash))
+
+    def filter_new(self, query, articles):
+        """Record articles as seen for the query; return the ones not seen before"""
+        key = normalize_query(query)
+        now = datetime.now().isoformat(timespec='seconds')
+        new = []
+        with self.lock, self.conn:
+            for article in articles:
+                cursor = self.conn.execute("INSERT OR IGNORE INTO seen VALUES (?, ?, ?)",
+                                           (key, canonical_url(article['url']), now))
+                if cursor.rowcount:
+                    new.append(article)
+        return new
+
+    def mark_baseline(self, query, source):
+        """Record the first successful poll of a pair; True if this was it"""
+        with self.lock, self.conn:
+            cursor = self.conn.execute("INSERT OR IGNORE INTO baselines VALUES (?, ?)",
+                                       (normalize_query(query), source))
+            return cursor.rowcount == 1
+
+
+class WatchJob:
+    """One (query, source) pair and its polling interval"""
+
+    def __init__(self, query, source, interval):
+        self.query = query
+        self.source = source
+        self.interval = interval
+
+    def __lt__(self, other):
+        return (self.query, self.source) < (other.query, other.source)
+
+
+def load_watchlist(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_jobs(watchlist, sources):
+    jobs = []
+    for entry in watchlist:
+        interval = entry.get('interval', DEFAULT_INTERVAL)
+        source_intervals = entry.get('source_intervals', {})
+        for source in entry.get('sources') or list(sources):
+            if source not in sources:
+                print(f"Unknown source in watch list: {source}")
+                continue
+            jobs.append(WatchJob(entry['query'], source, source_intervals.get(source, interval)))
+    return jobs
+
+
+def jittered(interval):
+    return interval * random.uniform(1 - JITTER, 1 + JITTER)
+
+
+class JsonlSink:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def __call__(self, query, articles):
+        lines = []
+        for article in articles:
+            date_obj = article.get('date_obj')
+            lines.append(json.dumps({
+                'query': query, 'source': article['source'], 'title': article['title'],
+                'url': article['url'], 'date': article.get('date'),
+                'date_obj': date_obj.isoformat() if date_obj else None,
+                'found_at': datetime.now().isoformat(timespec='seconds')
+            }) + "\n")
+        with self.lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write("".join(lines))
+
+
+def desktop_notify(query, articles):
+    """Best-effort desktop notification; falls back to printing"""
+    title = f"{len(articles)} new article{'s' if len(articles) != 1 else ''} for '{query}'"
+    body = "\n".join(f"{a['source']}: {a['title']}" for a in articles[:3])
+    try:
+        if shutil.which("notify-send"):
+            subprocess.run(["notify-send", title, body], check=False, timeout=5)
+            return
+        if sys.platform == "darwin":
+            script = f'display notification {json.dumps(body)} with title {json.dumps(title)}'
+            subprocess.run(["osascript", "-e", script], check=False, timeout=5)
+            return
+    except Exception as e:
+        print(f"Error sending notification: {e}")
+    print(f"{title}\n{body}")
+
+
+class Monitor:
+    def __init__(self, jobs, core=None, state=None, callbacks=None, workers=4, emit_initial=False):
+        self.core = core or ScraperCore()
+        self.state = state or MonitorState()
+        self.callbacks = callbacks or []
+        self.workers = workers
+        self.emit_initial = emit_initial
+        self.stop_event = threading.Event()
+        self.queue = []
+        self.stats = {'polls': 0, 'not_modified': 0, 'unchanged': 0, 'parsed': 0, 'new_articles': 0, 'errors': 0}
+        self.stats_lock = threading.Lock()
+
+        # Spread first polls over each job's interval
+        now = time.monotonic()
+        for job in jobs:
+            heapq.heappush(self.queue, (now + random.uniform(0, min(job.interval, 30)), job))
+
+    def count(self, key, amount=1):
+        with self.stats_lock:
+            self.stats[key] += amount
+
+    def poll(self, job):
+        """Poll one (query, source) and emit any new articles"""
+        self.count('polls')
+        search_url = self.core.build_search_url(self.core.sources[job.source], job.query)
+        etag, last_modified, body_hash = self.state.validators(search_url)
+        conditional = {}
+        if etag:
+            conditional['If-None-Match'] = etag
+        if last_modified:
+            conditional['If-Modified-Since'] = last_modified
+
+        response = self.core.fetch_search_page(search_url, conditional, source=job.source)
+        if response.status_code == 304:
+            self.count('not_modified')
+            return
+        if response.status_code != 200:
+            raise Exception(f"HTTP {response.status_code}")
+
+        new_hash = hashlib.sha1(response.content).hexdigest()
+        if new_hash == body_hash:
+            self.count('unchanged')
+            return
+
+        self.count('parsed')
+        soup = self.core.parse_html(response.text)
+        articles = self.core.extract_articles(soup, job.source, search_url, job.query)
+        if not articles:
+            # Keep no validators, hash or baseline: the next poll parses the page again, and
+            # the first one that finds articles becomes the baseline
+            return
+
+        # The first poll of a pair only establishes what has already been seen
+        first_poll = self.state.mark_baseline(job.query, job.source) and not self.emit_initial
+        new = self.state.filter_new(job.query, articles)
+        self.state.save_validators(search_url, response.headers.get('ETag'),
+                                   response.headers.get('Last-Modified'), new_hash)
+        if new and not first_poll:
+            self.count('new_articles', len(new))
+            for callback in self.callbacks:
+                try:
+                    callback(job.query, new)
+                except Exception as e:
+                    print(f"Error in monitor callback: {e}")
+
+    def run_job(self, job):
+        try:
+            self.poll(job)
+        except Exception as e:
+            self.count('errors')
+            print(f"Error polling {job.source} for '{job.query}': {e}")
+        finally:
+            with self.stats_lock:
+                heapq.heappush(self.queue, (time.monotonic() + jittered(job.interval), job))
+
+    def run(self):
+        """Dispatch due jobs until stop() is called"""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while not self.stop_event.is_set():
+                with self.stats_lock:
+                    due = []
+                    now = time.monotonic()
+                    while self.queue and self.queue[0][0] <= now:
+                        due.append(heapq.heappop(self.queue)[1])
+                    wait = self.queue[0][0] - now if self.queue else 1.0
+                for job in due:
+                    pool.submit(self.run_job, job)
+                self.stop_event.wait(min(max(wait, 0.05), 1.0))
+
+    def stop(self):
+        self.stop_event.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch saved queries for new articles")
+    parser.add_argument("watchlist", help="JSON watch list")
+    parser.add_argument("--state", default="monitor_state.db", help="seen-URL and validator database")
+    parser.add_argument("--jsonl", help="append new articles to this JSONL file")
+    parser.add_argument("--notify", action="store_true", help="show a desktop notification for new articles")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--emit-initial", action="store_true", help="emit articles found on the first poll too")
+    args = parser.parse_args()
+
+    core = ScraperCore()
+    jobs = build_jobs(load_watchlist(args.watchlist), core.sources)
+
+    def print_new(query, articles):
+        for article in articles:
+            print(f"[{query}] {article['source']}: {article['title']}\n    {article['url']}")
+
+    callbacks = [print_new]
+    if args.jsonl:
+        callbacks.append(JsonlSink(args.jsonl))
+    if args.notify:
+        callbacks.append(desktop_notify)
+
+    monitor = Monitor(jobs, core, MonitorState(args.state), callbacks, args.workers, args.emit_initial)
+    print(f"Watching {len(jobs)} query/source pairs")
+    try:
+        monitor.run()
+    except KeyboardInterrupt:
+        monitor.stop()
+    core.selector_stats.save()
+    print(f"Stats: {monitor.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Optional process-pool parse stage.
+
+BeautifulSoup parsing and the selector walk in extract_articles /
+extract_article_content are pure-Python CPU work, so threads don't speed
+them up. With a ParsePool the fetch threads hand raw response bytes to
+worker processes and get back plain article dicts (or body text), so
+parse throughput scales with cores while fetching stays on threads.
+Search pages come back with the selector hit/miss observations made while
+parsing them, which are merged into the caller's SelectorStats.
+
+The pool is off by default; set NEWS_SCRAPER_PARSE_WORKERS (0 keeps
+parsing in-process) and optionally NEWS_SCRAPER_PARSE_CHUNKSIZE, or pass
+parse_pool= to ScraperCore.
+"""
+import os
+import threading
+
+PARSE_WORKERS_ENV = "NEWS_SCRAPER_PARSE_WORKERS"
+PARSE_CHUNKSIZE_ENV = "NEWS_SCRAPER_PARSE_CHUNKSIZE"
+
+# Pages handed to a worker per task in batch calls; amortizes pickling round-trips
+DEFAULT_CHUNKSIZE = 4
+
+_worker_core = None
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def _core():
+    """The ScraperCore of this worker process, created on first use"""
+    global _worker_core
+    if _worker_core is None:
+        from scraper_core import ScraperCore
+        from selector_stats import SelectorStats
+        _worker_core = ScraperCore(parse_pool=False)
+        _worker_core.selector_stats = SelectorStats(forward=True)
+    return _worker_core
+
+
+def decode(body, encoding):
+    """Same text requests' response.text would give, decoded in the worker"""
+    return str(body, encoding or 'utf-8', errors='replace')
+
+
+def parse_search_page(job):
+    """(source, search_url, query, body bytes, encoding, max cards, final) -> article dicts; runs in a worker"""
+    source, search_url, query, body, encoding, max_cards, final = job
+    core = _core()
+    return core.extract_articles(core.parse_html(decode(body, encoding)), source, search_url, query, max_cards,
+                                 final)
+
+
+def _parse_search_page_observed(job):
+    # Pool variant: the selector observations travel back with the articles
+    return parse_search_page(job), _core().selector_stats.drain()
+
+
+def parse_article_page(page):
+    """(body bytes, encoding) -> extracted article text; runs in a worker"""
+    body, encoding = page
+    core = _core()
+    return core.extract_article_content(core.parse_html(decode(body, encoding)))
+
+
+def _parse_article_page_safe(page):
+    # Batch variant: one bad page shouldn't abort the whole map
+    try:
+        return parse_article_page(page)
+    except Exception as e:
+        return e
+
+
+class ParsePool:
+    def __init__(self, workers=None, chunksize=DEFAULT_CHUNKSIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = max(1, chunksize)
+        from concurrent.futures import ProcessPoolExecutor
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_core)
+
+    def parse_search(self, source, search_url, query, body, encoding=None, max_cards=None, selector_stats=None,
+                     final=True):
+        """Parse one search page in a worker; blocks the calling thread only
+
+        The worker's selector observations are merged into selector_stats if given.
+        """
+        articles, observed = self.executor.submit(_parse_search_page_observed,
+                                                  (source, search_url, query, body, encoding, max_cards, final)).result()
+        if selector_stats is not None:
+            selector_stats.merge(*observed)
+        return articles
+
+    def parse_article(self, body, encoding=None):
+        return self.executor.submit(parse_article_page, (body, encoding)).result()
+
+    def parse_search_many(self, jobs, selector_stats=None):
+        """[(source, search_url, query, body, encoding, max_cards, final)] -> [articles] in order, chunked across workers"""
+        results = []
+        for articles, observed in self.executor.map(_parse_search_page_observed, jobs, chunksize=self.chunksize):
+            if selector_stats is not None:
+                selector_stats.merge(*observed)
+            results.append(articles)
+        return results
+
+    def parse_articles(self, pages):
+        """[(body bytes, encoding)] -> [text or exception] in order, chunked across workers"""
+        return list(self.executor.map(_parse_article_page_safe, pages, chunksize=self.chunksize))
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def shared_pool():
+    """The process-wide pool configured by NEWS_SCRAPER_PARSE_WORKERS, or None"""
+    global _shared_pool
+    workers = os.environ.get(PARSE_WORKERS_ENV, "")
+    if not workers or workers == "0":
+        return None
+    with _shared_lock:
+        if _shared_pool is None:
+            chunksize = int(os.environ.get(PARSE_CHUNKSIZE_ENV) or DEFAULT_CHUNKSIZE)
+            _shared_pool = ParsePool(int(workers), chunksize)
+        return _shared_pool
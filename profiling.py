@@ -0,0 +1,230 @@
+"""Opt-in CPU and memory profiling for searches and article fetches.
+
+Profiling is off unless NEWS_SCRAPER_PROFILE (or the app's --profile flag)
+names one or more comma separated modes:
+
+    cpu     cProfile of the whole call, written as a .prof file plus a
+            text report sorted by cumulative time
+    sample  low-overhead stack sampler, written as folded stacks that
+            flamegraph.pl / speedscope / inferno read directly
+    memory  tracemalloc snapshots taken around every HTML parse, written
+            as a report of the top allocation sites (snapshots are slow,
+            so run it on its own when timings matter)
+
+Reports go to NEWS_SCRAPER_PROFILE_DIR (default: ./profiles). A single
+search or fetch can also be profiled headless:
+
+    python profiling.py search "climate summit" --mode cpu,sample,memory
+    python profiling.py article https://apnews.com/article/... --mode cpu
+"""
+import argparse
+import functools
+import io
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_ENV = "NEWS_SCRAPER_PROFILE"
+PROFILE_DIR_ENV = "NEWS_SCRAPER_PROFILE_DIR"
+MODES = ("cpu", "sample", "memory")
+
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.005
+
+_local = threading.local()
+
+
+def enabled_modes():
+    """The profiling modes switched on in the environment"""
+    value = os.environ.get(PROFILE_ENV, "")
+    return {mode.strip() for mode in value.split(",") if mode.strip() in MODES}
+
+
+def report_path(label, extension):
+    """Build a unique output path for one profiling report"""
+    directory = os.environ.get(PROFILE_DIR_ENV, "profiles")
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    return os.path.join(directory, f"{label}_{stamp}_{os.getpid()}.{extension}")
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer and counts folded stacks"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            key = ";".join(reversed(stack))
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def write_folded(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.counts.items(), key=lambda item: -item[1]):
+                f.write(f"{stack} {count}\n")
+
+
+class ProfileSession:
+    """Collects every enabled profile for one profiled call"""
+
+    def __init__(self, label, modes):
+        self.label = label
+        self.modes = modes
+        self.profiler = None
+        self.sampler = None
+        self.memory_sections = []
+        self.started_tracemalloc = False
+
+    def start(self):
+        if "memory" in self.modes and not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            self.started_tracemalloc = True
+        if "sample" in self.modes:
+            self.sampler = StackSampler(threading.get_ident())
+            self.sampler.start()
+        if "cpu" in self.modes:
+            import cProfile  # only when profiling; keeps app startup lean
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop(self, elapsed):
+        written = []
+        if self.profiler:
+            self.profiler.disable()
+            prof_path = report_path(self.label, "prof")
+            self.profiler.dump_stats(prof_path)
+            import pstats
+            text = io.StringIO()
+            stats = pstats.Stats(self.profiler, stream=text)
+            stats.sort_stats("cumulative").print_stats(40)
+            text_path = report_path(self.label, "cpu.txt")
+            with open(text_path, 'w', encoding='utf-8') as f:
+                f.write(f"{self.label}: {elapsed:.3f}s wall\n\n")
+                f.write(text.getvalue())
+            written += [prof_path, text_path]
+
+        if self.sampler:
+            self.sampler.stop()
+            folded_path = report_path(self.label, "folded")
+            self.sampler.write_folded(folded_path)
+            written.append(folded_path)
+
+        if "memory" in self.modes:
+            memory_path = report_path(self.label, "memory.txt")
+            with open(memory_path, 'w', encoding='utf-8') as f:
+                f.write(f"{self.label}: {len(self.memory_sections)} parse sections\n")
+                for name, peak, top in self.memory_sections:
+                    f.write(f"\n== {name}: peak {peak / 1024:.0f} KiB ==\n")
+                    for stat in top:
+                        f.write(f"{stat}\n")
+            written.append(memory_path)
+            if self.started_tracemalloc:
+                tracemalloc.stop()
+
+        for path in written:
+            print(f"Profile written to {path}")
+
+
+def profiled(label):
+    """Decorator that profiles each call when profiling modes are enabled"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            modes = enabled_modes()
+            # Nested profiled calls are covered by the outer session
+            if not modes or getattr(_local, 'session', None) is not None:
+                return func(*args, **kwargs)
+
+            session = ProfileSession(label, modes)
+            _local.session = session
+            start = time.perf_counter()
+            session.start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                session.stop(time.perf_counter() - start)
+                _local.session = None
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def memory_section(name):
+    """Record a tracemalloc snapshot diff for the enclosed block.
+
+    Only active inside a profiled call with the memory mode enabled, so it
+    costs a single attribute lookup otherwise.
+    """
+    session = getattr(_local, 'session', None)
+    if session is None or "memory" not in session.modes or not tracemalloc.is_tracing():
+        yield
+        return
+
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    try:
+        yield
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        top = after.compare_to(before, 'lineno')[:15]
+        session.memory_sections.append((name, peak, top))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile a single search or article fetch")
+    parser.add_argument("kind", choices=["search", "article"])
+    parser.add_argument("target", help="search query or article URL")
+    parser.add_argument("--mode", default="cpu,sample,memory", help="comma separated: cpu, sample, memory")
+    parser.add_argument("--output-dir", help="where to write reports")
+    args = parser.parse_args()
+
+    os.environ[PROFILE_ENV] = args.mode
+    if args.output_dir:
+        os.environ[PROFILE_DIR_ENV] = args.output_dir
+
+    from scraper_core import ScraperCore
+    core = ScraperCore()
+
+    if args.kind == "search":
+        @profiled("search")
+        def run():
+            results = []
+            for source, base_url in core.sources.items():
+                try:
+                    results.extend(core.search_source(source, base_url, args.target))
+                except Exception as e:
+                    print(f"Error searching {source}: {e}")
+            return results
+        print(f"Found {len(run())} articles")
+    else:
+        content = profiled("article")(core.fetch_article)(args.target)
+        print(f"Extracted {len(content)} characters")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Bounded top-K ranking of search results for every sort order at once.
+
+Articles are added as each source returns them. For every ordering
+(relevance, date, source) the sort key is computed once on arrival and
+the article goes into a min-heap holding that ordering's best K, so
+adding costs O(log K) per ordering and nothing is ever sorted in full.
+Reading an ordering sorts only its K heap entries, and the result is kept
+until more articles arrive, so switching the sort back and forth in the
+GUI is a lookup. Articles are de-duplicated by canonical URL; the first
+one seen wins, like merge_results.
+"""
+import heapq
+import threading
+
+from urls import canonical_url
+
+# Rows kept per ordering; a Treeview with more than this is unusable anyway
+TOP_K = 500
+
+_descending_cache = {}
+
+
+def descending(text):
+    """Key under which larger means alphabetically earlier, for A-Z orders in a max-first heap
+
+    Negated code points with a 0 terminator, so a prefix ranks before its
+    extensions ("CNN" before "CNN International").
+    """
+    key = _descending_cache.get(text)
+    if key is None:
+        key = tuple(-ord(c) for c in text.lower()) + (0,)
+        _descending_cache[text] = key
+    return key
+
+
+def timestamp(article):
+    date_obj = article.get('date_obj')
+    return date_obj.timestamp() if date_obj else float('-inf')
+
+
+# Sort key from (relevance, timestamp, source); larger ranks first in every ordering
+ORDERINGS = {
+    "Relevance": lambda relevance, ts, source: (relevance, ts),
+    "Date": lambda relevance, ts, source: (ts, relevance),
+    "Source": lambda relevance, ts, source: (descending(source), relevance, ts),
+}
+
+
+class Ranking:
+    def __init__(self, k=TOP_K, orderings=ORDERINGS):
+        self.k = k
+        self.orderings = orderings
+        self.heaps = {name: [] for name in orderings}
+        self.views = {}  # ordering -> ranked list, until the next add
+        self.seen = set()
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def add(self, articles):
+        """Rank new articles; returns the ones that weren't duplicates"""
+        added = []
+        with self.lock:
+            for article in articles:
+                url = canonical_url(article['url'])
+                if url in self.seen:
+                    continue
+                self.seen.add(url)
+                self.count += 1
+                added.append(article)
+                fields = (article['relevance'], timestamp(article), article['source'])
+                for name, key in self.orderings.items():
+                    # count breaks ties by arrival, so articles themselves are never compared
+                    entry = (key(*fields), -self.count, article)
+                    heap = self.heaps[name]
+                    if len(heap) < self.k:
+                        heapq.heappush(heap, entry)
+                    elif entry > heap[0]:
+                        heapq.heapreplace(heap, entry)
+            if added:
+                self.views.clear()
+        return added
+
+    def view(self, ordering="Relevance"):
+        """The top K articles, best first, in an ordering; shared, don't modify"""
+        with self.lock:
+            ranked = self.views.get(ordering)
+            if ranked is None:
+                ranked = [entry[2] for entry in sorted(self.heaps[ordering], reverse=True)]
+                self.views[ordering] = ranked
+            return ranked
+
+    def __len__(self):
+        return min(self.count, self.k)
+
+
+def rank(articles, ordering="Relevance", k=TOP_K):
+    """Top k of articles in an ordering, without sorting them all"""
+    ranking = Ranking(k)
+    ranking.add(articles)
+    return ranking.view(ordering)
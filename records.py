@@ -0,0 +1,117 @@
+"""Compact article records.
+
+Batch runs, histories and store scans hold very many articles, and as
+plain dicts each one carries a hash table plus its own reference to the
+source name. ArticleRecord keeps the six core fields in __slots__ with
+the source interned to a small integer ID, and puts rarer keys (body,
+via, stored, ...) in an optional side dict. It behaves like a read/write
+dict for the GUI, exporters and JSON writers: record['title'],
+record.get('body'), 'via' in record, dict(record).
+"""
+import threading
+
+FIELDS = ('source', 'title', 'url', 'date', 'date_obj', 'relevance')
+
+# Source names by ID, shared by every record in the process
+SOURCE_NAMES = []
+SOURCE_IDS = {}
+_intern_lock = threading.Lock()
+
+
+def intern_source(name):
+    """Small integer ID for a source name"""
+    source_id = SOURCE_IDS.get(name)
+    if source_id is None:
+        with _intern_lock:
+            source_id = SOURCE_IDS.get(name)
+            if source_id is None:
+                source_id = len(SOURCE_NAMES)
+                SOURCE_NAMES.append(name)
+                SOURCE_IDS[name] = source_id
+    return source_id
+
+
+class ArticleRecord:
+    __slots__ = ('source_id', 'title', 'url', 'date', 'date_obj', 'relevance', 'extra')
+
+    def __init__(self, source, title, url, date="", date_obj=None, relevance=0, **extra):
+        self.source_id = intern_source(source)
+        self.title = title
+        self.url = url
+        self.date = date
+        self.date_obj = date_obj
+        self.relevance = relevance
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, article):
+        """Record from an article dict (or another record)"""
+        if isinstance(article, cls):
+            return article
+        extra = {key: value for key, value in article.items() if key not in FIELDS}
+        return cls(article['source'], article['title'], article['url'], article.get('date', ""),
+                   article.get('date_obj'), article.get('relevance', 0), **extra)
+
+    @property
+    def source(self):
+        return SOURCE_NAMES[self.source_id]
+
+    # Dict-compatible view
+
+    def __getitem__(self, key):
+        if key in FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == 'source':
+            self.source_id = intern_source(value)
+        elif key in FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in FIELDS or bool(self.extra and key in self.extra)
+
+    def keys(self):
+        return list(FIELDS) + list(self.extra or ())
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(FIELDS) + len(self.extra or ())
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, (ArticleRecord, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ArticleRecord({self.to_dict()!r})"
+
+    def __reduce__(self):
+        # Pickle by source name: IDs are per process (e.g. parse pool workers)
+        return (ArticleRecord.from_dict, (self.to_dict(),))
@@ -0,0 +1,96 @@
+"""In-memory cache of whole search results, per query and source selection.
+
+Queries are keyed on their words regardless of case, order and spacing
+("Climate  Summit" and "summit climate" share an entry) plus the set of
+sources searched. An entry younger than the TTL is served as is; an older
+one, up to the stale limit, is served immediately while the caller
+revalidates it with a fresh scrape. Only one revalidation of a key runs
+at a time. Results are kept and handed out as stored (a list, or a
+Ranking with every sort order), so callers must not modify them.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import METRICS
+
+CACHE_TTL_ENV = "NEWS_SCRAPER_CACHE_TTL"
+CACHE_STALE_ENV = "NEWS_SCRAPER_CACHE_STALE"
+DEFAULT_TTL = 300
+# Past this age an entry is not worth showing, even while refreshing
+DEFAULT_STALE = 3600
+MAX_ENTRIES = 256
+
+# Lookup outcomes
+FRESH, STALE = 'fresh', 'stale'
+
+
+def cache_key(query, sources):
+    return (" ".join(sorted(set(query.lower().split()))), frozenset(sources))
+
+
+def describe_age(seconds):
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min ago"
+    return f"{int(seconds // 3600)} h ago"
+
+
+class ResultCache:
+    def __init__(self, ttl=None, stale=None, max_entries=MAX_ENTRIES):
+        self.ttl = float(os.environ.get(CACHE_TTL_ENV, DEFAULT_TTL)) if ttl is None else ttl
+        self.stale = float(os.environ.get(CACHE_STALE_ENV, DEFAULT_STALE)) if stale is None else stale
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (results, stored_at)
+        self.refreshing = set()
+        self.lock = threading.Lock()
+
+    def lookup(self, query, sources):
+        """(results, FRESH or STALE, age in seconds), or (None, None, None) on a miss"""
+        key = cache_key(query, sources)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+        if entry is None or self.ttl <= 0:
+            METRICS.inc('result_cache', outcome='miss')
+            return None, None, None
+        results, stored_at = entry
+        age = time.time() - stored_at
+        if age > self.stale:
+            METRICS.inc('result_cache', outcome='miss')
+            return None, None, None
+        state = FRESH if age <= self.ttl else STALE
+        METRICS.inc('result_cache', outcome=state)
+        return results, state, age
+
+    def store(self, query, sources, results):
+        key = cache_key(query, sources)
+        with self.lock:
+            self.entries[key] = (results, time.time())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def begin_refresh(self, query, sources):
+        """Claim the revalidation of a key; False if one is already running"""
+        key = cache_key(query, sources)
+        with self.lock:
+            if key in self.refreshing:
+                return False
+            self.refreshing.add(key)
+            return True
+
+    def end_refresh(self, query, sources):
+        with self.lock:
+            self.refreshing.discard(cache_key(query, sources))
+
+    def invalidate(self, query=None, sources=None):
+        """Drop one entry, or everything"""
+        with self.lock:
+            if query is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(cache_key(query, sources), None)
@@ -0,0 +1,671 @@
+"""Headless scraping logic shared by the Tk app and the command-line tools.
+
+Everything in here works without a Tk root, so benchmarks, servers and
+batch jobs can drive the same extraction code the GUI uses.
+"""
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, urljoin
+
+from urls import canonical_url
+from metrics import METRICS
+from parse_pool import shared_pool
+from profiling import memory_section
+from records import ArticleRecord
+from selector_stats import SelectorStats
+from source_health import SourceHealth, SourceUnavailable, failure_reason
+from cancellation import Cancelled, check
+
+_fetcher_lock = threading.Lock()
+
+# First prefix parsed by incremental search; each later attempt doubles it
+INCREMENTAL_FIRST_PREFIX = 64 * 1024
+# Markup that must follow the last accepted result's link, so its title and date are complete
+INCREMENTAL_CARD_MARGIN = 4 * 1024
+
+# Define credible news sources
+DEFAULT_SOURCES = {
+    "AP News": "https://apnews.com/search?q=",
+    "Reuters": "https://www.reuters.com/search/news?blob=",
+    "BBC": "https://www.bbc.co.uk/search?q=",
+    "NPR": "https://www.npr.org/search?query=",
+    "The Guardian": "https://www.theguardian.com/search?q=",
+    "Al Jazeera": "https://www.aljazeera.com/search/",
+    "CNN": "https://www.cnn.com/search?q=",
+    "The New York Times": "https://www.nytimes.com/search?query="
+}
+
+SEARCH_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Cache-Control": "max-age=0"
+}
+
+ARTICLE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36"
+}
+
+# Fallback selector chains per source and field. Order is the preference
+# when nothing is known; SelectorStats reorders each chain by hit rate.
+SEARCH_SELECTORS = {
+    "AP News": {
+        'label': "AP News",
+        'base': "https://apnews.com",
+        'container': [".CardList-items > div", ".PagePromo", "[data-key='card']"],
+        'title': [".CardHeadline h3", ".PagePromo-title", "h3.Component-headline", "h2", "h3"],
+        'link': ["a"],
+        'date': ["time", ".PagePromo-timestamp", ".CardTime-time", "[data-key='timestamp']"]
+    },
+    "Reuters": {
+        'label': "Reuters",
+        'base': "https://www.reuters.com",
+        'container': ["li.search-result", ".search-result__list-item", "[data-testid='search-result']",
+                      ".media-story-card"],
+        'title': ["h3.search-result-title", "[data-testid='heading']", "h3", ".media-story-card__heading"],
+        'link': ["a"],
+        'date': ["time", ".media-story-card__datetime"]
+    },
+    "BBC": {
+        'label': "BBC",
+        'base': "https://www.bbc.co.uk",
+        'container': [".ssrcss-1020bd1-Stack", ".ssrcss-1krxqkx-Stack", "[data-testid='search-result']", ".gs-c-promo"],
+        'title': ["h3", ".gs-c-promo-heading__title", "[data-testid='title']"],
+        'link': ["a"],
+        'date': ["time", "[data-testid='timestamp']"]
+    },
+    "NPR": {
+        'label': "NPR",
+        'base': "https://www.npr.org",
+        'container': [".item-info", ".result-item", ".stories-list article"],
+        'title': ["h2", "h3", ".title"],
+        'link': ["a"],
+        'date': ["time", ".date"]
+    },
+    "The Guardian": {
+        'label': "Guardian",
+        'base': None,
+        'container': [".fc-item", ".search-results__item", ".u-faux-block-link"],
+        'title': ["h2", "h3", ".fc-item__title"],
+        'link': ["a"],
+        'date': ["time", ".fc-item__timestamp"]
+    },
+    "Al Jazeera": {
+        'label': "Al Jazeera",
+        'base': "https://www.aljazeera.com",
+        'container': [".gc__content", ".article-card"],
+        'title': ["h3", ".gc__title"],
+        'link': ["a"],
+        'date': ["time", ".date-simple"]
+    },
+    "CNN": {
+        'label': "CNN",
+        'base': "https://www.cnn.com",
+        'container': [".cnn-search__result", ".cnn-search__result-contents"],
+        'title': ["h3", ".cnn-search__result-headline"],
+        'link': ["a"],
+        'date': ["time", ".cnn-search__result-publish-date"]
+    },
+    "The New York Times": {
+        'label': "NYT",
+        'base': "https://www.nytimes.com",
+        'container': [".css-1i8vfl5", ".css-1l4w6pd", "[data-testid='search-bodega-result']"],
+        'title': ["h4", "[data-testid='headline']"],
+        'link': ["a"],
+        'date': ["time", "[data-testid='publication-date']"]
+    }
+}
+
+ARTICLE_BODY_SELECTORS = ["article p", ".article-body p", ".story-body p", ".content p", "main p"]
+
+# How each source's search results are paged: a query parameter counting
+# pages or result offsets. Sources without one are walked through their
+# rel="next" links, one page at a time.
+SEARCH_PAGINATION = {
+    "AP News": {'param': "p", 'first': 1, 'step': 1},
+    "Reuters": {'param': "offset", 'first': 0, 'step': 20},
+    "BBC": {'param': "page", 'first': 1, 'step': 1},
+    "NPR": {'param': "page", 'first': 1, 'step': 1},
+    "The Guardian": {'param': "page", 'first': 1, 'step': 1},
+    "CNN": {'param': "from", 'first': 0, 'step': 10},
+}
+
+# Results kept per source and search unless NEWS_SCRAPER_RESULT_DEPTH says otherwise,
+# e.g. "40" for every source or "20,Reuters=60,BBC=40"
+RESULT_DEPTH_ENV = "NEWS_SCRAPER_RESULT_DEPTH"
+DEFAULT_RESULT_DEPTH = 5
+# Further pages fetched at once per source, within the fetcher's per-host connection pool
+PAGES_IN_FLIGHT = 4
+# Paging stops at the first page whose best new result scores below this (one query word in the title)
+MIN_PAGE_RELEVANCE = 2
+
+NEXT_LINK = re.compile(rb'<(?:a|link)\b[^>]*\brel=["\']?next\b[^>]*>', re.I)
+HREF = re.compile(rb'\bhref=["\']?([^"\'\s>]+)', re.I)
+
+
+# Point every source at a local stand-in server, e.g. http://127.0.0.1:8765
+SOURCE_BASE_ENV = "NEWS_SCRAPER_SOURCE_BASE"
+
+
+def source_slug(source):
+    """Turn a source name into a file and URL friendly slug"""
+    return re.sub(r'[^a-z0-9]+', '-', source.lower()).strip('-')
+
+
+def parse_result_depth(value):
+    """(default depth, {source: depth}) from a NEWS_SCRAPER_RESULT_DEPTH value"""
+    default, per_source = DEFAULT_RESULT_DEPTH, {}
+    for item in (value or "").split(","):
+        name, _, depth = item.rpartition("=")
+        if not depth.strip():
+            continue
+        if name.strip():
+            per_source[name.strip()] = int(depth)
+        else:
+            default = int(depth)
+    return default, per_source
+
+
+def page_url(search_url, pagination, index):
+    """URL of the index-th results page (0 is the first) of a paged search"""
+    value = pagination['first'] + index * pagination['step']
+    separator = "&" if "?" in search_url else "?"
+    return f"{search_url}{separator}{pagination['param']}={value}"
+
+
+def next_page_link(body, page_url):
+    """Absolute URL of a page's rel="next" link, or None"""
+    tag = NEXT_LINK.search(body)
+    href = HREF.search(tag.group(0)) if tag else None
+    if not href:
+        return None
+    return urljoin(page_url, href.group(1).decode('utf-8', errors='replace').replace("&amp;", "&"))
+
+
+def local_sources(base_url, sources=None):
+    """Map each source's search URL onto a local server at base_url"""
+    base_url = base_url.rstrip('/')
+    return {source: f"{base_url}/{source_slug(source)}/search?q="
+            for source in (sources or DEFAULT_SOURCES)}
+
+
+class ScraperCore:
+    def __init__(self, sources=None, parse_pool=None):
+        if sources is None and os.environ.get(SOURCE_BASE_ENV):
+            sources = local_sources(os.environ[SOURCE_BASE_ENV])
+        self.sources = dict(sources or DEFAULT_SOURCES)
+        self._fetcher = None
+        self.selector_stats = SelectorStats()
+        self.source_health = SourceHealth()
+        self.result_depth, self.source_depths = parse_result_depth(os.environ.get(RESULT_DEPTH_ENV))
+        self.min_page_relevance = MIN_PAGE_RELEVANCE
+        # Worker processes for parsing; None means the NEWS_SCRAPER_PARSE_WORKERS pool, False none
+        self.parse_pool = shared_pool() if parse_pool is None else (parse_pool or None)
+
+    @property
+    def fetcher(self):
+        """The HTTP layer, created on first use so requests isn't imported at startup"""
+        if self._fetcher is None:
+            with _fetcher_lock:
+                if self._fetcher is None:
+                    from fetcher import Fetcher
+                    self._fetcher = Fetcher()
+        return self._fetcher
+
+    def build_search_url(self, base_url, query):
+        """Construct the search URL for a source"""
+        return base_url + query.replace(" ", "+")
+
+    def parse_html(self, html):
+        """Parse a page into a BeautifulSoup tree"""
+        # Imported here rather than at module load: bs4 is slow to import and the GUI paints first
+        from bs4 import BeautifulSoup
+        with memory_section("parse_html"):
+            return BeautifulSoup(html, 'html.parser')
+
+    def fetch_search_page(self, search_url, extra_headers=None, source=None, cancel=None):
+        """GET a search page; extra_headers can carry conditional request validators"""
+        headers = dict(SEARCH_HEADERS, **extra_headers) if extra_headers else SEARCH_HEADERS
+        return self.fetcher.get(search_url, source=source, stage="search", headers=headers, cancel=cancel)
+
+    def search_source(self, source, base_url, query, limit=None, cancel=None):
+        """Fetch one source's search page and return its extracted articles
+
+        With a limit the page is streamed and parsed incrementally, and
+        reading stops once at least `limit` complete results are found.
+        A source on hold after failing (see source_health) returns [] without a request.
+        Raises Cancelled once cancel is set; a cancelled search says nothing about the source's health.
+        """
+        check(cancel)
+        if not self.source_health.allow(source):
+            return []
+        try:
+            articles = self.search_source_page(source, base_url, query, limit, cancel)
+        except Cancelled:
+            self.source_health.abandoned(source)
+            raise
+        except SourceUnavailable as e:
+            self.source_health.failure(source, str(e))
+            return []
+        except Exception as e:
+            self.source_health.failure(source, failure_reason(e))
+            raise
+        # A query can legitimately have no results; only a page none of the source's layouts match is broken
+        if articles or not self.selector_stats.container_missing(source):
+            self.source_health.success(source)
+        else:
+            self.source_health.failure(source, "no articles")
+        return articles
+
+    def depth_for(self, source):
+        """How many results a search of the source should return"""
+        return self.source_depths.get(source, self.result_depth)
+
+    def search_source_page(self, source, base_url, query, limit=None, cancel=None):
+        """Up to limit (default: the source's depth) results, from as many result pages as needed"""
+        depth = limit or self.depth_for(source)
+        search_url = self.build_search_url(base_url, query)
+        next_url = None
+        if limit:
+            articles, next_url = self.search_source_incremental(source, search_url, query, limit, cancel)
+        else:
+            response = self.fetch_search_page(search_url, source=source, cancel=cancel)
+            if response.status_code != 200:
+                raise SourceUnavailable(f"HTTP {response.status_code}")
+            check(cancel)
+            articles = self.extract_page(source, search_url, query, response, depth)
+            if source not in SEARCH_PAGINATION:
+                next_url = next_page_link(response.content, search_url)
+        if len(articles) >= depth or not articles:
+            return articles[:depth]
+        return self.search_more_pages(source, search_url, query, depth, articles, next_url, cancel)
+
+    def extract_page(self, source, search_url, query, response, max_cards):
+        """Articles from a fetched search page, in the parse pool if there is one"""
+        if self.parse_pool:
+            return self.parse_pool.parse_search(source, search_url, query, response.content, response.encoding,
+                                                max_cards, self.selector_stats)
+        soup = self.parse_html(response.text)
+        return self.extract_articles(soup, source, search_url, query, max_cards)
+
+    def search_more_pages(self, source, search_url, query, depth, articles, next_url=None, cancel=None):
+        """Add results from the following pages until depth is reached or a page adds nothing relevant
+
+        Pages of parameter-paged sources are fetched PAGES_IN_FLIGHT at a
+        time; other sources follow their rel="next" links one by one.
+        """
+        pagination = SEARCH_PAGINATION.get(source)
+        per_page = len(articles)
+        results = list(articles)
+        seen = {canonical_url(article['url']) for article in articles}
+        index = 1
+        while len(results) < depth:
+            if pagination:
+                wanted = min(PAGES_IN_FLIGHT, -(-(depth - len(results)) // per_page))
+                urls = [page_url(search_url, pagination, index + i) for i in range(wanted)]
+                index += wanted
+            elif next_url and index < depth:
+                urls = [next_url]
+                index += 1
+            else:
+                break
+
+            next_url = None
+            stop = None
+            for url, page in self.fetch_pages(source, urls, query, depth, cancel):
+                if isinstance(page, Exception):
+                    stop = "error"
+                    break
+                page_articles, next_url = page
+                new = [article for article in page_articles if canonical_url(article['url']) not in seen]
+                if not new:
+                    stop = "exhausted"
+                    break
+                for article in new:
+                    seen.add(canonical_url(article['url']))
+                results.extend(new)
+                if max(article['relevance'] for article in new) < self.min_page_relevance:
+                    stop = "relevance"
+                    break
+            if stop:
+                METRICS.inc('pagination_stops', source=source, reason=stop)
+                break
+        return results[:depth]
+
+    def fetch_pages(self, source, urls, query, max_cards, cancel=None):
+        """Fetch search result pages in parallel; [(url, (articles, next link) or exception)] in order"""
+        pages = []
+        for url, response in self.fetcher.get_many(urls, {url: source for url in urls}, stage="search",
+                                                    headers=SEARCH_HEADERS, workers=len(urls), cancel=cancel):
+            check(cancel)
+            METRICS.inc('search_pages', source=source)
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                if response.status_code != 200:
+                    raise SourceUnavailable(f"HTTP {response.status_code}")
+                articles = self.extract_page(source, url, query, response, max_cards)
+                pages.append((url, (articles, next_page_link(response.content, url))))
+            except Exception as e:
+                pages.append((url, e))
+        return pages
+
+    def extract_from_body(self, source, search_url, query, body, encoding, max_cards=None, final=True):
+        """Articles from a search page's raw bytes, in the parse pool if there is one
+
+        final=False marks a prefix of the page (see extract_articles).
+        """
+        if self.parse_pool:
+            return self.parse_pool.parse_search(source, search_url, query, body, encoding, max_cards,
+                                                self.selector_stats, final)
+        soup = self.parse_html(str(body, encoding or 'utf-8', errors='replace'))
+        return self.extract_articles(soup, source, search_url, query, max_cards, final)
+
+    def search_source_incremental(self, source, search_url, query, limit, cancel=None):
+        """Parse growing prefixes of the page (64 KiB, 128 KiB, ...) until enough results
+
+        Returns (articles, next page link); the link is only looked for when
+        the whole page was read and its source pages by rel="next".
+        """
+        from fetcher import CHUNK_SIZE
+        with self.fetcher.stream(search_url, source=source, stage="search", headers=SEARCH_HEADERS,
+                                 cancel=cancel) as (response, body):
+            if response.status_code != 200:
+                raise SourceUnavailable(f"HTTP {response.status_code}")
+            buffer = bytearray()
+            next_parse = INCREMENTAL_FIRST_PREFIX
+            parsed_links = found = 0
+            # Selector stats count the page once, as seen by its last prefix parse
+            with self.selector_stats.deferred() as observed:
+                while True:
+                    chunk = body.read(CHUNK_SIZE)
+                    buffer += chunk
+                    if chunk and len(buffer) < next_parse:
+                        continue
+                    # Without new links since a short attempt a prefix can't hold more results; skip its parse
+                    links = buffer.count(b"href")
+                    if chunk and links <= max(limit, parsed_links) and found < limit:
+                        next_parse *= 2
+                        continue
+                    parsed_links = links
+                    check(cancel)
+                    observed.reset()
+                    # Prefixes only count container-matched cards; the generic link fallback would take
+                    # navigation links ahead of the results, so it runs on the whole page only
+                    articles = self.extract_from_body(source, search_url, query, bytes(buffer), response.encoding,
+                                                      limit, final=not chunk)
+                    if not chunk:
+                        next_url = None if source in SEARCH_PAGINATION else next_page_link(bytes(buffer), search_url)
+                        return articles, next_url
+                    found = len(articles)
+                    if found >= limit and self.card_complete(buffer, articles[limit - 1]):
+                        METRICS.inc('early_stops', source=source, stage="search")
+                        return articles[:limit], None
+                    next_parse *= 2
+
+    def card_complete(self, buffer, article):
+        """True if the prefix runs well past the article's link, so its card wasn't cut off"""
+        path = urlsplit(article['url']).path.encode('utf-8')
+        position = buffer.rfind(path) if path else -1
+        return position >= 0 and len(buffer) - position > INCREMENTAL_CARD_MARGIN
+
+    def sort_key(self, article):
+        """Default ordering: relevance first, then newest"""
+        return (article['relevance'], article['date_obj'] if article['date_obj'] else datetime.min)
+
+    def select_first(self, node, source, field, selectors, many=False):
+        """First match of a fallback chain, trying selectors in hit-rate order"""
+        tried = []
+        for selector in self.selector_stats.order(source, field, selectors):
+            tried.append(selector)
+            found = node.select(selector) if many else node.select_one(selector)
+            if found:
+                self.selector_stats.record(source, field, tried, selector)
+                return found
+        self.selector_stats.record(source, field, tried, None)
+        return None
+
+    def extract_articles(self, soup, source, search_url, query, max_cards=None, final=True):
+        """Extract article information from search results (the first max_cards cards, default 5)
+
+        With final=False the soup is only a prefix of the page: the generic
+        link fallback is skipped, since the results may not have arrived yet.
+        """
+        articles = []
+        
+        # Source-specific extraction logic for modern webpage structures (2025)
+        selectors = SEARCH_SELECTORS.get(source)
+        if selectors:
+            try:
+                article_elements = self.select_first(soup, source, 'container', selectors['container'], many=True)
+                self.selector_stats.page_result(source, bool(article_elements))
+
+                for article in (article_elements or [])[:max_cards or DEFAULT_RESULT_DEPTH]:
+                    try:
+                        title_elem = self.select_first(article, source, 'title', selectors['title'])
+                        link_elem = self.select_first(article, source, 'link', selectors['link'])
+
+                        if title_elem and link_elem:
+                            title = title_elem.text.strip()
+                            link = link_elem['href']
+                            base = selectors['base']
+                            if base and not link.startswith('http'):
+                                link = base + link if link.startswith('/') else base + '/' + link
+
+                            date_elem = self.select_first(article, source, 'date', selectors['date'])
+                            date_text = date_elem.text.strip() if date_elem else "Recent"
+                            date_obj = self.parse_date(date_text)
+
+                            articles.append(ArticleRecord(source, title, link, date_text, date_obj,
+                                                           self.calculate_relevance(title, query)))
+                    except Exception as e:
+                        print(f"Error extracting {selectors['label']} article: {e}")
+            except Exception as e:
+                print(f"Error in {selectors['label']} extraction: {e}")
+
+        # Generic extraction for other sources or fallback
+        if not articles and final:
+            # Look for common article patterns
+            # 1. Find all links that might be articles
+            link_elements = soup.find_all('a', href=True)
+            
+            for link in link_elements[:30]:  # Check first 30 links
+                try:
+                    url = link['href']
+                    
+                    # Skip navigation, social media, etc.
+                    if self.is_likely_article_link(url, source):
+                        # Make URL absolute if it's relative
+                        if not url.startswith('http'):
+                            if url.startswith('/'):
+                                base_domain = '/'.join(search_url.split('/')[:3])
+                                url = base_domain + url
+                            else:
+                                url = '/'.join(search_url.split('/')[:-1]) + '/' + url
+                        
+                        # Get title from link text or contained heading
+                        title = ""
+                        heading = link.find(['h1', 'h2', 'h3', 'h4'])
+                        if heading:
+                            title = heading.get_text().strip()
+                        else:
+                            title = link.get_text().strip()
+                        
+                        # Skip if title is too short or contains unwanted elements
+                        if len(title) > 10 and not any(x in title.lower() for x in ['sign in', 'log in', 'subscribe']):
+                            date_text = "Recent"
+                            date_obj = datetime.now() - timedelta(days=3)  # Assume recent
+                            
+                            # Look for date near the link
+                            date_elem = link.find_next(['time', 'span', 'div'], class_=re.compile('(date|time|published)', re.I))
+                            if date_elem:
+                                date_text = date_elem.get_text().strip()
+                                date_obj = self.parse_date(date_text)
+                            
+                            # Add if not duplicate
+                            if not any(a['url'] == url for a in articles):
+                                articles.append(ArticleRecord(source, title, url, date_text, date_obj,
+                                                               self.calculate_relevance(title, query)))
+                except Exception as e:
+                    print(f"Error in generic extraction for {source}: {e}")
+        
+        return articles
+
+    def parse_date(self, date_text):
+        """Parse various date formats into a datetime object"""
+        try:
+            # Clean the date text
+            date_text = date_text.strip().replace('\n', '').replace('\t', '')
+            
+            # Handle relative dates
+            if 'ago' in date_text.lower():
+                now = datetime.now()
+                if 'hour' in date_text.lower():
+                    hours = int(re.search(r'(\d+)', date_text).group(1))
+                    return now - timedelta(hours=hours)
+                elif 'day' in date_text.lower():
+                    days = int(re.search(r'(\d+)', date_text).group(1))
+                    return now - timedelta(days=days)
+                elif 'minute' in date_text.lower():
+                    minutes = int(re.search(r'(\d+)', date_text).group(1))
+                    return now - timedelta(minutes=minutes)
+                return now  # Fallback for vague relative dates
+            
+            # Try common date formats
+            formats = [
+                '%Y-%m-%d', '%d %b %Y', '%B %d, %Y', '%m/%d/%Y', '%d/%m/%Y',
+                '%Y.%m.%d', '%b %d, %Y', '%d %B %Y', '%Y-%m-%dT%H:%M:%S%z'
+            ]
+            for fmt in formats:
+                try:
+                    parsed = datetime.strptime(date_text, fmt)
+                    if parsed.tzinfo is not None:
+                        # Keep every date naive local time so results stay sortable
+                        parsed = parsed.astimezone().replace(tzinfo=None)
+                    return parsed
+                except ValueError:
+                    continue
+            
+            # Fallback: assume recent if parsing fails
+            return datetime.now() - timedelta(days=1)
+        except Exception as e:
+            print(f"Error parsing date '{date_text}': {e}")
+            return datetime.now() - timedelta(days=1)
+
+    def calculate_relevance(self, title, query):
+        """Calculate relevance score based on query match in title"""
+        try:
+            title_lower = title.lower()
+            query_lower = query.lower()
+            score = 0
+            
+            # Exact matches
+            if query_lower in title_lower:
+                score += 10
+            
+            # Individual word matches
+            query_words = query_lower.split()
+            for word in query_words:
+                if word in title_lower:
+                    score += 2
+            
+            # Proximity bonus (if multiple query words are present)
+            if len(query_words) > 1 and all(word in title_lower for word in query_words):
+                score += 5
+            
+            return score
+        except Exception as e:
+            print(f"Error calculating relevance: {e}")
+            return 0
+
+    def is_likely_article_link(self, url, source):
+        """Determine if a URL is likely an article link"""
+        try:
+            # Skip common non-article patterns
+            exclude_patterns = [
+                '/login', '/signin', '/subscribe', '/account', '/profile',
+                '/video', '/gallery', '/podcast', '/newsletter', '/comment',
+                '/tag/', '/category/', '/search', '/archive', '/about',
+                '/contact', '/privacy', '/terms', '#', 'javascript:', '/home'
+            ]
+            if any(pattern in url.lower() for pattern in exclude_patterns):
+                return False
+            
+            # Include likely article patterns
+            include_patterns = [
+                '/article', '/news', '/story', '/feature', '/report',
+                '/opinion', '/analysis', '/world', '/politics', '/business',
+                '/technology', '/health', '/science', '/sport', '/culture',
+                r'/\d{4}/\d{2}/\d{2}/',  # Date-based URLs
+                r'/\d{4}-\d{2}-\d{2}-'   # Alternate date format
+            ]
+            if any(re.search(pattern, url.lower()) for pattern in include_patterns):
+                return True
+            
+            # Source-specific checks
+            if source == "BBC" and url.startswith('/news/'):
+                return True
+            if source == "Reuters" and url.startswith('/world/'):
+                return True
+            if source == "The Guardian" and '/article/' in url:
+                return True
+            
+            # Fallback: check if URL is long enough and not a top-level page
+            return len(url.split('/')) > 3 and not url.endswith('/')
+        except Exception as e:
+            print(f"Error checking article link: {e}")
+            return False
+
+    def fetch_article(self, url, source=None, cancel=None):
+        """Download an article page and return its extracted body text; raises Cancelled once cancel is set"""
+        response = self.fetcher.get(url, source=source, stage="article", headers=ARTICLE_HEADERS, cancel=cancel)
+        response.raise_for_status()
+        check(cancel)
+
+        if self.parse_pool:
+            return self.parse_pool.parse_article(response.content, response.encoding)
+        soup = self.parse_html(response.text)
+        return self.extract_article_content(soup, source)
+
+    def fetch_articles(self, articles, workers=8):
+        """Download several articles concurrently; returns {url: body text or exception}
+
+        Requests to the same host share one connection when the fetcher speaks HTTP/2.
+        """
+        sources = {article['url']: article.get('source') for article in articles}
+        bodies = {}
+        pages = []
+        for url, response in self.fetcher.get_many(list(sources), sources, stage="article",
+                                                    headers=ARTICLE_HEADERS, workers=workers):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                response.raise_for_status()
+                if self.parse_pool:
+                    pages.append((url, (response.content, response.encoding)))
+                else:
+                    bodies[url] = self.extract_article_content(self.parse_html(response.text), sources[url])
+            except Exception as e:
+                bodies[url] = e
+
+        if pages:
+            for (url, _), content in zip(pages, self.parse_pool.parse_articles([page for _, page in pages])):
+                bodies[url] = content
+        return bodies
+
+    def extract_article_content(self, soup, source=None):
+        """Pull the main paragraphs out of a parsed article page"""
+        content = ""
+        # Try common article content selectors
+        article_elements = self.select_first(soup, source or "*", 'body', ARTICLE_BODY_SELECTORS, many=True) or []
+
+        for elem in article_elements:
+            text = elem.get_text().strip()
+            if text and len(text) > 20:  # Skip short fragments
+                content += text + "\n\n"
+
+        return content
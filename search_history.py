@@ -0,0 +1,159 @@
+"""Append-only search history with a compact result snapshot per query.
+
+Every search appends one JSON line to the history log instead of rewriting
+the whole file, and there is no cap on how many queries are kept. Each
+entry points at a gzipped snapshot of that query's results, so re-running a
+past query can show them immediately while a fresh search runs. When the
+log holds many superseded entries it is compacted to the latest entry per
+query.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from records import ArticleRecord
+
+DEFAULT_LOG = "search_history.jsonl"
+DEFAULT_SNAPSHOT_DIR = "search_snapshots"
+LEGACY_FILE = "search_history.json"
+
+# Compact once the log has this many lines and over half of them are stale
+COMPACT_MIN_LINES = 200
+
+# Field order of a snapshot row
+SNAPSHOT_FIELDS = ('source', 'title', 'url', 'date', 'date_obj', 'relevance')
+
+
+def normalize_query(query):
+    """Case and whitespace insensitive form of a query"""
+    return " ".join(query.lower().split())
+
+
+def snapshot_name(query):
+    return hashlib.sha1(normalize_query(query).encode('utf-8')).hexdigest()[:16] + ".json.gz"
+
+
+class SearchHistory:
+    def __init__(self, log_path=DEFAULT_LOG, snapshot_dir=DEFAULT_SNAPSHOT_DIR, legacy_path=LEGACY_FILE):
+        self.log_path = log_path
+        self.snapshot_dir = snapshot_dir
+        self.legacy_path = legacy_path
+        self.entries = {}  # normalized query -> latest entry
+        self.line_count = 0
+        self.lock = threading.Lock()
+
+    def load(self):
+        """Read the log (migrating the old JSON list if needed); returns queries"""
+        with self.lock:
+            if not os.path.exists(self.log_path) and self.legacy_path and os.path.exists(self.legacy_path):
+                self._migrate_legacy()
+
+            self.entries = {}
+            self.line_count = 0
+            if os.path.exists(self.log_path):
+                with open(self.log_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        self.line_count += 1
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue  # torn final line from a crash
+                        key = normalize_query(entry['query'])
+                        # Re-insert so dict order follows recency
+                        self.entries.pop(key, None)
+                        self.entries[key] = entry
+        return self.queries()
+
+    def _migrate_legacy(self):
+        try:
+            with open(self.legacy_path, 'r') as f:
+                queries = json.load(f)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                for query in queries:
+                    f.write(json.dumps({'query': query, 'ts': None, 'snapshot': None, 'count': 0}) + "\n")
+        except Exception as e:
+            print(f"Error migrating search history: {e}")
+
+    def queries(self):
+        """Distinct past queries, oldest first"""
+        return [entry['query'] for entry in self.entries.values()]
+
+    def record(self, query, results):
+        """Append a history entry and write the query's result snapshot"""
+        name = snapshot_name(query)
+        try:
+            self._write_snapshot(name, results)
+        except Exception as e:
+            print(f"Error saving result snapshot: {e}")
+            name = None
+
+        entry = {
+            'query': query,
+            'ts': datetime.now().isoformat(timespec='seconds'),
+            'snapshot': name,
+            'count': len(results)
+        }
+        with self.lock:
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry) + "\n")
+                self.line_count += 1
+            except Exception as e:
+                print(f"Error saving search history: {e}")
+            key = normalize_query(query)
+            self.entries.pop(key, None)
+            self.entries[key] = entry
+
+            if self.line_count >= COMPACT_MIN_LINES and self.line_count > 2 * len(self.entries):
+                self._compact()
+
+    def _write_snapshot(self, name, results):
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        rows = []
+        for article in results:
+            date_obj = article.get('date_obj')
+            rows.append([article['source'], article['title'], article['url'], article.get('date'),
+                         date_obj.isoformat() if date_obj else None, article.get('relevance')])
+        path = os.path.join(self.snapshot_dir, name)
+        tmp_path = path + ".tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(rows, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def snapshot(self, query):
+        """The results recorded for a query last time, or None"""
+        with self.lock:
+            entry = self.entries.get(normalize_query(query))
+        if not entry or not entry.get('snapshot'):
+            return None
+        try:
+            with gzip.open(os.path.join(self.snapshot_dir, entry['snapshot']), 'rt', encoding='utf-8') as f:
+                rows = json.load(f)
+        except Exception as e:
+            print(f"Error loading result snapshot: {e}")
+            return None
+
+        results = []
+        for source, title, url, date, date_obj, relevance in rows:
+            results.append(ArticleRecord(source, title, url, date,
+                                         datetime.fromisoformat(date_obj) if date_obj else None, relevance))
+        return results
+
+    def compact(self):
+        with self.lock:
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the log with only the latest entry per query"""
+        tmp_path = self.log_path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in self.entries.values():
+                    f.write(json.dumps(entry) + "\n")
+            os.replace(tmp_path, self.log_path)
+            self.line_count = len(self.entries)
+        except Exception as e:
+            print(f"Error compacting search history: {e}")
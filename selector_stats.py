@@ -0,0 +1,239 @@
+"""Hit-rate tracking for the CSS selector fallback chains.
+
+extract_articles tries several selectors per source and field (container,
+title, link, date) and uses the first that matches. SelectorStats keeps a
+decayed hit rate for each selector, so the chain can be reordered with the
+currently working selector first and cards stop paying for selectors a
+site no longer uses. Rates persist in a JSON file across runs and every
+try is counted in metrics. When every container selector of a source keeps
+failing, an alert is raised once so markup changes get noticed.
+
+Chain walks are only queued on the extraction path; every FOLD_EVERY of
+them are folded into the rates and metrics at once and the cached
+orderings are re-sorted. Parse pool workers forward what they observed
+with each parsed page (drain / merge), so the parent's stats cover pages
+parsed in other processes. An incremental search parses growing prefixes
+of one page; inside deferred() only its last parse is counted.
+"""
+import json
+import os
+import threading
+from collections import Counter, deque
+from contextlib import contextmanager
+
+from metrics import METRICS
+
+DEFAULT_PATH = "selector_stats.json"
+
+# Weight kept by older observations on every new one, so rates follow markup changes
+DECAY = 0.98
+# Assumed hit rate of a selector that hasn't been tried yet
+PRIOR_RATE = 0.5
+# Consecutive pages without any container match before a source is reported
+ALERT_AFTER = 3
+# Chain walks queued before they are folded into the rates and the orderings refreshed
+FOLD_EVERY = 64
+
+
+class Observations:
+    """Walks and page results held back by SelectorStats.deferred()"""
+
+    def __init__(self):
+        self.walks = []
+        self.pages = []
+
+    def reset(self):
+        """Forget what was held, e.g. before parsing a longer prefix of the same page"""
+        self.walks.clear()
+        self.pages.clear()
+
+
+class SelectorStats:
+    def __init__(self, path=DEFAULT_PATH, forward=False):
+        self.path = path
+        self.rates = {}     # "source|field" -> {selector: [hits, tries]}
+        self.failures = {}  # source -> consecutive pages with no container match
+        self.alerted = set()
+        self.orders = {}    # "source|field" -> (selectors, best first), until the next fold
+        self.pending = deque()  # (source, field, tried, hit) walks not folded in yet
+        # In a parse worker: keep folded walks and page results for drain() instead of counting them here
+        self.forward = forward
+        self.forwarded_walks = []
+        self.forwarded_pages = []
+        self.local = threading.local()  # .deferred: Observations held for this thread
+        self.lock = threading.Lock()
+        self.loaded = False
+
+    def load(self):
+        if self.loaded:
+            return
+        with self.lock:
+            if self.loaded:
+                return
+            self.loaded = True
+            if not self.path or not os.path.exists(self.path):
+                return
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.rates = json.load(f)
+            except Exception as e:
+                print(f"Error loading selector stats: {e}")
+
+    def save(self):
+        if not self.path or not self.loaded:
+            return
+        self.fold()
+        with self.lock:
+            data = json.dumps(self.rates)
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving selector stats: {e}")
+
+    def order(self, source, field, selectors):
+        """The selectors best hit rate first; untried ones rank at PRIOR_RATE, ties keep table order
+
+        Sorted once per fold; until then the cached order is returned without locking.
+        """
+        key = f"{source}|{field}"
+        cached = self.orders.get(key)
+        if cached is not None and cached[0] is selectors:
+            return cached[1]
+        self.load()
+        with self.lock:
+            rates = self.rates.get(key)
+            if not rates:
+                ordered = selectors
+            else:
+                def rate(item):
+                    index, selector = item
+                    hits, tries = rates.get(selector, (0, 0))
+                    return (-(hits / tries if tries else PRIOR_RATE), index)
+
+                ordered = [selector for _, selector in sorted(enumerate(selectors), key=rate)]
+            self.orders[key] = (selectors, ordered)
+        return ordered
+
+    @contextmanager
+    def deferred(self):
+        """Hold this thread's observations and take in the ones still held when the block ends
+
+        Yields the Observations; reset() them before each parse so only the
+        last one counts. Nothing is taken in if the block raises.
+        """
+        observed = Observations()
+        self.local.deferred = observed
+        try:
+            yield observed
+        finally:
+            self.local.deferred = None
+        self.merge(observed.walks, observed.pages)
+
+    def record(self, source, field, tried, hit):
+        """Queue one chain walk: every selector in tried missed except hit (None if all missed)"""
+        deferred = getattr(self.local, 'deferred', None)
+        if deferred is not None:
+            deferred.walks.append((source, field, tuple(tried), hit))
+            return
+        self.pending.append((source, field, tuple(tried), hit))
+        if len(self.pending) >= FOLD_EVERY:
+            self.fold()
+
+    def fold(self, walks=None):
+        """Fold queued chain walks (plus walks from elsewhere) into the rates and metrics"""
+        walks = list(walks or ())
+        while True:
+            try:
+                walks.append(self.pending.popleft())
+            except IndexError:
+                break
+        if not walks:
+            return
+        with self.lock:
+            for source, field, tried, hit in walks:
+                rates = self.rates.setdefault(f"{source}|{field}", {})
+                for selector in tried:
+                    hits, tries = rates.get(selector, (0, 0))
+                    success = 1 if selector == hit else 0
+                    rates[selector] = [hits * DECAY + success, tries * DECAY + 1]
+            self.orders.clear()
+            if self.forward:
+                self.forwarded_walks.extend(walks)
+                return
+
+        counts = Counter()
+        for source, field, tried, hit in walks:
+            for selector in tried:
+                counts['selector_hits' if selector == hit else 'selector_misses', source, field, selector] += 1
+        for (name, source, field, selector), count in counts.items():
+            METRICS.inc(name, count, source=source, field=field, selector=selector)
+
+    def drain(self):
+        """(walks, page results) observed since the last drain, for merge() in the parent process"""
+        self.fold()
+        with self.lock:
+            walks, self.forwarded_walks = self.forwarded_walks, []
+            pages, self.forwarded_pages = self.forwarded_pages, []
+        return walks, pages
+
+    def merge(self, walks, pages):
+        """Take in what a parse worker's stats drained"""
+        deferred = getattr(self.local, 'deferred', None)
+        if deferred is not None:
+            deferred.walks.extend(walks)
+            deferred.pages.extend(pages)
+            return
+        for source, matched in pages:
+            self.page_result(source, matched)
+        if walks:
+            self.fold(walks)
+
+    def page_result(self, source, matched):
+        """Track whether any container selector matched a page; alert on a run of failures"""
+        deferred = getattr(self.local, 'deferred', None)
+        if deferred is not None:
+            deferred.pages.append((source, matched))
+            return
+        if self.forward:
+            with self.lock:
+                self.forwarded_pages.append((source, matched))
+            return
+        with self.lock:
+            if matched:
+                self.failures[source] = 0
+                self.alerted.discard(source)
+                return
+            self.failures[source] = self.failures.get(source, 0) + 1
+            alert = self.failures[source] >= ALERT_AFTER and source not in self.alerted
+            if alert:
+                self.alerted.add(source)
+        if alert:
+            METRICS.inc('selector_alerts', source=source)
+            print(f"ALERT: no selector for {source} has matched its last {ALERT_AFTER} search pages; "
+                  f"the site's markup has probably changed")
+
+    def container_missing(self, source):
+        """True if no container selector matched the source's last search page"""
+        with self.lock:
+            return self.failures.get(source, 0) > 0
+
+    def failing_sources(self):
+        with self.lock:
+            return sorted(self.alerted)
+
+    def report(self):
+        """Text table of hit rates per source and field, best first"""
+        self.load()
+        self.fold()
+        with self.lock:
+            rates = {key: dict(value) for key, value in self.rates.items()}
+        lines = ["Selector Hit Rates:"]
+        for key in sorted(rates):
+            source, field = key.split('|', 1)
+            ranked = sorted(rates[key].items(), key=lambda kv: -(kv[1][0] / kv[1][1] if kv[1][1] else 0))
+            cells = ", ".join(f"{selector} {hits / tries:.0%}" for selector, (hits, tries) in ranked if tries)
+            lines.append(f"  {source} / {field}: {cells}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,234 @@
+"""Google News-style sitemap ingestion for bulk recent-article discovery.
+
+A search page yields the top handful of hits; a source's news sitemap
+lists every article it published in the last couple of days. Sitemaps
+(and sitemap indexes) are found through robots.txt, streamed through
+iterparse (gzip included) and processed incrementally: a per-sitemap
+lastmod cursor means children and URLs that haven't changed since the
+last run are skipped. Entries become the same article dicts that
+extract_articles produces, deduplicated by canonical URL, and can be
+written straight into the article store.
+
+    python sitemaps.py                       # every source, into articles.db
+    python sitemaps.py --source BBC --query "climate"
+"""
+import argparse
+import gzip
+import json
+import os
+import threading
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from urls import canonical_url
+from feeds import parse_feed_date
+from records import ArticleRecord
+from scraper_core import ScraperCore, source_slug, DEFAULT_SOURCES
+
+SM = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+NEWS = "{http://www.google.com/schemas/sitemap-news/0.9}"
+
+SITEMAP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36",
+    "Accept": "application/xml, text/xml;q=0.9, */*;q=0.8"
+}
+
+# Children of a sitemap index fetched per run at most
+MAX_CHILD_SITEMAPS = 20
+
+
+def local_sitemaps(base_url, sources=None):
+    """Sitemap index URLs on the local stand-in server, matching local_sources()"""
+    base_url = base_url.rstrip('/')
+    return {source: [f"{base_url}/{source_slug(source)}/sitemap.xml"] for source in (sources or DEFAULT_SOURCES)}
+
+
+def open_stream(body, url):
+    """A file-like byte stream for the body, gunzipping .gz sitemaps"""
+    if url.endswith('.gz'):
+        return gzip.GzipFile(fileobj=body)
+    return body
+
+
+def iter_sitemap(stream):
+    """Yield ('sitemap', loc, lastmod, None, None) or ('url', loc, lastmod, title, published)"""
+    for _, elem in ET.iterparse(stream, events=("end",)):
+        if elem.tag == SM + "sitemap":
+            yield 'sitemap', (elem.findtext(SM + "loc") or "").strip(), elem.findtext(SM + "lastmod"), None, None
+            elem.clear()
+        elif elem.tag == SM + "url":
+            news = elem.find(NEWS + "news")
+            title = published = None
+            if news is not None:
+                title = news.findtext(NEWS + "title")
+                published = news.findtext(NEWS + "publication_date")
+            yield 'url', (elem.findtext(SM + "loc") or "").strip(), elem.findtext(SM + "lastmod"), title, published
+            elem.clear()
+
+
+def until_cutoff(entries, body):
+    """Sitemap entries, ending quietly where a size-capped body was cut off"""
+    try:
+        yield from entries
+    except (ET.ParseError, EOFError):
+        if not body.truncated:
+            raise
+
+
+def title_from_url(url):
+    """Fallback headline for sitemaps without news:title"""
+    slug = [part for part in urlsplit(url).path.split('/') if part]
+    return slug[-1].replace('-', ' ').replace('_', ' ').capitalize() if slug else url
+
+
+class SitemapCrawler:
+    def __init__(self, core=None, sitemaps=None, state_path="sitemap_state.json", fetcher=None):
+        self.core = core or ScraperCore()
+        self.sitemaps = sitemaps or {}  # source -> explicit sitemap URLs, else robots.txt
+        self.state_path = state_path
+        self.fetcher = fetcher or self.core.fetcher
+        self.cursors = {}  # sitemap url -> newest lastmod processed (ISO string)
+        self.lock = threading.Lock()
+        self.load_state()
+
+    def load_state(self):
+        if self.state_path and os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    self.cursors = json.load(f)
+            except Exception as e:
+                print(f"Error loading sitemap state: {e}")
+
+    def save_state(self):
+        if not self.state_path:
+            return
+        with self.lock:
+            data = dict(self.cursors)
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.state_path)
+
+    def discover(self, source):
+        """Sitemap URLs for a source: configured ones, else news sitemaps from robots.txt"""
+        if self.sitemaps.get(source):
+            return list(self.sitemaps[source])
+        parts = urlsplit(self.core.sources[source])
+        robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+        response = self.fetcher.get(robots_url, source=source, stage="sitemap", headers=SITEMAP_HEADERS)
+        response.raise_for_status()
+        found = [line.split(':', 1)[1].strip() for line in response.text.splitlines()
+                 if line.lower().startswith('sitemap:')]
+        news = [url for url in found if 'news' in url.lower()]
+        self.sitemaps[source] = news or found[:1]
+        return self.sitemaps[source]
+
+    def is_newer(self, sitemap_url, lastmod):
+        """True when lastmod is past the cursor (or either is unknown)"""
+        cursor = self.cursors.get(sitemap_url)
+        if not cursor or not lastmod:
+            return True
+        current = parse_feed_date(lastmod)
+        previous = parse_feed_date(cursor)
+        return current is None or previous is None or current > previous
+
+    def advance(self, sitemap_url, lastmod):
+        if lastmod and self.is_newer(sitemap_url, lastmod):
+            with self.lock:
+                self.cursors[sitemap_url] = lastmod
+
+    def crawl_sitemap(self, source, sitemap_url, query, seen, articles, depth=0):
+        """Collect a sitemap's new entries; returns True if its cursor may move past them
+
+        A query-filtered crawl or a body cut off at the size cap leaves the
+        cursor alone: entries it skipped or never read weren't stored.
+        """
+        with self.fetcher.stream(sitemap_url, source=source, stage="sitemap", headers=SITEMAP_HEADERS,
+                                 timeout=30) as (response, body):
+            response.raise_for_status()
+            children = []
+            newest = None
+            entries = until_cutoff(iter_sitemap(open_stream(body, sitemap_url)), body)
+            for kind, loc, lastmod, title, published in entries:
+                if not loc:
+                    continue
+                if kind == 'sitemap':
+                    if self.is_newer(loc, lastmod):
+                        children.append((loc, lastmod))
+                    continue
+
+                # Only URLs changed since the last run of this sitemap
+                if not self.is_newer(sitemap_url, lastmod or published):
+                    continue
+                stamp = lastmod or published
+                if stamp and (newest is None or (parse_feed_date(stamp) or datetime.min) > (parse_feed_date(newest) or datetime.min)):
+                    newest = stamp
+
+                key = canonical_url(loc)
+                if key in seen:
+                    continue
+                seen.add(key)
+                title = (title or title_from_url(loc)).strip()
+                articles.append(ArticleRecord(source, title, loc, published or lastmod or "",
+                                              parse_feed_date(published or lastmod),
+                                              self.core.calculate_relevance(title, query) if query else 0,
+                                              via='sitemap'))
+            complete = not query and not body.truncated
+
+        if complete:
+            self.advance(sitemap_url, newest)
+        if depth == 0:
+            for child_url, child_lastmod in children[:MAX_CHILD_SITEMAPS]:
+                try:
+                    if self.crawl_sitemap(source, child_url, query, seen, articles, depth + 1):
+                        self.advance(child_url, child_lastmod)
+                except Exception as e:
+                    print(f"Error reading sitemap {child_url}: {e}")
+        return complete
+
+    def crawl(self, source, query=None):
+        """New articles for a source since the last crawl; filtered to the query if given"""
+        articles = []
+        seen = set()
+        for sitemap_url in self.discover(source):
+            try:
+                self.crawl_sitemap(source, sitemap_url, query, seen, articles)
+            except Exception as e:
+                print(f"Error reading sitemap {sitemap_url}: {e}")
+        if query:
+            articles = [a for a in articles if a['relevance'] > 0]
+        return articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discover recent articles from news sitemaps")
+    parser.add_argument("--source", action="append", help="only crawl this source (repeatable)")
+    parser.add_argument("--query", help="only keep articles whose title matches")
+    parser.add_argument("--db", default="articles.db", help="article store to write into ('' to skip)")
+    parser.add_argument("--state", default="sitemap_state.json")
+    args = parser.parse_args()
+
+    crawler = SitemapCrawler(state_path=args.state)
+    store = None
+    if args.db:
+        from article_store import ArticleStore
+        store = ArticleStore(args.db)
+    try:
+        for source in args.source or list(crawler.core.sources):
+            try:
+                articles = crawler.crawl(source, args.query)
+            except Exception as e:
+                print(f"Error crawling {source}: {e}")
+                continue
+            print(f"{source}: {len(articles)} new articles")
+            if store:
+                store.add_articles(articles)
+        crawler.save_state()
+    finally:
+        if store:
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
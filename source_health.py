@@ -0,0 +1,100 @@
+"""Negative cache of failing sources.
+
+A source that answers a search with an HTTP error, times out or serves a
+page none of its container selectors match is put on hold for a TTL that
+doubles with every consecutive failure (1 min, 2 min, 4 min, ... up to
+6 h). A query that merely has no results doesn't count. While on hold its
+searches are skipped without a request. When the hold runs out one
+search is let through as a probe; its success clears the record, its
+failure doubles the hold. Failures, skips and probes are counted in
+metrics. NEWS_SCRAPER_SOURCE_HOLD sets the first hold in seconds; 0 turns
+holds off.
+"""
+import os
+import threading
+import time
+
+from metrics import METRICS
+
+SOURCE_HOLD_ENV = "NEWS_SCRAPER_SOURCE_HOLD"
+BASE_TTL = 60
+MAX_TTL = 6 * 3600
+
+
+class SourceUnavailable(Exception):
+    """A search page came back with an error status"""
+
+
+def failure_reason(error):
+    """Short label of what went wrong, for metrics and the status bar"""
+    if isinstance(error, SourceUnavailable):
+        return str(error)
+    name = type(error).__name__
+    return "timeout" if "Timeout" in name or isinstance(error, TimeoutError) else name
+
+
+def describe_wait(seconds):
+    if seconds < 90:
+        return f"{max(int(seconds), 1)} s"
+    if seconds < 5400:
+        return f"{int(seconds // 60)} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+class SourceHealth:
+    def __init__(self, base_ttl=None, max_ttl=MAX_TTL):
+        self.base_ttl = float(os.environ.get(SOURCE_HOLD_ENV, BASE_TTL)) if base_ttl is None else base_ttl
+        self.max_ttl = max_ttl
+        self.failing = {}  # source -> [consecutive failures, on hold until, last reason, probe running]
+        self.lock = threading.Lock()
+
+    def allow(self, source):
+        """True if a search of the source should go ahead; claims the probe once a hold expires"""
+        with self.lock:
+            record = self.failing.get(source)
+            if record is None:
+                return True
+            if record[3] or time.time() < record[1]:
+                allowed = False
+            else:
+                record[3] = True
+                allowed = True
+        METRICS.inc('source_probes' if allowed else 'sources_skipped', source=source)
+        return allowed
+
+    def success(self, source):
+        with self.lock:
+            recovered = self.failing.pop(source, None) is not None
+        if recovered:
+            print(f"{source} is answering again")
+
+    def abandoned(self, source):
+        """A search that was cancelled proved nothing; let the next one probe if this one was the probe"""
+        with self.lock:
+            record = self.failing.get(source)
+            if record is not None:
+                record[3] = False
+
+    def failure(self, source, reason):
+        METRICS.inc('source_failures', source=source, reason=reason)
+        if self.base_ttl <= 0:
+            return
+        with self.lock:
+            record = self.failing.get(source)
+            count = record[0] + 1 if record else 1
+            ttl = min(self.base_ttl * 2 ** (count - 1), self.max_ttl)
+            self.failing[source] = [count, time.time() + ttl, reason, False]
+
+    def status(self):
+        """{source: (reason, seconds until the next probe)} for every source on hold"""
+        now = time.time()
+        with self.lock:
+            return {source: (record[2], max(record[1] - now, 0)) for source, record in self.failing.items()}
+
+    def summary(self):
+        """One line for the status bar, or "" when every source is healthy"""
+        held = self.status()
+        if not held:
+            return ""
+        return "Skipping " + ", ".join(f"{source} ({reason}, retry in {describe_wait(wait)})"
+                                       for source, (reason, wait) in sorted(held.items()))
@@ -0,0 +1,18 @@
+"""URL normalisation shared by the store, the ranking and the crawlers.
+
+Kept apart from article_store so code that only needs canonical_url
+doesn't import sqlite3.
+"""
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that never change which article a URL points at
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'ocid', 'cmpid', 'smid', 'ref', 'at_medium', 'at_campaign')
+
+
+def canonical_url(url):
+    """Normalise a URL so the same article always maps to one key"""
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith(TRACKING_PARAMS)]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
@@ -0,0 +1,182 @@
+"""Background DNS and connection warm-up for the configured news hosts.
+
+The first search otherwise pays a DNS lookup, TCP connect and TLS
+handshake per host before any download starts. WarmUp resolves every
+host once, keeps the addresses in a process-wide DNS cache that new
+urllib3 connections use, and opens a couple of keep-alive connections per
+host straight into the fetcher's connection pools, so the first requests
+find them ready. It runs on its own threads, can be cancelled at any
+point and records how long each step took per host.
+"""
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from metrics import METRICS
+
+# Connections opened ahead of time per host (the pool keeps up to POOL_SIZE)
+WARM_CONNECTIONS = 2
+# Resolved addresses are reused this long
+DNS_TTL = 300
+
+_dns_cache = {}  # (host, port) -> (addresses, resolved at)
+_dns_lock = threading.Lock()
+_dns_installed = False
+
+
+def resolve(host, port):
+    """Resolve a host, remembering the answer for DNS_TTL seconds"""
+    with _dns_lock:
+        entry = _dns_cache.get((host, port))
+    if entry and time.monotonic() - entry[1] < DNS_TTL:
+        return entry[0]
+    addresses = [info[4][0] for info in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)]
+    with _dns_lock:
+        _dns_cache[(host, port)] = (addresses, time.monotonic())
+    return addresses
+
+
+def install_dns_cache():
+    """Make urllib3 connect to cached addresses instead of resolving every new connection
+
+    TLS still uses the host name for SNI and certificate checks; only the
+    address lookup is skipped.
+    """
+    global _dns_installed
+    from urllib3.util import connection
+
+    with _dns_lock:
+        if _dns_installed:
+            return
+        _dns_installed = True
+        create_connection = connection.create_connection
+
+    def cached_create_connection(address, *args, **kwargs):
+        host, port = address
+        with _dns_lock:
+            entry = _dns_cache.get((host, port))
+        if entry and time.monotonic() - entry[1] < DNS_TTL:
+            for ip in entry[0]:
+                try:
+                    return create_connection((ip, port), *args, **kwargs)
+                except OSError:
+                    continue
+            with _dns_lock:
+                _dns_cache.pop((host, port), None)
+        return create_connection(address, *args, **kwargs)
+
+    connection.create_connection = cached_create_connection
+
+
+def origins(urls):
+    """Distinct scheme://host:port prefixes of a set of URLs"""
+    seen = {}
+    for url in urls:
+        parts = urlsplit(url)
+        if parts.scheme in ("http", "https") and parts.hostname:
+            seen.setdefault(f"{parts.scheme}://{parts.netloc}", url)
+    return list(seen.values())
+
+
+class WarmUp:
+    def __init__(self, fetcher, urls, connections=WARM_CONNECTIONS, workers=8):
+        self.fetcher = fetcher
+        self.urls = origins(urls)
+        self.connections = connections
+        self.workers = workers
+        self.cancelled = threading.Event()
+        self.done = threading.Event()
+        self.timings = {}  # host -> {'dns_ms': ..., 'connect_ms': [...]} or {'error': ...}
+        self.elapsed = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+        return self
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            install_dns_cache()
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                list(pool.map(self.warm, self.urls))
+        finally:
+            self.elapsed = time.perf_counter() - started
+            self.done.set()
+
+    def warm(self, url):
+        if self.cancelled.is_set():
+            return
+        parts = urlsplit(url)
+        host = parts.netloc
+        timing = {'dns_ms': None, 'connect_ms': []}
+        try:
+            start = time.perf_counter()
+            resolve(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+            timing['dns_ms'] = (time.perf_counter() - start) * 1000
+            METRICS.inc('warmup_dns', host=host)
+
+            # Check slots out of the pool, connect the empty ones, then park them all as idle keep-alive connections
+            pool = self.connection_pool(url)
+            checked_out = []
+            try:
+                for _ in range(self.connections):
+                    if self.cancelled.is_set():
+                        break
+                    conn = pool._get_conn()
+                    checked_out.append(conn)
+                    if conn.is_connected:
+                        continue
+                    start = time.perf_counter()
+                    conn.connect()
+                    timing['connect_ms'].append((time.perf_counter() - start) * 1000)
+                    METRICS.inc('warmup_connections', host=host)
+            finally:
+                for conn in checked_out:
+                    pool._put_conn(conn)
+        except Exception as e:
+            timing['error'] = str(e)
+            METRICS.inc('warmup_errors', host=host)
+        with self.lock:
+            self.timings[host] = timing
+
+    def connection_pool(self, url):
+        """The urllib3 pool the session will use for url, keyed with the same TLS and proxy settings"""
+        import requests
+
+        session = self.fetcher.session
+        request = requests.Request("GET", url).prepare()
+        settings = session.merge_environment_settings(url, {}, None, None, None)
+        adapter = session.get_adapter(url)
+        return adapter.get_connection_with_tls_context(request, settings['verify'], settings['proxies'],
+                                                       settings['cert'])
+
+    def cancel(self):
+        """Stop after the connections already being opened; the ones open stay pooled"""
+        self.cancelled.set()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    def report(self):
+        """Text table of what the warm-up did per host"""
+        with self.lock:
+            timings = dict(self.timings)
+        if not self.done.is_set():
+            state = "running"
+        elif self.cancelled.is_set():
+            state = "cancelled"
+        else:
+            state = f"done in {self.elapsed * 1000:.0f} ms"
+        lines = [f"Connection Warm-up ({state}):"]
+        for host in sorted(timings):
+            timing = timings[host]
+            if 'error' in timing:
+                lines.append(f"  {host}: failed ({timing['error']})")
+                continue
+            dns = f"{timing['dns_ms']:.0f} ms" if timing['dns_ms'] is not None else "-"
+            connects = ", ".join(f"{ms:.0f}" for ms in timing['connect_ms']) or "-"
+            lines.append(f"  {host}: DNS {dns}, connections opened in {connects} ms")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,393 @@
+"""Durable work queue for large batch crawls, shared by any number of workers.
+
+Queries (one search task per query and source) and article URLs go into a
+SQLite database. Worker processes, on this host or on others sharing the
+filesystem, lease a few tasks at a time, run the search/extract pipeline
+and write the articles into the article store. A lease that isn't
+completed or renewed before it expires (a worker crashed or hung) makes
+the task available again; failed tasks are retried with exponential
+backoff up to max_attempts. The queue survives restarts, and enqueueing
+the same query or URL twice is a no-op.
+
+    python work_queue.py enqueue "climate summit" "pope" --articles
+    python work_queue.py worker --processes 4      # on each machine
+    python work_queue.py progress --watch 5
+
+SQLite relies on file locks, so a network filesystem shared by several
+hosts must support them (NFSv4, SMB with locking enabled).
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_DB = "work_queue.db"
+
+LEASE_SECONDS = 120
+MAX_ATTEMPTS = 4
+# Delay before the first retry, doubled on each further one
+RETRY_BACKOFF = 15
+
+QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks(status, not_before);
+"""
+
+# Status of a task
+PENDING, LEASED, DONE, FAILED = 'pending', 'leased', 'done', 'failed'
+
+
+def task_key(kind, payload):
+    if kind == 'search':
+        return f"search|{payload['source']}|{' '.join(payload['query'].lower().split())}"
+    return f"article|{payload['url']}"
+
+
+class WorkQueue:
+    """Tasks in SQLite; every state change is a single short transaction"""
+
+    def __init__(self, path=DEFAULT_DB, max_attempts=MAX_ATTEMPTS, retry_backoff=RETRY_BACKOFF):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.conn = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(QUEUE_SCHEMA)
+        self.lock = threading.Lock()
+
+    def close(self):
+        self.conn.close()
+
+    def _write(self, statements):
+        """Run (sql, params) pairs in one write transaction; returns the last cursor's rowcount"""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                rowcount = 0
+                for sql, params in statements:
+                    rowcount = self.conn.execute(sql, params).rowcount
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return rowcount
+
+    def enqueue(self, kind, payloads):
+        """Add tasks of one kind; returns how many were new"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                added = 0
+                for payload in payloads:
+                    added += self.conn.execute(
+                        "INSERT OR IGNORE INTO tasks (kind, key, payload, created, updated) VALUES (?, ?, ?, ?, ?)",
+                        (kind, task_key(kind, payload), json.dumps(payload), now, now)).rowcount
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def enqueue_searches(self, queries, sources, fetch_articles=False):
+        payloads = [{'query': query, 'source': source, 'articles': fetch_articles}
+                    for query in queries for source in sources]
+        return self.enqueue('search', payloads)
+
+    def enqueue_articles(self, articles):
+        return self.enqueue('article', [{'url': article['url'], 'source': article.get('source')}
+                                        for article in articles])
+
+    def lease(self, worker_id, count=1, lease_seconds=LEASE_SECONDS):
+        """Claim up to count ready tasks, including ones whose lease expired; returns [(id, kind, payload)]"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                # A task whose last allowed attempt ran out its lease is given up on
+                self.conn.execute("UPDATE tasks SET status = ?, error = 'lease expired', lease_owner = NULL, "
+                                  "updated = ? WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                                  (FAILED, now, LEASED, now, self.max_attempts))
+                rows = self.conn.execute(
+                    "SELECT id, kind, payload FROM tasks "
+                    "WHERE (status = ? AND not_before <= ?) OR (status = ? AND lease_expires < ?) "
+                    "ORDER BY id LIMIT ?", (PENDING, now, LEASED, now, count)).fetchall()
+                self.conn.executemany(
+                    "UPDATE tasks SET status = ?, lease_owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated = ? WHERE id = ?",
+                    [(LEASED, worker_id, now + lease_seconds, now, row[0]) for row in rows])
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return [(task_id, kind, json.loads(payload)) for task_id, kind, payload in rows]
+
+    def renew(self, task_ids, worker_id, lease_seconds=LEASE_SECONDS):
+        """Extend the leases a worker still holds"""
+        expires = time.time() + lease_seconds
+        return self._write([("UPDATE tasks SET lease_expires = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                             (expires, task_id, LEASED, worker_id)) for task_id in task_ids])
+
+    def complete(self, task_id, worker_id, result=None):
+        """Mark a leased task done; False if the lease had already passed to another worker"""
+        return bool(self._write([(
+            "UPDATE tasks SET status = ?, result = ?, error = NULL, lease_owner = NULL, updated = ? "
+            "WHERE id = ? AND status = ? AND lease_owner = ?",
+            (DONE, json.dumps(result), time.time(), task_id, LEASED, worker_id))]))
+
+    def fail(self, task_id, worker_id, error):
+        """Record a failed attempt: retry later with backoff, or give up after max_attempts"""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT attempts FROM tasks WHERE id = ? AND status = ? AND lease_owner = ?",
+                                    (task_id, LEASED, worker_id)).fetchone()
+        if row is None:
+            return False
+        attempts = row[0]
+        if attempts >= self.max_attempts:
+            status, not_before = FAILED, 0
+        else:
+            status, not_before = PENDING, now + self.retry_backoff * 2 ** (attempts - 1)
+        return bool(self._write([(
+            "UPDATE tasks SET status = ?, not_before = ?, error = ?, lease_owner = NULL, updated = ? "
+            "WHERE id = ? AND status = ? AND lease_owner = ?",
+            (status, not_before, str(error)[:500], now, task_id, LEASED, worker_id))]))
+
+    def retry_failed(self):
+        """Put every given-up task back in the queue with a fresh attempt budget"""
+        return self._write([("UPDATE tasks SET status = ?, attempts = 0, not_before = 0, updated = ? WHERE status = ?",
+                             (PENDING, time.time(), FAILED))])
+
+    def unfinished(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM tasks WHERE status IN (?, ?)",
+                                     (PENDING, LEASED)).fetchone()[0]
+
+    def progress(self, window=60):
+        """Aggregate view: task counts by kind and status, active workers and recent throughput"""
+        now = time.time()
+        with self.lock:
+            counts = self.conn.execute("SELECT kind, status, COUNT(*) FROM tasks GROUP BY kind, status").fetchall()
+            workers = self.conn.execute("SELECT lease_owner, COUNT(*) FROM tasks WHERE status = ? "
+                                        "AND lease_expires >= ? GROUP BY lease_owner", (LEASED, now)).fetchall()
+            recent = self.conn.execute("SELECT COUNT(*) FROM tasks WHERE status = ? AND updated >= ?",
+                                       (DONE, now - window)).fetchone()[0]
+            retrying = self.conn.execute("SELECT COUNT(*) FROM tasks WHERE status = ? AND attempts > 0",
+                                         (PENDING,)).fetchone()[0]
+            errors = self.conn.execute("SELECT error, COUNT(*) FROM tasks WHERE status = ? "
+                                       "GROUP BY error ORDER BY COUNT(*) DESC LIMIT 5", (FAILED,)).fetchall()
+        by_kind = {}
+        for kind, status, count in counts:
+            by_kind.setdefault(kind, dict.fromkeys((PENDING, LEASED, DONE, FAILED), 0))[status] = count
+        return {'kinds': by_kind, 'workers': dict(workers), 'done_per_minute': recent * 60 / window,
+                'retrying': retrying, 'top_errors': errors}
+
+
+def progress_report(progress):
+    """Text table of a progress() result"""
+    lines = [f"{'Kind':<10}{'Pending':>10}{'Leased':>10}{'Done':>10}{'Failed':>10}{'Complete':>10}"]
+    for kind, counts in sorted(progress['kinds'].items()):
+        total = sum(counts.values())
+        finished = counts[DONE] + counts[FAILED]
+        lines.append(f"{kind:<10}{counts[PENDING]:>10}{counts[LEASED]:>10}{counts[DONE]:>10}{counts[FAILED]:>10}"
+                     f"{finished / total:>10.0%}")
+    lines.append(f"Active workers: {len(progress['workers'])}, "
+                 f"{sum(progress['workers'].values())} tasks leased; "
+                 f"{progress['done_per_minute']:.0f} tasks/min; {progress['retrying']} waiting to retry")
+    for error, count in progress['top_errors']:
+        lines.append(f"  failed x{count}: {error}")
+    return "\n".join(lines) + "\n"
+
+
+class Worker:
+    """Leases tasks in batches and runs them on a thread pool until the queue is drained"""
+
+    def __init__(self, work_queue, core, store, worker_id=None, threads=8, lease_seconds=LEASE_SECONDS):
+        self.queue = work_queue
+        self.core = core
+        self.store = store
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.threads = threads
+        self.lease_seconds = lease_seconds
+        self.held = set()
+        self.held_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.stats = {'done': 0, 'failed': 0, 'lost': 0}
+
+    def run_task(self, kind, payload):
+        """Run one task; returns its JSON result"""
+        if kind == 'search':
+            source = payload['source']
+            base_url = self.core.sources.get(source)
+            if base_url is None:
+                raise ValueError(f"unknown source {source!r}")
+            # Not search_source: its health holds would turn errors into empty results, and retries
+            # with backoff are the queue's job, so an error status fails the task and it is retried
+            articles = self.core.search_source_page(source, base_url, payload['query'])
+            self.store.add_articles(articles)
+            queued = self.queue.enqueue_articles(articles) if payload.get('articles') else 0
+            return {'articles': len(articles), 'queued': queued}
+        if kind == 'article':
+            body = self.core.fetch_article(payload['url'], payload.get('source'))
+            self.store.store_body(payload['url'], body, payload.get('source'))
+            return {'chars': len(body)}
+        raise ValueError(f"unknown task kind {kind!r}")
+
+    def execute(self, task):
+        task_id, kind, payload = task
+        try:
+            result = self.run_task(kind, payload)
+        except Exception as e:
+            self.queue.fail(task_id, self.worker_id, e)
+            outcome = 'failed'
+        else:
+            # False when the lease expired and another worker took the task over
+            outcome = 'done' if self.queue.complete(task_id, self.worker_id, result) else 'lost'
+        with self.held_lock:
+            self.held.discard(task_id)
+            self.stats[outcome] += 1
+
+    def heartbeat(self):
+        """Renew held leases well before they expire, so slow tasks aren't handed out twice"""
+        while not self.stop_event.wait(self.lease_seconds / 3):
+            with self.held_lock:
+                held = list(self.held)
+            if held:
+                try:
+                    self.queue.renew(held, self.worker_id, self.lease_seconds)
+                except sqlite3.Error as e:
+                    print(f"Error renewing leases: {e}")
+
+    def run(self, follow=False, idle_sleep=2.0):
+        """Work until no task is pending or leased (or forever with follow)"""
+        beat = threading.Thread(target=self.heartbeat, daemon=True)
+        beat.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.threads) as pool:
+                while not self.stop_event.is_set():
+                    tasks = self.queue.lease(self.worker_id, self.threads, self.lease_seconds)
+                    if not tasks:
+                        # Tasks leased by others may still come back, or be waiting out a retry delay
+                        if not follow and not self.queue.unfinished():
+                            break
+                        self.stop_event.wait(idle_sleep)
+                        continue
+                    with self.held_lock:
+                        self.held.update(task_id for task_id, _, _ in tasks)
+                    list(pool.map(self.execute, tasks))
+        finally:
+            self.stop_event.set()
+            self.store.flush()
+        return self.stats
+
+    def stop(self):
+        self.stop_event.set()
+
+
+def run_worker(db, store_path, threads, lease_seconds, follow):
+    """One worker process: its own queue connection, scraper and store writer"""
+    from article_store import ArticleStore
+    from scraper_core import ScraperCore
+
+    work_queue = WorkQueue(db)
+    core = ScraperCore()
+    store = ArticleStore(store_path)
+    worker = Worker(work_queue, core, store, threads=threads, lease_seconds=lease_seconds)
+    try:
+        stats = worker.run(follow=follow)
+    except KeyboardInterrupt:
+        worker.stop()
+        stats = worker.stats
+    finally:
+        store.close()
+        work_queue.close()
+        core.selector_stats.save()
+    print(f"Worker {worker.worker_id}: {stats}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch crawl through a shared durable work queue")
+    parser.add_argument("--db", default=DEFAULT_DB, help="work queue database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="add search tasks for queries, or article URLs")
+    enqueue.add_argument("queries", nargs="*")
+    enqueue.add_argument("--file", help="file with one query per line")
+    enqueue.add_argument("--urls", help="file with one article URL per line")
+    enqueue.add_argument("--sources", nargs="+", help="default: every configured source")
+    enqueue.add_argument("--articles", action="store_true", help="also fetch the body of every article found")
+
+    worker = commands.add_parser("worker", help="lease and run tasks until the queue is drained")
+    worker.add_argument("--store", default="articles.db", help="article store the results are written to")
+    worker.add_argument("--processes", type=int, default=1)
+    worker.add_argument("--threads", type=int, default=8, help="concurrent tasks per process")
+    worker.add_argument("--lease", type=float, default=LEASE_SECONDS, help="lease timeout in seconds")
+    worker.add_argument("--follow", action="store_true", help="keep waiting for new tasks")
+
+    progress = commands.add_parser("progress", help="show aggregate progress")
+    progress.add_argument("--watch", type=float, help="refresh every N seconds until the queue is drained")
+    progress.add_argument("--retry-failed", action="store_true", help="requeue tasks that ran out of attempts")
+    args = parser.parse_args()
+
+    if args.command == "enqueue":
+        from scraper_core import ScraperCore
+        work_queue = WorkQueue(args.db)
+        queries = list(args.queries)
+        if args.file:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                queries.extend(line.strip() for line in f if line.strip())
+        sources = args.sources or list(ScraperCore(parse_pool=False).sources)
+        added = work_queue.enqueue_searches(queries, sources, args.articles)
+        if args.urls:
+            with open(args.urls, 'r', encoding='utf-8') as f:
+                added += work_queue.enqueue_articles({'url': line.strip()} for line in f if line.strip())
+        print(f"Queued {added} new tasks")
+        work_queue.close()
+
+    elif args.command == "worker":
+        worker_args = (args.db, args.store, args.threads, args.lease, args.follow)
+        if args.processes == 1:
+            run_worker(*worker_args)
+        else:
+            processes = [multiprocessing.Process(target=run_worker, args=worker_args)
+                         for _ in range(args.processes)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+
+    else:
+        work_queue = WorkQueue(args.db)
+        if args.retry_failed:
+            print(f"Requeued {work_queue.retry_failed()} failed tasks")
+        while True:
+            print(progress_report(work_queue.progress()))
+            if not args.watch or not work_queue.unfinished():
+                break
+            time.sleep(args.watch)
+        work_queue.close()
+
+
+if __name__ == "__main__":
+    main()